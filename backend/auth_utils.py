@@ -2,41 +2,136 @@
 Utilitários de autenticação JWT para o sistema.
 """
 import os
+import asyncio
+import base64
 import hashlib
+import hmac
 import jwt
 import datetime
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
+from sqlmodel import Session, select
+from dados_banco import Usuario, executar
 
 _env_path = Path(__file__).resolve().parent / ".env"
 load_dotenv(_env_path)
 
-SECRET_KEY = os.getenv("SECRET_KEY", "semana-computacao-decsi-secret-2026")
+# Obrigatória: quem conhece a chave assina tokens de admin (ver verificar_segredo)
+SECRET_KEY = os.getenv("SECRET_KEY") or None
+# Chave que já foi padrão no código público: nunca aceita
+_SEGREDO_PUBLICADO = "semana-computacao-decsi-secret-2026"
+SEGREDO_TAMANHO_MINIMO = 32
 ALGORITHM = "HS256"
 TOKEN_EXPIRA_HORAS = 24
+TOKEN_CACHE_MAX = int(os.getenv("TOKEN_CACHE_MAX", "10000"))
+# Tempo máximo (s) de um token no cache sem conferir o usuário no banco
+TOKEN_REVALIDAR_SEGUNDOS = float(os.getenv("TOKEN_REVALIDAR_SEGUNDOS", "60"))
+
+# Custo do scrypt (memória usada ≈ 128 * N * r bytes por hash)
+SCRYPT_N = int(os.getenv("SCRYPT_N", "16384"))
+SCRYPT_R = int(os.getenv("SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("SCRYPT_P", "1"))
+# Cada worker do uvicorn cria o próprio pool: por padrão, as CPUs divididas
+# entre os workers (WEB_CONCURRENCY; sem ele, um worker por CPU, como na imagem)
+HASH_PROCESSOS = int(os.getenv("HASH_PROCESSOS", "0")) or max(
+    1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+)
 
 security = HTTPBearer()
 
+_executor_hash: ProcessPoolExecutor | None = None
+
+
+def _b64(dados: bytes) -> str:
+    return base64.b64encode(dados).decode()
+
+
+def _scrypt(senha: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        senha.encode(), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r * p, dklen=32,
+    )
+
 
 def hash_senha(senha: str) -> str:
-    """Gera hash SHA-256 da senha."""
-    return hashlib.sha256(senha.encode()).hexdigest()
+    """Gera hash scrypt (com salt) da senha: scrypt$N$r$p$salt$hash."""
+    salt = os.urandom(16)
+    derivado = _scrypt(senha, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(derivado)}"
 
 
 def verificar_senha(senha: str, senha_hash: str) -> bool:
-    """Verifica se a senha corresponde ao hash."""
-    return hash_senha(senha) == senha_hash
+    """Verifica se a senha corresponde ao hash (scrypt ou SHA-256 legado)."""
+    if not senha_hash.startswith("scrypt$"):
+        legado = hashlib.sha256(senha.encode()).hexdigest()
+        return hmac.compare_digest(legado, senha_hash)
+    try:
+        _, n, r, p, salt, esperado = senha_hash.split("$")
+        derivado = _scrypt(senha, base64.b64decode(salt), int(n), int(r), int(p))
+    except ValueError:
+        return False
+    return hmac.compare_digest(derivado, base64.b64decode(esperado))
+
+
+def precisa_atualizar_hash(senha_hash: str) -> bool:
+    """Hash legado (SHA-256) ou gerado com parâmetros diferentes dos atuais."""
+    return not senha_hash.startswith(f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
+
+
+# ---- Versões assíncronas (rodam no pool de processos) ----
+
+def _obter_executor_hash() -> ProcessPoolExecutor:
+    global _executor_hash
+    if _executor_hash is None:
+        _executor_hash = ProcessPoolExecutor(max_workers=HASH_PROCESSOS)
+    return _executor_hash
+
+
+async def hash_senha_async(senha: str) -> str:
+    """hash_senha sem bloquear o event loop nem o threadpool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_obter_executor_hash(), hash_senha, senha)
+
+
+async def verificar_senha_async(senha: str, senha_hash: str) -> bool:
+    """verificar_senha sem bloquear o event loop nem o threadpool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_obter_executor_hash(), verificar_senha, senha, senha_hash)
+
+
+def encerrar_pool_hash() -> None:
+    """Finaliza os processos de hash (chamado no shutdown da API)."""
+    global _executor_hash
+    if _executor_hash is not None:
+        _executor_hash.shutdown(wait=False, cancel_futures=True)
+        _executor_hash = None
+
+
+def verificar_segredo() -> None:
+    """Impede a API de subir sem uma SECRET_KEY própria (chamado no startup)."""
+    if not SECRET_KEY or SECRET_KEY == _SEGREDO_PUBLICADO:
+        raise RuntimeError(
+            "Defina SECRET_KEY com um valor próprio (ex.: openssl rand -hex 32)"
+        )
+    if len(SECRET_KEY) < SEGREDO_TAMANHO_MINIMO:
+        raise RuntimeError(f"SECRET_KEY precisa ter pelo menos {SEGREDO_TAMANHO_MINIMO} caracteres")
 
 
 def criar_token(id_usuario: int, role: str, nome: str) -> str:
     """Cria token JWT com id, role e nome do usuário."""
+    agora = datetime.datetime.now(datetime.timezone.utc)
     payload = {
-        "sub": id_usuario,
+        "sub": str(id_usuario),
         "role": role,
         "nome": nome,
-        "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=TOKEN_EXPIRA_HORAS),
+        "iat": agora,
+        "exp": agora + datetime.timedelta(hours=TOKEN_EXPIRA_HORAS),
     }
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
@@ -45,19 +140,89 @@ def decodificar_token(token: str) -> dict:
     """Decodifica e valida o token JWT."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload["id_usuario"] = int(payload["sub"])
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expirado")
-    except jwt.InvalidTokenError:
+    except (jwt.InvalidTokenError, KeyError, ValueError):
         raise HTTPException(status_code=401, detail="Token inválido")
 
 
-def get_usuario_atual(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    """Dependency que retorna o payload do usuário autenticado."""
-    return decodificar_token(credentials.credentials)
-
-
-def exigir_admin(usuario: dict = Depends(get_usuario_atual)) -> dict:
+class CacheTokens:
+    """
+    LRU limitado de tokens já verificados. Um acerto dispensa a verificação
+    da assinatura e o banco; cada entrada vale até o `exp` do próprio token e
+    por no máximo TOKEN_REVALIDAR_SEGUNDOS, quando o usuário é conferido de novo.
+
+    revogar_usuario só vale no processo atual. Nos outros workers, o token de
+    um usuário removido deixa de valer na próxima conferência com o banco,
+    em até TOKEN_REVALIDAR_SEGUNDOS.
+    """
+
+    def __init__(self, tamanho_maximo: int = TOKEN_CACHE_MAX):
+        self._tamanho_maximo = tamanho_maximo
+        self._tokens: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._revogados: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def obter(self, token: str) -> dict | None:
+        with self._lock:
+            entrada = self._tokens.get(token)
+            if entrada is None:
+                return None
+            payload, conferido_em = entrada
+            agora = time.time()
+            if payload["exp"] <= agora or agora - conferido_em > TOKEN_REVALIDAR_SEGUNDOS:
+                del self._tokens[token]
+                return None
+            self._tokens.move_to_end(token)
+            return payload
+
+    def guardar(self, token: str, payload: dict) -> None:
+        with self._lock:
+            self._tokens[token] = (payload, time.time())
+            self._tokens.move_to_end(token)
+            while len(self._tokens) > self._tamanho_maximo:
+                self._tokens.popitem(last=False)
+
+    def revogado(self, payload: dict) -> bool:
+        revogado_em = self._revogados.get(payload["id_usuario"])
+        return revogado_em is not None and payload.get("iat", 0) <= revogado_em
+
+    def revogar_usuario(self, id_usuario: int) -> None:
+        """Invalida os tokens já emitidos para o usuário (neste processo)."""
+        with self._lock:
+            self._revogados[id_usuario] = time.time()
+            for token in [t for t, (p, _) in self._tokens.items() if p["id_usuario"] == id_usuario]:
+                del self._tokens[token]
+
+
+cache_tokens = CacheTokens()
+
+
+def _papel_atual(session: Session, id_usuario: int) -> str | None:
+    return session.exec(select(Usuario.role).where(Usuario.id_usuario == id_usuario)).first()
+
+
+async def get_usuario_atual(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    """
+    Dependency que retorna o payload do usuário autenticado. Fora do cache,
+    confere no banco (primário) se o usuário ainda existe com o mesmo papel.
+    """
+    token = credentials.credentials
+    payload = cache_tokens.obter(token)
+    if payload is None:
+        payload = decodificar_token(token)
+        if cache_tokens.revogado(payload):
+            raise HTTPException(status_code=401, detail="Token inválido")
+        papel = await executar(_papel_atual, payload["id_usuario"], leitura=False)
+        if papel != payload.get("role"):
+            raise HTTPException(status_code=401, detail="Token inválido")
+        cache_tokens.guardar(token, payload)
+    return payload
+
+
+async def exigir_admin(usuario: dict = Depends(get_usuario_atual)) -> dict:
     """Dependency que exige que o usuário seja admin."""
     if usuario.get("role") != "admin":
         raise HTTPException(
@@ -67,6 +232,6 @@ def exigir_admin(usuario: dict = Depends(get_usuario_atual)) -> dict:
     return usuario
 
 
-def exigir_usuario(usuario: dict = Depends(get_usuario_atual)) -> dict:
+async def exigir_usuario(usuario: dict = Depends(get_usuario_atual)) -> dict:
     """Dependency que exige qualquer usuário autenticado."""
     return usuario
@@ -0,0 +1,308 @@
+"""
+Teste de carga: reproduz o tráfego do app Flutter (lib/services/api_service.dart)
+contra uma API já rodando e reporta latência (p50/p95/p99) e vazão por rota.
+
+Cada usuário virtual faz login com um participante da massa gerada por
+benchmarks/semear.py e, até o fim do tempo, abre telas do app sorteadas
+pelos pesos de TELAS. Cada tela faz as mesmas requisições que a página
+correspondente do app, inclusive o If-None-Match do cache de ETag do cliente.
+
+Uso (na pasta backend, com a API no ar e a massa já gerada):
+    uvicorn main:app --workers 4                       # em outro terminal
+    python -m benchmarks.carga --usuarios-virtuais 50 --duracao 60
+    python -m benchmarks.carga --comparar resultados/a.json resultados/b.json
+
+O resultado é salvo em benchmarks/resultados/carga-<commit>-<data>.json.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+import httpx
+from benchmarks.semear import EMAIL_PARTICIPANTE, SENHA_PARTICIPANTES, Volumes
+
+DIRETORIO_RESULTADOS = Path(__file__).resolve().parent / "resultados"
+
+
+class Cliente:
+    """Um usuário do app: token, cache de ETag e registro das latências."""
+
+    def __init__(self, http: httpx.AsyncClient, latencias: dict, erros: dict, usar_etag: bool):
+        self.http = http
+        self.latencias = latencias
+        self.erros = erros
+        self.usar_etag = usar_etag
+        self.cabecalhos: dict[str, str] = {}
+        self._etags: dict[str, tuple[str, bytes]] = {}
+
+    async def requisitar(self, metodo: str, url: str, rota: str, esperados=(200,), **kwargs):
+        """Faz a requisição e registra a latência em `rota` (nome agregado)."""
+        cabecalhos = dict(self.cabecalhos)
+        anterior = self._etags.get(url) if metodo == "GET" and self.usar_etag else None
+        if anterior:
+            cabecalhos["If-None-Match"] = anterior[0]
+        inicio = time.perf_counter()
+        try:
+            resposta = await self.http.request(metodo, url, headers=cabecalhos, **kwargs)
+        except httpx.HTTPError:
+            self.erros[rota] += 1
+            return None
+        self.latencias[rota].append(time.perf_counter() - inicio)
+        if resposta.status_code == 304 and anterior:
+            return json.loads(anterior[1])
+        if resposta.status_code not in esperados:
+            self.erros[rota] += 1
+            return None
+        if "etag" in resposta.headers and self.usar_etag:
+            self._etags[url] = (resposta.headers["etag"], resposta.content)
+        return resposta.json()
+
+    async def login(self, email: str, senha: str) -> dict | None:
+        dados = await self.requisitar(
+            "POST", "/auth/login", "POST /auth/login", json={"email": email, "senha": senha}
+        )
+        if dados:
+            self.cabecalhos = {"Authorization": f"Bearer {dados['token']}"}
+        return dados
+
+    async def todas_as_paginas(self, url: str, rota: str) -> list:
+        """Mesmo que ApiService._listarTodasPaginas."""
+        itens, cursor = [], None
+        while True:
+            pagina = await self.requisitar("GET", url if cursor is None else f"{url}?cursor={cursor}", rota)
+            if not pagina:
+                return itens
+            itens.extend(pagina["itens"])
+            cursor = pagina["proximo_cursor"]
+            if cursor is None:
+                return itens
+
+
+# ===================== TELAS DO APP =====================
+
+async def tela_inicial(c: Cliente, ids_palestras):
+    await c.requisitar("GET", "/usuario/notificacoes/nao-lidas", "GET /usuario/notificacoes/nao-lidas")
+
+
+async def tela_cronograma(c: Cliente, ids_palestras):
+    modo = random.choice([None, None, None, "agora", "proximas"])
+    if modo:
+        await c.requisitar("GET", f"/usuario/palestras?modo={modo}", f"GET /usuario/palestras?modo={modo}")
+    else:
+        await c.requisitar("GET", "/usuario/palestras", "GET /usuario/palestras")
+
+
+async def tela_checkin(c: Cliente, ids_palestras):
+    await c.requisitar("GET", "/usuario/palestras", "GET /usuario/palestras")
+    await c.requisitar(
+        "POST", "/usuario/checkin", "POST /usuario/checkin", esperados=(200, 400),
+        json={"id_palestra": random.choice(ids_palestras)},
+    )
+
+
+async def tela_avaliacao(c: Cliente, ids_palestras):
+    checkins = await c.todas_as_paginas("/usuario/checkins", "GET /usuario/checkins")
+    if checkins:
+        await c.requisitar(
+            "POST", "/usuario/avaliar", "POST /usuario/avaliar", esperados=(200, 400),
+            json={"id_palestra": random.choice(checkins)["id_palestra"], "nota": random.randint(1, 5)},
+        )
+
+
+async def tela_ver_avaliacoes(c: Cliente, ids_palestras):
+    await c.todas_as_paginas("/usuario/avaliacoes-por-palestra", "GET /usuario/avaliacoes-por-palestra")
+    await c.requisitar(
+        "GET", f"/usuario/palestras/{random.choice(ids_palestras)}/avaliacoes",
+        "GET /usuario/palestras/{id}/avaliacoes",
+    )
+
+
+async def tela_notificacoes(c: Cliente, ids_palestras):
+    notificacoes = await c.todas_as_paginas("/usuario/notificacoes", "GET /usuario/notificacoes")
+    nao_lidas = [n for n in notificacoes if not n["lida"]]
+    if nao_lidas and random.random() < 0.3:
+        await c.requisitar(
+            "PUT", f"/usuario/notificacoes/{random.choice(nao_lidas)['id_notificacao']}/lida",
+            "PUT /usuario/notificacoes/{id}/lida",
+        )
+
+
+async def tela_meu_certificado(c: Cliente, ids_palestras):
+    await c.requisitar("GET", "/usuario/meu-certificado", "GET /usuario/meu-certificado", esperados=(200, 400))
+
+
+async def tela_conta(c: Cliente, ids_palestras):
+    await c.requisitar("GET", "/usuario/perfil", "GET /usuario/perfil")
+
+
+# Peso de cada tela no sorteio (aberturas de tela durante o evento)
+TELAS = [
+    (tela_inicial, 25),
+    (tela_cronograma, 25),
+    (tela_checkin, 15),
+    (tela_notificacoes, 12),
+    (tela_ver_avaliacoes, 8),
+    (tela_avaliacao, 7),
+    (tela_meu_certificado, 4),
+    (tela_conta, 4),
+]
+
+
+# ===================== EXECUÇÃO =====================
+
+async def _usuario_virtual(c: Cliente, fim: float, pausa: float, ids_palestras: list[int]):
+    telas, pesos = zip(*TELAS)
+    while time.perf_counter() < fim:
+        tela = random.choices(telas, pesos)[0]
+        await tela(c, ids_palestras)
+        if pausa:
+            await asyncio.sleep(random.expovariate(1 / pausa))
+
+
+async def executar_carga(
+    url: str, usuarios_virtuais: int, duracao: float, participantes: int,
+    pausa: float = 0.0, usar_etag: bool = True,
+) -> dict:
+    latencias: dict[str, list[float]] = defaultdict(list)
+    erros: dict[str, int] = defaultdict(int)
+    limites = httpx.Limits(max_connections=usuarios_virtuais, max_keepalive_connections=usuarios_virtuais)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=30) as http:
+        clientes = [Cliente(http, latencias, erros, usar_etag) for _ in range(usuarios_virtuais)]
+        # Login fora da janela medida (scrypt é caro de propósito)
+        numeros = random.sample(range(1, participantes + 1), usuarios_virtuais)
+        await asyncio.gather(*(
+            c.login(EMAIL_PARTICIPANTE.format(n), SENHA_PARTICIPANTES) for c, n in zip(clientes, numeros)
+        ))
+        clientes = [c for c in clientes if c.cabecalhos]
+        if not clientes:
+            raise SystemExit("Nenhum login funcionou: rode antes python -m benchmarks.semear")
+        ids_palestras = [p["id_palestra"] for p in (await http.get("/usuario/palestras")).json()]
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(
+            _usuario_virtual(c, inicio + duracao, pausa, ids_palestras) for c in clientes
+        ))
+        decorrido = time.perf_counter() - inicio
+    return _resumir(latencias, erros, decorrido)
+
+
+def _percentil(ordenadas: list[float], q: float) -> float:
+    """Percentil pelo método do posto mais próximo, em ms."""
+    return ordenadas[max(0, math.ceil(q * len(ordenadas)) - 1)] * 1000
+
+
+def _estatisticas(amostras: list[float], erros: int, decorrido: float) -> dict:
+    ordenadas = sorted(amostras)
+    if not ordenadas:
+        return {"requisicoes": 0, "erros": erros}
+    return {
+        "requisicoes": len(ordenadas),
+        "erros": erros,
+        "rps": round(len(ordenadas) / decorrido, 1),
+        "media_ms": round(sum(ordenadas) / len(ordenadas) * 1000, 2),
+        "p50_ms": round(_percentil(ordenadas, 0.50), 2),
+        "p95_ms": round(_percentil(ordenadas, 0.95), 2),
+        "p99_ms": round(_percentil(ordenadas, 0.99), 2),
+    }
+
+
+def _resumir(latencias: dict, erros: dict, decorrido: float) -> dict:
+    login = "POST /auth/login"
+    rotas = {
+        rota: _estatisticas(amostras, erros.get(rota, 0), decorrido)
+        for rota, amostras in sorted(latencias.items()) if rota != login
+    }
+    medidas = [a for rota, amostras in latencias.items() if rota != login for a in amostras]
+    return {
+        "duracao_s": round(decorrido, 2),
+        "rotas": rotas,
+        "total": _estatisticas(medidas, sum(v for k, v in erros.items() if k != login), decorrido),
+        "login": _estatisticas(latencias.get(login, []), erros.get(login, 0), decorrido),
+    }
+
+
+def _commit_atual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "sem-git"
+
+
+def salvar(resultado: dict, config: dict, diretorio: Path = DIRETORIO_RESULTADOS) -> Path:
+    commit = _commit_atual()
+    agora = datetime.now()
+    diretorio.mkdir(parents=True, exist_ok=True)
+    caminho = diretorio / f"carga-{commit}-{agora:%Y%m%d-%H%M%S}.json"
+    caminho.write_text(json.dumps(
+        {"commit": commit, "data": agora.isoformat(timespec="seconds"), "config": config, **resultado},
+        ensure_ascii=False, indent=2,
+    ), encoding="utf-8")
+    return caminho
+
+
+def imprimir(resultado: dict) -> None:
+    linhas = [*resultado["rotas"].items(), ("TOTAL", resultado["total"])]
+    largura = max(len(rota) for rota, _ in linhas)
+    print(f"{'rota':<{largura}}  {'req':>7}  {'erros':>5}  {'req/s':>7}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}")
+    for rota, e in linhas:
+        if not e["requisicoes"]:
+            continue
+        print(f"{rota:<{largura}}  {e['requisicoes']:>7}  {e['erros']:>5}  {e['rps']:>7.1f}"
+              f"  {e['p50_ms']:>8.2f}  {e['p95_ms']:>8.2f}  {e['p99_ms']:>8.2f}")
+
+
+def comparar(caminho_a: str, caminho_b: str) -> None:
+    """Diferença de p50/p95/p99 e vazão por rota entre dois resultados salvos."""
+    a, b = (json.loads(Path(c).read_text(encoding="utf-8")) for c in (caminho_a, caminho_b))
+    print(f"A: {a['commit']} ({a['data']})   B: {b['commit']} ({b['data']})")
+    rotas = [r for r in a["rotas"] if r in b["rotas"]] + ["TOTAL"]
+    largura = max(len(r) for r in rotas)
+    print(f"{'rota':<{largura}}  {'p50 A→B (ms)':>19}  {'p95 A→B (ms)':>19}  {'p99 A→B (ms)':>19}  {'req/s A→B':>15}")
+    for rota in rotas:
+        ea = a["total"] if rota == "TOTAL" else a["rotas"][rota]
+        eb = b["total"] if rota == "TOTAL" else b["rotas"][rota]
+        if not ea["requisicoes"] or not eb["requisicoes"]:
+            continue
+        colunas = [f"{ea[k]:>8.2f} → {eb[k]:>8.2f}" for k in ("p50_ms", "p95_ms", "p99_ms")]
+        print(f"{rota:<{largura}}  " + "  ".join(colunas) + f"  {ea['rps']:>6.1f} → {eb['rps']:>6.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--usuarios-virtuais", type=int, default=50)
+    parser.add_argument("--duracao", type=float, default=60, help="segundos medidos")
+    parser.add_argument("--pausa", type=float, default=0.0, help="pausa média (s) entre telas")
+    parser.add_argument("--participantes", type=int, default=Volumes.usuarios,
+                        help="quantidade de participantes da massa gerada")
+    parser.add_argument("--sem-etag", action="store_true", help="não envia If-None-Match")
+    parser.add_argument("--nao-salvar", action="store_true")
+    parser.add_argument("--comparar", nargs=2, metavar=("A.json", "B.json"))
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar(*args.comparar)
+        return
+
+    config = {
+        "url": args.url, "usuarios_virtuais": args.usuarios_virtuais, "duracao_s": args.duracao,
+        "pausa_s": args.pausa, "participantes": args.participantes, "etag": not args.sem_etag,
+    }
+    resultado = asyncio.run(executar_carga(
+        args.url, args.usuarios_virtuais, args.duracao, args.participantes, args.pausa, not args.sem_etag,
+    ))
+    imprimir(resultado)
+    if not args.nao_salvar:
+        print(f"Resultado salvo em {salvar(resultado, config)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Gera uma massa de dados sintética do evento para os testes de carga.
+
+APAGA os dados atuais (TRUNCATE em todas as tabelas) e insere, com
+INSERT ... SELECT generate_series no próprio banco:
+- participantes (senha "senha123", e-mail participanteN@semana.ufop.br)
+  e o admin padrão (admin@decsi.ufop.br / admin123)
+- palestrantes e palestras distribuídas pelos dias do evento, em várias salas
+- presenças (um check-in por usuário e palestra), avaliações de parte delas,
+  notificações individuais e para todos, e leituras das enviadas para todos
+
+Uso (na pasta backend, com o .env apontando para o banco de teste; o
+--confirmar repete o nome desse banco, senão nada é apagado):
+    python -m benchmarks.semear --confirmar db_carga --escala 1     # 20k usuários, 200k presenças...
+    python -m benchmarks.semear --confirmar db_carga --escala 0.05  # massa pequena para conferir
+"""
+import argparse
+import time
+from dataclasses import dataclass, fields
+from datetime import date, timedelta
+from sqlalchemy import text
+from auth_utils import hash_senha
+from dados_banco import cria_conexao_postgre
+from formatos import FUSO_EVENTO, agora_no_evento
+from migracoes import aplicar_migracoes
+
+SENHA_PARTICIPANTES = "senha123"
+EMAIL_PARTICIPANTE = "participante{}@semana.ufop.br"
+
+LOCAIS = [
+    "Auditório", "Sala 101", "Sala 102", "Sala 201", "Sala 202",
+    "Laboratório 1", "Laboratório 2", "Anfiteatro",
+]
+COMENTARIOS = [
+    "Excelente palestra!", "Muito boa, recomendo.", "Conteúdo interessante.",
+    "Poderia ter mais exemplos práticos.", "Ótima didática do palestrante.",
+    "Um pouco longa.", "Gostei muito dos exemplos.",
+]
+
+
+@dataclass
+class Volumes:
+    """Quantidades da massa completa (--escala 1)."""
+    usuarios: int = 20_000
+    palestrantes: int = 120
+    palestras: int = 300
+    presencas: int = 200_000
+    avaliacoes: int = 50_000
+    notificacoes: int = 1_000_000
+    avisos_para_todos: int = 40
+    dias: int = 5
+
+    def escalar(self, fator: float) -> "Volumes":
+        # Dias e avisos não escalam: a forma do evento continua a mesma
+        fixos = {"dias", "avisos_para_todos"}
+        return Volumes(**{
+            f.name: getattr(self, f.name) if f.name in fixos else max(1, int(getattr(self, f.name) * fator))
+            for f in fields(self)
+        })
+
+
+def _etapas(v: Volumes, inicio: date, hash_participante: str, hash_admin: str):
+    """(descrição, SQL, parâmetros) de cada etapa, em ordem."""
+    por_dia = -(-v.palestras // v.dias)
+    # Cada usuário faz no máximo uma presença por palestra
+    presencas = min(v.presencas, v.usuarios * v.palestras)
+    yield "limpeza", """
+        TRUNCATE notificacao_leitura, notificacao, avaliacao, presenca,
+                 palestra, palestrante, usuario RESTART IDENTITY CASCADE
+    """, {}
+    yield "usuários", """
+        INSERT INTO usuario (nome, email, senha_hash, role, matricula)
+        SELECT 'Participante ' || i, format(:email, i), :hash, 'user', lpad(i::text, 8, '2')
+        FROM generate_series(1, :usuarios) AS i
+    """, {"email": EMAIL_PARTICIPANTE.replace("{}", "%s"), "hash": hash_participante,
+          "usuarios": v.usuarios}
+    yield "admin", """
+        INSERT INTO usuario (nome, email, senha_hash, role)
+        VALUES ('Administrador', 'admin@decsi.ufop.br', :hash, 'admin')
+    """, {"hash": hash_admin}
+    yield "palestrantes", """
+        INSERT INTO palestrante (nome, formacao)
+        SELECT 'Palestrante ' || i,
+               (ARRAY['Graduação', 'Mestrado', 'Doutorado', 'Indústria'])[1 + i % 4]
+        FROM generate_series(1, :palestrantes) AS i
+    """, {"palestrantes": v.palestrantes}
+    # Palestra i: dia (i / por_dia), sala e horário (slots de 1h a partir das 08:00)
+    yield "palestras", """
+        INSERT INTO palestra (titulo, descricao, data, horario_inicio, horario_fim, local, id_palestrante)
+        SELECT 'Palestra ' || i,
+               repeat('Descrição da palestra ' || i || '. ', 10),
+               :inicio + (k / :por_dia),
+               TIME '08:00' + ((k % :por_dia) / :salas) * INTERVAL '1 hour',
+               TIME '08:50' + ((k % :por_dia) / :salas) * INTERVAL '1 hour',
+               (:locais)[1 + k % :salas],
+               1 + k % :palestrantes
+        FROM generate_series(1, :palestras) AS i, LATERAL (SELECT i - 1 AS k) AS p
+    """, {"inicio": inicio, "por_dia": por_dia, "salas": len(LOCAIS), "locais": LOCAIS,
+          "palestrantes": v.palestrantes, "palestras": v.palestras}
+    # Rodada r do usuário u vai para a palestra (u * 31 + r) % palestras:
+    # palestras diferentes para o mesmo usuário enquanto r < palestras
+    yield "presenças", """
+        INSERT INTO presenca (id_usuario, id_palestra, horario_checkin)
+        SELECT u + 1, pa.id_palestra,
+               ((pa.data + pa.horario_inicio) AT TIME ZONE :fuso)
+                   + (random() * 15) * INTERVAL '1 minute'
+        FROM generate_series(0, :presencas - 1) AS i,
+             LATERAL (SELECT i % :usuarios AS u, i / :usuarios AS r) AS x
+        JOIN palestra pa ON pa.id_palestra = 1 + (u * 31 + r) % :palestras
+    """, {"presencas": presencas, "usuarios": v.usuarios, "palestras": v.palestras,
+          "fuso": str(FUSO_EVENTO)}
+    yield "avaliações", """
+        INSERT INTO avaliacao (id_usuario, id_palestra, nota, comentario)
+        SELECT id_usuario, id_palestra,
+               (ARRAY[5, 5, 4, 4, 4, 3, 3, 2, 1])[1 + (id_presenca * 7) % 9],
+               CASE WHEN id_presenca % 3 = 0 THEN NULL
+                    ELSE (:comentarios)[1 + id_presenca % :n_comentarios] END
+        FROM presenca
+        ORDER BY id_presenca
+        LIMIT :avaliacoes
+    """, {"comentarios": COMENTARIOS, "n_comentarios": len(COMENTARIOS),
+          "avaliacoes": min(v.avaliacoes, presencas)}
+    yield "avisos para todos", """
+        INSERT INTO notificacao (id_usuario, titulo, mensagem, lida, ate_id_usuario)
+        SELECT NULL, 'Aviso geral ' || i, 'Mensagem para todos os participantes ' || i, FALSE,
+               (SELECT max(id_usuario) FROM usuario)
+        FROM generate_series(1, :avisos) AS i
+    """, {"avisos": v.avisos_para_todos}
+    yield "notificações individuais", """
+        INSERT INTO notificacao (id_usuario, titulo, mensagem, lida)
+        SELECT 1 + i % :usuarios, 'Lembrete ' || i,
+               'Sua próxima palestra começa em breve (' || i || ')', random() < 0.6
+        FROM generate_series(1, :individuais) AS i
+    """, {"usuarios": v.usuarios, "individuais": max(0, v.notificacoes - v.avisos_para_todos)}
+    yield "leituras dos avisos", """
+        INSERT INTO notificacao_leitura (id_notificacao, id_usuario)
+        SELECT n.id_notificacao, u.id_usuario
+        FROM notificacao n
+        JOIN usuario u ON u.role = 'user' AND (u.id_usuario + n.id_notificacao) % 2 = 0
+        WHERE n.id_usuario IS NULL
+    """, {}
+    yield "estatísticas", "ANALYZE", {}
+
+
+def semear(volumes: Volumes, inicio: date | None = None, engine=None) -> dict[str, float]:
+    """Recria a massa de dados e retorna o tempo (s) de cada etapa."""
+    engine = engine or cria_conexao_postgre()
+    aplicar_migracoes(engine)
+    inicio = inicio or agora_no_evento().date()
+    tempos = {}
+    etapas = _etapas(volumes, inicio, hash_senha(SENHA_PARTICIPANTES), hash_senha("admin123"))
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexao:
+        # Carga descartável: não precisa esperar o WAL ir para o disco
+        conexao.execute(text("SET synchronous_commit = off"))
+        for descricao, sql, parametros in etapas:
+            t0 = time.perf_counter()
+            conexao.execute(text(sql), parametros)
+            tempos[descricao] = time.perf_counter() - t0
+            print(f"{descricao:<26} {tempos[descricao]:7.2f}s")
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--confirmar", required=True, metavar="BANCO",
+                        help="nome do banco cujos dados serão APAGADOS (o do .env)")
+    parser.add_argument("--escala", type=float, default=1.0, help="fator sobre os volumes completos")
+    parser.add_argument("--inicio", type=date.fromisoformat, default=None,
+                        help="primeiro dia do evento (AAAA-MM-DD); padrão: hoje")
+    for campo in fields(Volumes):
+        parser.add_argument(f"--{campo.name.replace('_', '-')}", type=int, default=None,
+                            help=f"sobrepõe o volume (completo: {campo.default})")
+    args = parser.parse_args()
+
+    volumes = Volumes().escalar(args.escala)
+    for campo in fields(Volumes):
+        valor = getattr(args, campo.name)
+        if valor is not None:
+            setattr(volumes, campo.name, valor)
+    engine = cria_conexao_postgre()
+    print(f"Banco: {engine.url.render_as_string(hide_password=True)}")
+    if args.confirmar != engine.url.database:
+        raise SystemExit(
+            f"--confirmar {args.confirmar} não é o banco do .env ({engine.url.database}): nada foi apagado"
+        )
+    print(volumes)
+    tempos = semear(volumes, args.inicio, engine)
+    print(f"{'total':<26} {sum(tempos.values()):7.2f}s")
+    print(f"Participantes: {EMAIL_PARTICIPANTE.format('N')} / {SENHA_PARTICIPANTES} "
+          f"(N de 1 a {volumes.usuarios}); fim do evento: "
+          f"{(args.inicio or agora_no_evento().date()) + timedelta(days=volumes.dias - 1)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Benchmark da serialização das respostas, por rota (não usa o banco).
+
+Compara, para uma página cheia de cada rota listada:
+- antes: jsonable_encoder + JSONResponse (rota sem response_model)
+- depois: response_model (pydantic-core) + ORJSONResponse, como em main.py
+
+Uso (na pasta backend):
+    python -m benchmarks.serializacao [--itens 200] [--repeticoes 5]
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from cache_utils import serializar_json
+from dados_banco import Palestrante
+from main import app
+from paginacao import LIMITE_MAXIMO
+
+
+def _pagina(itens: list) -> dict:
+    return {"itens": itens, "proximo_cursor": len(itens)}
+
+
+def _usuarios(n):
+    return _pagina([
+        {"id_usuario": i, "nome": f"Participante {i}", "email": f"p{i}@ufop.edu.br", "matricula": f"20{i:06d}"}
+        for i in range(1, n + 1)
+    ])
+
+
+def _administradores(n):
+    return _pagina([
+        {"id_usuario": i, "nome": f"Admin {i}", "email": f"a{i}@ufop.edu.br", "role": "admin"}
+        for i in range(1, n + 1)
+    ])
+
+
+def _palestrantes(n):
+    # A rota devolve os objetos do ORM, não dicts
+    return _pagina([
+        Palestrante(id_palestrante=i, nome=f"Palestrante {i}", formacao="Doutorado em Computação")
+        for i in range(1, n + 1)
+    ])
+
+
+def _avaliacoes_por_palestra(n):
+    return _pagina([
+        {
+            "id_palestra": i, "titulo": f"Palestra {i}", "palestrante": f"Palestrante {i % 20}",
+            "data": "20/10/2026", "media_nota": 4.3, "total_avaliacoes": 57,
+        }
+        for i in range(1, n + 1)
+    ])
+
+
+def _avaliacoes_da_palestra(n):
+    return _pagina([
+        {"id_avaliacao": i, "nome_usuario": f"Participante {i}", "nota": i % 5 + 1, "comentario": "Muito boa, recomendo!"}
+        for i in range(1, n + 1)
+    ])
+
+
+def _minhas_avaliacoes(n):
+    return _pagina([
+        {"id_avaliacao": i, "titulo_palestra": f"Palestra {i}", "nota": i % 5 + 1, "comentario": None}
+        for i in range(1, n + 1)
+    ])
+
+
+def _checkins(n):
+    inicio = datetime(2026, 10, 20, 8, 0, tzinfo=timezone(timedelta(hours=-3)))
+    return _pagina([
+        {
+            "id_presenca": i, "id_palestra": i, "titulo_palestra": f"Palestra {i}",
+            "horario_checkin": inicio + timedelta(minutes=i),
+        }
+        for i in range(1, n + 1)
+    ])
+
+
+def _notificacoes(n):
+    return _pagina([
+        {"id_notificacao": i, "titulo": "Nova palestra cadastrada!", "mensagem": f'"Palestra {i}" em 20/10/2026 às 14:00 - Auditório', "lida": i % 2 == 0}
+        for i in range(1, n + 1)
+    ])
+
+
+def _certificado(n):
+    palestras = [
+        {"titulo": f"Palestra {i}", "local": "Auditório", "horario_inicio": "14:00", "horario_fim": "15:30", "palestrante": f"Palestrante {i}"}
+        for i in range(1, n + 1)
+    ]
+    return {
+        "usuario": {"nome": "Participante", "email": "p@ufop.edu.br", "cpf": None, "matricula": "20000001"},
+        "palestras": palestras,
+        "total_horas": n * 1.5,
+        "data_emissao": "20/10/2026 18:00",
+        "mensagem": f"Certificamos que Participante participou com carga horária total de {n * 1.5} horas.",
+    }
+
+
+def _cronograma(n):
+    return [
+        {
+            "id_palestra": i, "titulo": f"Palestra {i}", "descricao": "Descrição da palestra " * 4,
+            "data": "20/10/2026", "horario_inicio": "14:00", "horario_fim": "15:30",
+            "duracao_minutos": 90, "local": "Auditório", "palestrante": f"Palestrante {i}",
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+# (método, rota, gerador do retorno da rota com n itens)
+CASOS = [
+    ("GET", "/admin/usuarios", _usuarios),
+    ("GET", "/admin/administradores", _administradores),
+    ("GET", "/admin/palestrantes", _palestrantes),
+    ("GET", "/usuario/avaliacoes-por-palestra", _avaliacoes_por_palestra),
+    ("GET", "/usuario/palestras/{id_palestra}/avaliacoes", _avaliacoes_da_palestra),
+    ("GET", "/usuario/avaliacoes", _minhas_avaliacoes),
+    ("GET", "/usuario/checkins", _checkins),
+    ("GET", "/usuario/notificacoes", _notificacoes),
+    ("GET", "/usuario/meu-certificado", _certificado),
+]
+
+
+def _rota(metodo: str, caminho: str) -> APIRoute:
+    for rota in app.routes:
+        if isinstance(rota, APIRoute) and rota.path == caminho and metodo in rota.methods:
+            return rota
+    raise LookupError(f"{metodo} {caminho} não encontrada")
+
+
+async def _medir(funcao, repeticoes: int, voltas: int) -> float:
+    """Melhor média (µs por chamada) entre as repetições."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(voltas):
+            await funcao()
+        melhor = min(melhor, (time.perf_counter() - inicio) / voltas)
+    return melhor * 1e6
+
+
+async def executar_benchmark(itens: int, repeticoes: int, voltas: int) -> list[tuple[str, float, float]]:
+    resultados = []
+    for metodo, caminho, gerar in CASOS:
+        rota = _rota(metodo, caminho)
+        conteudo = gerar(itens)
+
+        async def antes():
+            return JSONResponse(jsonable_encoder(conteudo)).body
+
+        async def depois():
+            dados = await serialize_response(field=rota.response_field, response_content=conteudo)
+            return ORJSONResponse(dados).body
+
+        # Mesmo conteúdo nos dois caminhos
+        assert json.loads(await antes()) == json.loads(await depois()), caminho
+        resultados.append((
+            f"{metodo} {caminho}",
+            await _medir(antes, repeticoes, voltas),
+            await _medir(depois, repeticoes, voltas),
+        ))
+
+    # Cronograma: rota devolve o snapshot já serializado (cache_utils)
+    cronograma = _cronograma(itens)
+
+    async def cronograma_antes():
+        return json.dumps(cronograma, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    async def cronograma_depois():
+        return serializar_json(cronograma)
+
+    resultados.append((
+        "GET /usuario/palestras (snapshot)",
+        await _medir(cronograma_antes, repeticoes, voltas),
+        await _medir(cronograma_depois, repeticoes, voltas),
+    ))
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--itens", type=int, default=LIMITE_MAXIMO, help="itens por resposta (página cheia)")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--voltas", type=int, default=200, help="chamadas por repetição")
+    args = parser.parse_args()
+
+    resultados = asyncio.run(executar_benchmark(args.itens, args.repeticoes, args.voltas))
+    largura = max(len(nome) for nome, _, _ in resultados)
+    print(f"{'rota':<{largura}}  {'antes (µs)':>11}  {'depois (µs)':>11}  {'ganho':>6}")
+    for nome, antes, depois in resultados:
+        print(f"{nome:<{largura}}  {antes:>11.1f}  {depois:>11.1f}  {antes / depois:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Cache em memória de respostas já serializadas (snapshot + ETag), GET
+condicional (If-None-Match) para as rotas que pedem e parâmetros da
+compressão das respostas.
+"""
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+import orjson
+from dotenv import load_dotenv
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_env_path = Path(__file__).resolve().parent / ".env"
+load_dotenv(_env_path)
+
+# Tempo máximo (segundos) que um snapshot vale mesmo sem invalidação explícita.
+# Garante que processos que não receberam a invalidação se atualizem sozinhos.
+CACHE_TTL_SEGUNDOS = float(os.getenv("CACHE_TTL_SEGUNDOS", "30"))
+
+# Respostas a partir deste tamanho (bytes) vão comprimidas com gzip
+COMPRESSAO_MIN_BYTES = int(os.getenv("COMPRESSAO_MIN_BYTES", "1024"))
+# Nível do gzip (1 = mais rápido, 9 = menor)
+COMPRESSAO_NIVEL = int(os.getenv("COMPRESSAO_NIVEL", "6"))
+
+_ESCOPO_ETAG = "usar_etag"
+
+
+def serializar_json(dados) -> bytes:
+    """Serializa para JSON no mesmo formato do ORJSONResponse (padrão da API)."""
+    return orjson.dumps(dados)
+
+
+def calcular_etag(corpo: bytes) -> str:
+    """
+    ETag a partir do conteúdo do corpo. É fraco (W/) porque o mesmo conteúdo
+    pode sair com ou sem gzip, e o GET condicional só usa comparação fraca.
+    """
+    return 'W/"' + hashlib.sha256(corpo).hexdigest()[:32] + '"'
+
+
+def etag_confere(if_none_match: str | None, etag: str) -> bool:
+    """Verifica se o cabeçalho If-None-Match do cliente casa com o ETag atual."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidatos = [c.strip() for c in if_none_match.split(",")]
+    # Comparação fraca (RFC 9110): ignora o prefixo W/
+    return any(c.removeprefix("W/") == etag.removeprefix("W/") for c in candidatos)
+
+
+def usar_etag(request: Request) -> None:
+    """
+    Dependency que liga o GET condicional na rota:
+    `@router.get(..., dependencies=[Depends(usar_etag)])`.
+    """
+    request.scope[_ESCOPO_ETAG] = True
+
+
+class EtagMiddleware:
+    """
+    Nas rotas com Depends(usar_etag), calcula o ETag da resposta e devolve
+    304 sem corpo quando o If-None-Match do cliente confere. Só trata
+    respostas 200 de corpo único; streaming e respostas que já trazem ETag
+    (ex.: snapshot do cronograma) passam direto.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        inicio: Message | None = None
+
+        async def enviar(mensagem: Message) -> None:
+            nonlocal inicio
+            if mensagem["type"] == "http.response.start":
+                if (
+                    scope.get(_ESCOPO_ETAG)
+                    and mensagem["status"] == 200
+                    and "etag" not in Headers(raw=mensagem["headers"])
+                ):
+                    inicio = mensagem  # segura até ver o corpo
+                    return
+            elif mensagem["type"] == "http.response.body" and inicio is not None:
+                inicio_resposta, inicio = inicio, None
+                if not mensagem.get("more_body", False):
+                    await self._condicional(scope, inicio_resposta, mensagem, send)
+                    return
+                await send(inicio_resposta)
+            await send(mensagem)
+
+        await self.app(scope, receive, enviar)
+
+    @staticmethod
+    async def _condicional(scope: Scope, inicio: Message, corpo: Message, send: Send) -> None:
+        etag = calcular_etag(corpo.get("body", b""))
+        headers = MutableHeaders(raw=inicio["headers"])
+        headers["ETag"] = etag
+        if "cache-control" not in headers:
+            # Rotas autenticadas: só o próprio cliente pode guardar
+            headers["Cache-Control"] = "private, no-cache"
+        if etag_confere(Headers(scope=scope).get("if-none-match"), etag):
+            del headers["content-length"]
+            del headers["content-type"]
+            await send({**inicio, "status": 304})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send(inicio)
+        await send(corpo)
+
+
+class SnapshotCache:
+    """
+    Guarda o payload serializado de uma rota e seu ETag.
+
+    O snapshot é gerado na primeira requisição e reutilizado até ser
+    invalidado (ex.: quando um admin altera os dados) ou expirar o TTL.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL_SEGUNDOS):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._versao = 0
+        self._corpo: bytes | None = None
+        self._etag: str | None = None
+        self._gerado_em = 0.0
+
+    async def obter(self, gerar: Callable[[], Awaitable[object]]) -> tuple[bytes, str]:
+        """Retorna (corpo, etag), gerando o snapshot se necessário."""
+        with self._lock:
+            if self._corpo is not None and time.monotonic() - self._gerado_em < self._ttl:
+                return self._corpo, self._etag
+            versao = self._versao
+
+        corpo = serializar_json(await gerar())
+        etag = calcular_etag(corpo)
+
+        with self._lock:
+            # Só guarda se ninguém invalidou enquanto o snapshot era gerado
+            if versao == self._versao:
+                self._corpo = corpo
+                self._etag = etag
+                self._gerado_em = time.monotonic()
+        return corpo, etag
+
+    def invalidar(self) -> None:
+        """Descarta o snapshot atual."""
+        with self._lock:
+            self._versao += 1
+            self._corpo = None
+            self._etag = None
+
+
+# Snapshot do cronograma público (/usuario/palestras)
+cronograma_cache = SnapshotCache()
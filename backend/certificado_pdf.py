@@ -0,0 +1,142 @@
+"""
+Geração dos certificados em PDF.
+
+A renderização roda em um ProcessPoolExecutor (é CPU-bound e travaria o
+event loop) e o arquivo gerado fica em disco, com nome <id_usuario>_<hash do
+conteúdo do certificado>. Enquanto as presenças do usuário não mudam, o
+mesmo arquivo é servido sem gerar nada de novo; quando mudam, o arquivo
+novo substitui o anterior do mesmo usuário.
+"""
+import asyncio
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from dotenv import load_dotenv
+
+_env_path = Path(__file__).resolve().parent / ".env"
+load_dotenv(_env_path)
+
+DIRETORIO_CACHE = Path(
+    os.getenv("CERTIFICADOS_CACHE_DIR", Path(__file__).resolve().parent / "cache_certificados")
+)
+# Cada worker do uvicorn cria o próprio pool: por padrão, as CPUs divididas
+# entre os workers (WEB_CONCURRENCY; sem ele, um worker por CPU, como na imagem)
+PDF_PROCESSOS = int(os.getenv("PDF_PROCESSOS", "0")) or max(
+    1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+)
+
+# Fonte TrueType com Unicode: as fontes padrão do PDF (Helvetica) só cobrem
+# latin-1 e falham com travessões, aspas curvas, "’" etc.
+DIRETORIO_FONTES = Path(__file__).resolve().parent / "fontes"
+FONTE = "DejaVuSans"
+# Muda quando o desenho do PDF muda, para não servir arquivos antigos do cache
+VERSAO_MODELO = 2
+
+_executor: ProcessPoolExecutor | None = None
+_em_andamento: dict[str, asyncio.Future] = {}
+
+
+def chave_certificado(certificado: dict) -> str:
+    """Hash do conteúdo do certificado (usuário, palestras e carga horária)."""
+    conteudo = {
+        "modelo": VERSAO_MODELO,
+        "usuario": certificado["usuario"],
+        "palestras": certificado["palestras"],
+        "total_horas": certificado["total_horas"],
+    }
+    serializado = json.dumps(conteudo, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(serializado.encode("utf-8")).hexdigest()
+
+
+def renderizar_pdf(certificado: dict) -> bytes:
+    """Desenha o certificado em PDF (executado nos processos do pool)."""
+    from fpdf import FPDF
+
+    pdf = FPDF(orientation="L", format="A4")
+    pdf.add_font(FONTE, "", DIRETORIO_FONTES / "DejaVuSans.ttf")
+    pdf.add_font(FONTE, "B", DIRETORIO_FONTES / "DejaVuSans-Bold.ttf")
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+
+    pdf.set_font(FONTE, "B", 28)
+    pdf.cell(0, 20, "CERTIFICADO", align="C", new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font(FONTE, "", 14)
+    pdf.cell(0, 8, "Semana da Computação DECSI - UFOP", align="C", new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(10)
+
+    pdf.set_font(FONTE, "", 13)
+    pdf.multi_cell(0, 8, certificado["mensagem"], align="C")
+    pdf.ln(6)
+
+    pdf.set_font(FONTE, "B", 12)
+    pdf.cell(0, 8, "Palestras assistidas", new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font(FONTE, "", 11)
+    for p in certificado["palestras"]:
+        linha = (
+            f"- {p['titulo']} ({p['horario_inicio']} às {p['horario_fim']}, "
+            f"{p['local']}) - {p['palestrante']}"
+        )
+        pdf.multi_cell(0, 7, linha)
+
+    pdf.ln(6)
+    usuario = certificado["usuario"]
+    pdf.set_font(FONTE, "", 10)
+    if usuario.get("matricula"):
+        pdf.cell(0, 6, f"Matrícula: {usuario['matricula']}", new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(0, 6, f"Emitido em {certificado['data_emissao']}", new_x="LMARGIN", new_y="NEXT")
+    return bytes(pdf.output())
+
+
+def _obter_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=PDF_PROCESSOS)
+    return _executor
+
+
+def remover_pdfs(id_usuario: int, exceto: Path | None = None) -> None:
+    """Apaga do cache os PDFs do usuário (menos `exceto`, a versão atual)."""
+    for arquivo in DIRETORIO_CACHE.glob(f"{id_usuario}_*.pdf"):
+        if arquivo != exceto:
+            arquivo.unlink(missing_ok=True)
+
+
+def _gravar(id_usuario: int, caminho: Path, conteudo: bytes) -> None:
+    DIRETORIO_CACHE.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_suffix(f".{os.getpid()}.tmp")
+    temporario.write_bytes(conteudo)
+    os.replace(temporario, caminho)
+    remover_pdfs(id_usuario, exceto=caminho)
+
+
+async def _gerar(id_usuario: int, caminho: Path, certificado: dict) -> Path:
+    loop = asyncio.get_running_loop()
+    conteudo = await loop.run_in_executor(_obter_executor(), renderizar_pdf, certificado)
+    await loop.run_in_executor(None, _gravar, id_usuario, caminho, conteudo)
+    return caminho
+
+
+async def obter_pdf(id_usuario: int, certificado: dict) -> Path:
+    """Caminho do PDF do certificado, gerando-o apenas se ainda não existir."""
+    chave = chave_certificado(certificado)
+    caminho = DIRETORIO_CACHE / f"{id_usuario}_{chave}.pdf"
+    if caminho.exists():
+        return caminho
+
+    # Requisições simultâneas do mesmo certificado aguardam a mesma geração
+    tarefa = _em_andamento.get(caminho.name)
+    if tarefa is None:
+        tarefa = asyncio.ensure_future(_gerar(id_usuario, caminho, certificado))
+        _em_andamento[caminho.name] = tarefa
+        tarefa.add_done_callback(lambda _: _em_andamento.pop(caminho.name, None))
+    return await asyncio.shield(tarefa)
+
+
+def encerrar_pool() -> None:
+    """Finaliza os processos de renderização (chamado no shutdown da API)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,150 @@
+"""
+Montagem de certificados a partir das presenças registradas.
+
+Usado pelas rotas de certificado individual (admin e usuário) e pela
+emissão em lote, sempre com consultas por conjunto (sem N+1).
+"""
+import json
+import zipfile
+from datetime import datetime
+from fastapi import HTTPException
+from sqlmodel import Session, exists, func, select
+from dados_banco import Palestra, Palestrante, Presenca, Usuario
+from formatos import formatar_horario
+
+# Quantidade de usuários processados por consulta na emissão em lote
+TAMANHO_LOTE = 500
+
+
+def consultar_palestras_assistidas(
+    session: Session, ids_usuarios: list[int]
+) -> dict[int, tuple[list[dict], float]]:
+    """
+    Palestras assistidas e carga horária total de cada usuário, em uma
+    única consulta (o total é uma soma das durações feita no banco).
+    """
+    total_minutos = func.sum(Palestra.duracao_minutos).over(partition_by=Presenca.id_usuario)
+    linhas = session.exec(
+        select(
+            Presenca.id_usuario,
+            Palestra.titulo,
+            Palestra.local,
+            Palestra.horario_inicio,
+            Palestra.horario_fim,
+            Palestrante.nome,
+            total_minutos,
+        )
+        .join(Palestra, Presenca.id_palestra == Palestra.id_palestra)
+        .join(Palestrante, Palestra.id_palestrante == Palestrante.id_palestrante, isouter=True)
+        .where(Presenca.id_usuario.in_(ids_usuarios))
+        .order_by(Presenca.id_usuario, Presenca.id_presenca)
+    ).all()
+    resultado: dict[int, tuple[list[dict], float]] = {}
+    for id_usuario, titulo, local, inicio, fim, nome_palestrante, minutos in linhas:
+        palestras, _ = resultado.setdefault(id_usuario, ([], round((minutos or 0) / 60, 1)))
+        palestras.append({
+            "titulo": titulo,
+            "local": local,
+            "horario_inicio": formatar_horario(inicio),
+            "horario_fim": formatar_horario(fim),
+            "palestrante": nome_palestrante or "N/A",
+        })
+    return resultado
+
+
+def montar_certificado(
+    usuario: Usuario, palestras: list[dict], total_horas: float, data_emissao: str | None = None
+) -> dict:
+    """Monta o payload do certificado de um usuário."""
+    return {
+        "usuario": {
+            "nome": usuario.nome,
+            "email": usuario.email,
+            "cpf": usuario.cpf,
+            "matricula": usuario.matricula,
+        },
+        "palestras": palestras,
+        "total_horas": total_horas,
+        "data_emissao": data_emissao or datetime.now().strftime("%d/%m/%Y %H:%M"),
+        "mensagem": (
+            f"Certificamos que {usuario.nome} participou da Semana da "
+            f"Computação DECSI com carga horária total de {total_horas} horas."
+        ),
+    }
+
+
+def consultar_certificado(session: Session, id_usuario: int, detalhe_sem_presenca: str) -> dict:
+    """Certificado de um usuário (404 se não existe, 400 se não tem presenças)."""
+    usuario = session.get(Usuario, id_usuario)
+    if not usuario:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+
+    assistidas = consultar_palestras_assistidas(session, [id_usuario]).get(id_usuario)
+    if not assistidas:
+        raise HTTPException(status_code=400, detail=detalhe_sem_presenca)
+    palestras, total_horas = assistidas
+    return montar_certificado(usuario, palestras, total_horas)
+
+
+def consultar_lote(session: Session, cursor: int | None, data_emissao: str) -> tuple[list[dict], int | None]:
+    """
+    Certificados do próximo lote de participantes (usuários com presença),
+    em ordem de id_usuario a partir do cursor. Retorna (certificados, próximo cursor).
+    """
+    consulta = select(Usuario).where(
+        exists().where(Presenca.id_usuario == Usuario.id_usuario)
+    )
+    if cursor is not None:
+        consulta = consulta.where(Usuario.id_usuario > cursor)
+    usuarios = session.exec(
+        consulta.order_by(Usuario.id_usuario).limit(TAMANHO_LOTE)
+    ).all()
+    if not usuarios:
+        return [], None
+
+    assistidas = consultar_palestras_assistidas(session, [u.id_usuario for u in usuarios])
+    certificados = [
+        {
+            "id_usuario": u.id_usuario,
+            **montar_certificado(u, *assistidas.get(u.id_usuario, ([], 0.0)), data_emissao),
+        }
+        for u in usuarios
+    ]
+    proximo = usuarios[-1].id_usuario if len(usuarios) == TAMANHO_LOTE else None
+    return certificados, proximo
+
+
+class _BufferZip:
+    """Destino não-pesquisável para o ZipFile: acumula bytes até serem lidos."""
+
+    def __init__(self):
+        self._partes: list[bytes] = []
+
+    def write(self, dados: bytes) -> int:
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self) -> None:
+        pass
+
+    def retirar(self) -> bytes:
+        dados = b"".join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+class ZipIncremental:
+    """Gera um arquivo ZIP aos pedaços, um certificado (JSON) por entrada."""
+
+    def __init__(self):
+        self._buffer = _BufferZip()
+        self._zip = zipfile.ZipFile(self._buffer, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def adicionar(self, certificado: dict) -> bytes:
+        nome = f"certificado_{certificado['id_usuario']}.json"
+        self._zip.writestr(nome, json.dumps(certificado, ensure_ascii=False, indent=2))
+        return self._buffer.retirar()
+
+    def finalizar(self) -> bytes:
+        self._zip.close()
+        return self._buffer.retirar()
@@ -0,0 +1,190 @@
+"""
+Gravação de check-ins (presenças) em lote.
+
+- inserir_presencas: grava vários check-ins com um único INSERT ... SELECT
+  e devolve o status de cada um (usado pela sincronização offline e pelo buffer).
+- BufferCheckin: fila opcional em memória que junta os check-ins que chegam
+  em poucos milissegundos em um único INSERT e um único commit.
+"""
+import asyncio
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from dotenv import load_dotenv
+from sqlalchemy import DateTime, Integer, column, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select
+from dados_banco import executar, Palestra, Presenca, Usuario
+
+_env_path = Path(__file__).resolve().parent / ".env"
+load_dotenv(_env_path)
+
+CHECKIN_BUFFER = os.getenv("CHECKIN_BUFFER", "false").lower() in ("1", "true", "sim")
+CHECKIN_BUFFER_JANELA_MS = float(os.getenv("CHECKIN_BUFFER_JANELA_MS", "5"))
+CHECKIN_BUFFER_MAX = int(os.getenv("CHECKIN_BUFFER_MAX", "500"))
+
+
+def inserir_presencas(session: Session, registros: list[tuple[int, int, datetime]]) -> list[tuple[str, int | None]]:
+    """
+    Grava os registros (id_usuario, id_palestra, horario_checkin) e faz commit.
+
+    Retorna, na mesma ordem, (status, id_presenca) de cada registro, com status
+    "criado", "duplicado", "palestra_inexistente" ou "usuario_inexistente".
+    """
+    entrada = select(
+        values(
+            column("idx", Integer),
+            column("id_usuario", Integer),
+            column("id_palestra", Integer),
+            column("horario_checkin", DateTime(timezone=True)),
+            name="dados",
+        ).data([(i, *r) for i, r in enumerate(registros)])
+    ).cte("entrada")
+
+    # Só entram registros com usuário e palestra existentes; duplicados
+    # (já gravados ou repetidos no próprio lote) são ignorados pelo índice único
+    inseridos = (
+        pg_insert(Presenca)
+        .from_select(
+            ["id_usuario", "id_palestra", "horario_checkin"],
+            select(entrada.c.id_usuario, entrada.c.id_palestra, entrada.c.horario_checkin)
+            .join(Palestra, Palestra.id_palestra == entrada.c.id_palestra)
+            .join(Usuario, Usuario.id_usuario == entrada.c.id_usuario)
+            .order_by(entrada.c.idx),
+        )
+        .on_conflict_do_nothing(index_elements=["id_usuario", "id_palestra"])
+        .returning(Presenca.id_usuario, Presenca.id_palestra, Presenca.id_presenca)
+        .cte("inseridos")
+    )
+
+    linhas = session.exec(
+        select(
+            entrada.c.idx,
+            inseridos.c.id_presenca,
+            Palestra.id_palestra.is_not(None),
+            Usuario.id_usuario.is_not(None),
+        )
+        .select_from(entrada)
+        .join(
+            inseridos,
+            (inseridos.c.id_usuario == entrada.c.id_usuario)
+            & (inseridos.c.id_palestra == entrada.c.id_palestra),
+            isouter=True,
+        )
+        .join(Palestra, Palestra.id_palestra == entrada.c.id_palestra, isouter=True)
+        .join(Usuario, Usuario.id_usuario == entrada.c.id_usuario, isouter=True)
+        .order_by(entrada.c.idx)
+    ).all()
+    session.commit()
+
+    resultados = []
+    ja_criados = set()
+    for idx, id_presenca, palestra_existe, usuario_existe in linhas:
+        par = registros[idx][:2]
+        if not palestra_existe:
+            resultados.append(("palestra_inexistente", None))
+        elif not usuario_existe:
+            resultados.append(("usuario_inexistente", None))
+        elif id_presenca is not None and par not in ja_criados:
+            ja_criados.add(par)
+            resultados.append(("criado", id_presenca))
+        else:
+            resultados.append(("duplicado", None))
+    return resultados
+
+
+class BufferCheckin:
+    """
+    Junta check-ins concorrentes em um único INSERT + commit (group commit).
+
+    Cada chamada de `enviar` espera até o lote em que entrou estar gravado
+    (após o commit) e recebe o próprio (status, id_presenca).
+    """
+
+    def __init__(self, janela_ms: float = CHECKIN_BUFFER_JANELA_MS, tamanho_maximo: int = CHECKIN_BUFFER_MAX):
+        self._janela = janela_ms / 1000
+        self._tamanho_maximo = tamanho_maximo
+        self._fila: list[tuple[tuple[int, int, datetime], asyncio.Future, float]] = []
+        self._temporizador: asyncio.Task | None = None
+        # Referência às tarefas em andamento: o event loop só guarda referências
+        # fracas, e uma tarefa sem outra referência pode ser coletada no meio
+        self._tarefas: set[asyncio.Task] = set()
+        self._lotes = 0
+        self._checkins = 0
+        self._maior_lote = 0
+        self._espera_total = 0.0
+        self._espera_maxima = 0.0
+
+    async def enviar(self, id_usuario: int, id_palestra: int, horario_checkin: datetime) -> tuple[str, int | None]:
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        self._fila.append(((id_usuario, id_palestra, horario_checkin), futuro, time.perf_counter()))
+        if len(self._fila) >= self._tamanho_maximo:
+            self._iniciar(loop, self._gravar())
+        elif self._temporizador is None:
+            self._temporizador = self._iniciar(loop, self._aguardar_janela())
+        return await futuro
+
+    def _iniciar(self, loop: asyncio.AbstractEventLoop, corrotina) -> asyncio.Task:
+        tarefa = loop.create_task(corrotina)
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+        return tarefa
+
+    async def _aguardar_janela(self):
+        await asyncio.sleep(self._janela)
+        self._temporizador = None
+        await self._gravar()
+
+    async def _gravar(self):
+        lote, self._fila = self._fila, []
+        if not lote:
+            return
+        try:
+            resultados = await executar(inserir_presencas, [r for r, _, _ in lote], leitura=False)
+        except Exception as e:
+            for _, futuro, _ in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+
+        agora = time.perf_counter()
+        self._lotes += 1
+        self._checkins += len(lote)
+        self._maior_lote = max(self._maior_lote, len(lote))
+        for (_, futuro, enfileirado_em), resultado in zip(lote, resultados):
+            espera = agora - enfileirado_em
+            self._espera_total += espera
+            self._espera_maxima = max(self._espera_maxima, espera)
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+    async def encerrar(self) -> None:
+        """
+        Grava o lote que ainda está na fila e espera os que estão sendo
+        gravados (chamado no shutdown da API, antes de descartar as engines).
+        """
+        # Temporizador ainda definido = ainda dormindo, sem gravação iniciada
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        await self._gravar()
+        if self._tarefas:
+            await asyncio.gather(*self._tarefas, return_exceptions=True)
+
+    def metricas(self) -> dict:
+        """Tamanho dos lotes e tempo de espera na fila (até o commit)."""
+        return {
+            "ativo": CHECKIN_BUFFER,
+            "lotes_gravados": self._lotes,
+            "checkins_gravados": self._checkins,
+            "media_por_lote": round(self._checkins / self._lotes, 2) if self._lotes else 0,
+            "maior_lote": self._maior_lote,
+            "espera_media_ms": round(self._espera_total / self._checkins * 1000, 2) if self._checkins else 0,
+            "espera_maxima_ms": round(self._espera_maxima * 1000, 2),
+            "na_fila": len(self._fila),
+        }
+
+
+buffer_checkin = BufferCheckin()
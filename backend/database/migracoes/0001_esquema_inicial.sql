@@ -1,6 +1,8 @@
 -- =============================================
 -- Banco de dados: Semana da Computação DECSI
--- Com separação Admin / Usuário
+-- Migração 0001: esquema inicial
+-- (IF NOT EXISTS: também serve de ponto de partida
+--  para bancos criados antes das migrações)
 -- =============================================
 
 -- Tabela de Usuários (admin e user)
@@ -56,6 +58,18 @@ CREATE TABLE IF NOT EXISTS presenca (
         ON UPDATE NO ACTION
 );
 
+-- Um check-in por usuário e palestra (usado pelo INSERT ... ON CONFLICT).
+-- Bancos anteriores às migrações não tinham essa regra e podem ter check-ins
+-- repetidos (leituras simultâneas do QR code): fica o primeiro de cada par.
+DELETE FROM presenca a
+    USING presenca b
+    WHERE a.id_usuario = b.id_usuario
+      AND a.id_palestra = b.id_palestra
+      AND a.id_presenca > b.id_presenca;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_presenca_usuario_palestra
+    ON presenca (id_usuario, id_palestra);
+
 -- Tabela de Avaliações
 CREATE TABLE IF NOT EXISTS avaliacao (
     id_avaliacao SERIAL PRIMARY KEY,
@@ -74,7 +88,7 @@ CREATE TABLE IF NOT EXISTS avaliacao (
     UNIQUE (id_usuario, id_palestra)
 );
 
--- Tabela de Notificações
+-- Tabela de Notificações (id_usuario NULL = enviada para todos)
 CREATE TABLE IF NOT EXISTS notificacao (
     id_notificacao SERIAL PRIMARY KEY,
     id_usuario INT,
@@ -87,8 +101,17 @@ CREATE TABLE IF NOT EXISTS notificacao (
         ON DELETE CASCADE
 );
 
--- Inserir admin padrão (senha: admin123 → SHA-256)
-INSERT INTO usuario (nome, email, senha_hash, role)
-VALUES ('Administrador', 'admin@decsi.ufop.br',
-        '240be518fabd2724ddb6f04eeb1da5967448d7e831c08c8fa822809f74c720a9', 'admin')
-ON CONFLICT (email) DO NOTHING;
+-- Leituras de notificações enviadas para todos (id_usuario nulo)
+CREATE TABLE IF NOT EXISTS notificacao_leitura (
+    id_notificacao INT NOT NULL,
+    id_usuario INT NOT NULL,
+    PRIMARY KEY (id_notificacao, id_usuario),
+    CONSTRAINT fk_notificacao_leitura
+        FOREIGN KEY (id_notificacao)
+        REFERENCES notificacao (id_notificacao)
+        ON DELETE CASCADE,
+    CONSTRAINT fk_usuario_leitura
+        FOREIGN KEY (id_usuario)
+        REFERENCES usuario (id_usuario)
+        ON DELETE CASCADE
+);
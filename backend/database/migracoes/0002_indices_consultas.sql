@@ -0,0 +1,26 @@
+-- sem-transacao
+-- =============================================
+-- Migração 0002: índices das consultas mais frequentes
+-- Criados com CONCURRENTLY para não bloquear escritas em bancos já em uso
+-- (por isso esta migração roda fora de transação). Cada índice é removido
+-- antes de ser criado: uma execução anterior interrompida pode ter deixado
+-- um índice inválido para trás.
+--
+-- presenca (id_usuario, id_palestra) já é coberto por
+-- uq_presenca_usuario_palestra, criado na migração 0001.
+-- =============================================
+
+-- Avaliações por palestra (média/total e comentários de uma palestra)
+DROP INDEX CONCURRENTLY IF EXISTS ix_avaliacao_palestra;
+CREATE INDEX CONCURRENTLY ix_avaliacao_palestra
+    ON avaliacao (id_palestra);
+
+-- Notificações do usuário (e as enviadas para todos: id_usuario IS NULL)
+DROP INDEX CONCURRENTLY IF EXISTS ix_notificacao_usuario_lida;
+CREATE INDEX CONCURRENTLY ix_notificacao_usuario_lida
+    ON notificacao (id_usuario, lida);
+
+-- Palestras de um palestrante (junção do cronograma e remoção de palestrante)
+DROP INDEX CONCURRENTLY IF EXISTS ix_palestra_palestrante;
+CREATE INDEX CONCURRENTLY ix_palestra_palestrante
+    ON palestra (id_palestrante);
@@ -0,0 +1,73 @@
+-- =============================================
+-- Migração 0003: datas e horários tipados
+-- palestra.data           TEXT        -> DATE
+-- palestra.horario_*      VARCHAR(10) -> TIME
+-- palestra.duracao_minutos (nova, calculada e armazenada)
+-- presenca.horario_checkin FLOAT (epoch) -> TIMESTAMPTZ
+-- =============================================
+
+-- Datas vinham do app como DD/MM/AAAA (ou AAAA-MM-DD pela API);
+-- valores que não são datas válidas viram NULL. Nenhum valor pode fazer o
+-- ALTER falhar (ex.: 31/02/2026 passa no formato mas não é uma data), então
+-- primeiro tudo vira AAAA-MM-DD ou NULL, depois o dia é conferido com o mês.
+UPDATE palestra SET data = CASE
+    WHEN data ~ '^\s*\d{4}-\d{2}-\d{2}\s*$' THEN btrim(data)
+    WHEN data ~ '^\s*\d{2}/\d{2}/\d{4}\s*$'
+        THEN substr(btrim(data), 7, 4) || '-' || substr(btrim(data), 4, 2) || '-' || substr(btrim(data), 1, 2)
+END;
+
+UPDATE palestra SET data = NULL
+WHERE data IS NOT NULL AND NOT (
+    -- CASE aninhado: make_date só roda com ano e mês válidos
+    CASE
+        WHEN substr(data, 1, 4)::int >= 1 AND substr(data, 6, 2)::int BETWEEN 1 AND 12 THEN
+            substr(data, 9, 2)::int BETWEEN 1 AND EXTRACT(DAY FROM
+                make_date(substr(data, 1, 4)::int, substr(data, 6, 2)::int, 1)
+                + INTERVAL '1 month' - INTERVAL '1 day'
+            )::int
+        ELSE FALSE
+    END
+);
+
+ALTER TABLE palestra
+    ALTER COLUMN data TYPE DATE USING data::date;
+
+-- Horários inválidos contavam 0 horas no certificado: assumem o valor do
+-- outro horário da palestra (duração zero) ou 00:00 se ambos forem inválidos.
+-- O padrão só aceita horas 0-23 e minutos/segundos 0-59 (25:00 e 9:75 não),
+-- então o ::time nunca falha.
+ALTER TABLE palestra
+    ALTER COLUMN horario_inicio TYPE TIME USING (
+        CASE
+            WHEN horario_inicio ~ '^([01]?\d|2[0-3]):[0-5]\d(:[0-5]\d)?$' THEN horario_inicio::time
+            WHEN horario_fim ~ '^([01]?\d|2[0-3]):[0-5]\d(:[0-5]\d)?$' THEN horario_fim::time
+            ELSE '00:00'
+        END
+    ),
+    ALTER COLUMN horario_fim TYPE TIME USING (
+        CASE
+            WHEN horario_fim ~ '^([01]?\d|2[0-3]):[0-5]\d(:[0-5]\d)?$' THEN horario_fim::time
+            WHEN horario_inicio ~ '^([01]?\d|2[0-3]):[0-5]\d(:[0-5]\d)?$' THEN horario_inicio::time
+            ELSE '00:00'
+        END
+    );
+
+-- Duração em minutos (palestra que termina depois da meia-noite conta o dia seguinte)
+ALTER TABLE palestra
+    ADD COLUMN duracao_minutos INT GENERATED ALWAYS AS (
+        (EXTRACT(EPOCH FROM (
+            CASE
+                WHEN horario_fim >= horario_inicio THEN horario_fim - horario_inicio
+                ELSE horario_fim - horario_inicio + INTERVAL '24 hours'
+            END
+        )) / 60)::int
+    ) STORED;
+
+-- Cronograma ordenado e filtrado por data/horário.
+-- Sem CONCURRENTLY: o ALTER TYPE acima já reescreve a tabela com lock exclusivo.
+CREATE INDEX IF NOT EXISTS ix_palestra_data_inicio
+    ON palestra (data, horario_inicio);
+
+ALTER TABLE presenca
+    ALTER COLUMN horario_checkin TYPE TIMESTAMPTZ USING to_timestamp(horario_checkin),
+    ALTER COLUMN horario_checkin SET DEFAULT now();
@@ -0,0 +1,9 @@
+-- sem-transacao
+-- =============================================
+-- Migração 0004: filtro do cronograma por local
+-- (mesma ordem do cronograma depois do local: data, horário de início)
+-- =============================================
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_palestra_local;
+CREATE INDEX CONCURRENTLY ix_palestra_local
+    ON palestra (local, data, horario_inicio);
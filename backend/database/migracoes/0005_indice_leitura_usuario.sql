@@ -0,0 +1,10 @@
+-- sem-transacao
+-- =============================================
+-- Migração 0005: leituras por usuário
+-- A chave primária começa por id_notificacao; a contagem de não lidas
+-- procura as leituras de um usuário.
+-- =============================================
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_notificacao_leitura_usuario;
+CREATE INDEX CONCURRENTLY ix_notificacao_leitura_usuario
+    ON notificacao_leitura (id_usuario);
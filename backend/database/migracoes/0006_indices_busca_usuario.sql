@@ -0,0 +1,13 @@
+-- sem-transacao
+-- =============================================
+-- Migração 0006: busca de usuários por prefixo
+-- Seletor de participantes das telas de admin (/admin/usuarios?busca=):
+-- lower(nome) / lower(email) LIKE 'termo%'.
+-- =============================================
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_usuario_nome_busca;
+CREATE INDEX CONCURRENTLY ix_usuario_nome_busca
+    ON usuario (lower(nome) text_pattern_ops);
+DROP INDEX CONCURRENTLY IF EXISTS ix_usuario_email_busca;
+CREATE INDEX CONCURRENTLY ix_usuario_email_busca
+    ON usuario (lower(email) text_pattern_ops);
@@ -0,0 +1,13 @@
+-- =============================================
+-- Migração 0007: destinatários das notificações para todos
+-- Uma notificação para todos (id_usuario nulo) vale, como no antigo envio
+-- de uma linha por usuário, só para os participantes (role 'user') que já
+-- existiam quando ela foi enviada: os de id_usuario <= ate_id_usuario.
+-- =============================================
+
+ALTER TABLE notificacao ADD COLUMN IF NOT EXISTS ate_id_usuario INT;
+
+-- As já enviadas valem para quem existe hoje (a data do envio não foi guardada)
+UPDATE notificacao
+   SET ate_id_usuario = COALESCE((SELECT max(id_usuario) FROM usuario), 0)
+ WHERE id_usuario IS NULL AND ate_id_usuario IS NULL;
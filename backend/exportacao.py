@@ -0,0 +1,94 @@
+"""
+Exportação de tabelas para a organização do evento (CSV ou NDJSON).
+
+As linhas são lidas com cursor no servidor e enviadas em lotes, então a
+exportação usa memória constante, qualquer que seja o tamanho da tabela.
+"""
+import csv
+import io
+import json
+from sqlmodel import select
+from dados_banco import Avaliacao, Palestra, Presenca, Usuario, transmitir
+
+# Linhas buscadas do banco (e enviadas ao cliente) por vez
+TAMANHO_LOTE_EXPORTACAO = 1000
+
+# Para cada tabela: (colunas do arquivo, chave de ordenação, junções)
+EXPORTACOES = {
+    "usuarios": (
+        {
+            "id_usuario": Usuario.id_usuario,
+            "nome": Usuario.nome,
+            "email": Usuario.email,
+            "cpf": Usuario.cpf,
+            "matricula": Usuario.matricula,
+            "role": Usuario.role,
+        },
+        Usuario.id_usuario,
+        [],
+    ),
+    "presencas": (
+        {
+            "id_presenca": Presenca.id_presenca,
+            "id_usuario": Presenca.id_usuario,
+            "nome_usuario": Usuario.nome,
+            "matricula": Usuario.matricula,
+            "id_palestra": Presenca.id_palestra,
+            "titulo_palestra": Palestra.titulo,
+            "data": Palestra.data,
+            "horario_inicio": Palestra.horario_inicio,
+            "horario_fim": Palestra.horario_fim,
+            "duracao_minutos": Palestra.duracao_minutos,
+            "horario_checkin": Presenca.horario_checkin,
+        },
+        Presenca.id_presenca,
+        [
+            (Usuario, Presenca.id_usuario == Usuario.id_usuario),
+            (Palestra, Presenca.id_palestra == Palestra.id_palestra),
+        ],
+    ),
+    "avaliacoes": (
+        {
+            "id_avaliacao": Avaliacao.id_avaliacao,
+            "id_usuario": Avaliacao.id_usuario,
+            "id_palestra": Avaliacao.id_palestra,
+            "titulo_palestra": Palestra.titulo,
+            "nota": Avaliacao.nota,
+            "comentario": Avaliacao.comentario,
+        },
+        Avaliacao.id_avaliacao,
+        [(Palestra, Avaliacao.id_palestra == Palestra.id_palestra)],
+    ),
+}
+
+
+def _consulta(tabela: str):
+    colunas, chave, juncoes = EXPORTACOES[tabela]
+    consulta = select(*colunas.values())
+    for modelo, condicao in juncoes:
+        consulta = consulta.join(modelo, condicao, isouter=True)
+    return list(colunas), consulta.order_by(chave)
+
+
+async def exportar_csv(tabela: str):
+    """Gera o CSV da tabela em pedaços (cabeçalho primeiro, depois um pedaço por lote)."""
+    nomes, consulta = _consulta(tabela)
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(nomes)
+    yield buffer.getvalue()
+    async for lote in transmitir(consulta, TAMANHO_LOTE_EXPORTACAO):
+        buffer.seek(0)
+        buffer.truncate()
+        escritor.writerows(lote)
+        yield buffer.getvalue()
+
+
+async def exportar_ndjson(tabela: str):
+    """Gera o NDJSON da tabela, um objeto por linha."""
+    nomes, consulta = _consulta(tabela)
+    async for lote in transmitir(consulta, TAMANHO_LOTE_EXPORTACAO):
+        yield "".join(
+            json.dumps(dict(zip(nomes, linha)), ensure_ascii=False, default=str) + "\n"
+            for linha in lote
+        )
@@ -0,0 +1,49 @@
+"""
+Formatos de data e horário trocados com o app (DD/MM/AAAA e HH:MM).
+
+No banco as colunas são DATE/TIME; a conversão para texto acontece só na
+borda da API.
+"""
+import os
+from datetime import date, datetime, time
+from pathlib import Path
+from zoneinfo import ZoneInfo
+from dotenv import load_dotenv
+
+_env_path = Path(__file__).resolve().parent / ".env"
+load_dotenv(_env_path)
+
+FORMATO_DATA = "%d/%m/%Y"
+FORMATO_HORARIO = "%H:%M"
+
+# Fuso em que as datas/horários das palestras são cadastrados
+FUSO_EVENTO = ZoneInfo(os.getenv("FUSO_EVENTO", "America/Sao_Paulo"))
+
+
+def agora_no_evento() -> datetime:
+    """Data e hora atuais no fuso do evento (sem tzinfo, como no banco)."""
+    return datetime.now(FUSO_EVENTO).replace(tzinfo=None)
+
+
+def no_fuso_do_evento(valor: datetime) -> datetime:
+    """Horário sem fuso (ex.: DateTime.toIso8601String() do Dart) é do fuso do evento."""
+    return valor.replace(tzinfo=FUSO_EVENTO) if valor.tzinfo is None else valor
+
+
+def ler_data(valor):
+    """Aceita date, "DD/MM/AAAA" (formato do app) ou "AAAA-MM-DD"."""
+    if not isinstance(valor, str):
+        return valor
+    valor = valor.strip()
+    try:
+        return datetime.strptime(valor, FORMATO_DATA).date()
+    except ValueError:
+        return date.fromisoformat(valor)
+
+
+def formatar_data(valor: date | None) -> str | None:
+    return valor.strftime(FORMATO_DATA) if valor else None
+
+
+def formatar_horario(valor: time | None) -> str | None:
+    return valor.strftime(FORMATO_HORARIO) if valor else None
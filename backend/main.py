@@ -1,13 +1,76 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from dados_banco import cria_conexao_postgre, cria_tabela, Usuario
-from auth_utils import hash_senha
+from fastapi.middleware.gzip import GZipMiddleware
+from cache_utils import COMPRESSAO_MIN_BYTES, COMPRESSAO_NIVEL, EtagMiddleware
+from checkins import buffer_checkin
+from metricas import METRICAS_TOKEN, MetricasMiddleware, gerar_metricas
+from dados_banco import (
+    cria_conexao_postgre, encerrar_engines, iniciar_engines, LeituraReplicaMiddleware, Usuario,
+)
+from auth_utils import encerrar_pool_hash, hash_senha, verificar_segredo
+from certificado_pdf import encerrar_pool
+from migracoes import aplicar_migracoes, lock_inicializacao
+from notificacoes import canal_notificacoes
 from sqlmodel import Session, select
 from rotas.auth import router as auth_router
 from rotas.admin import router as admin_router
 from rotas.usuario import router as usuario_router
 
-app = FastAPI(title="API Semana da Computação DECSI")
+
+def preparar_banco():
+    """
+    Migrações e admin padrão. Com vários workers subindo juntos, o lock faz
+    um deles preparar o banco enquanto os outros esperam e só conferem.
+    """
+    engine = cria_conexao_postgre()
+    with lock_inicializacao(engine):
+        aplicar_migracoes(engine)
+        # Criar admin padrão se não existir
+        with Session(engine) as session:
+            admin = session.exec(
+                select(Usuario).where(Usuario.email == "admin@decsi.ufop.br")
+            ).first()
+            if not admin:
+                admin = Usuario(
+                    nome="Administrador",
+                    email="admin@decsi.ufop.br",
+                    senha_hash=hash_senha("admin123"),
+                    role="admin",
+                )
+                session.add(admin)
+                session.commit()
+                print(">>> Admin padrão criado: admin@decsi.ufop.br / admin123")
+
+
+@asynccontextmanager
+async def ciclo_de_vida(app: FastAPI):
+    """
+    Roda em cada worker: cria as engines do próprio processo (nada de pool
+    herdado do processo pai), prepara o banco, abre o LISTEN das
+    notificações e, ao sair, fecha tudo.
+    """
+    verificar_segredo()
+    iniciar_engines()
+    await run_in_threadpool(preparar_banco)
+    await canal_notificacoes.iniciar()
+    yield
+    await buffer_checkin.encerrar()
+    encerrar_pool()
+    encerrar_pool_hash()
+    await canal_notificacoes.encerrar()
+    await encerrar_engines()
+
+
+# Respostas JSON geradas pelo orjson; as rotas declaram response_model
+# para o retorno ser convertido pelo pydantic-core (sem jsonable_encoder)
+app = FastAPI(
+    title="API Semana da Computação DECSI",
+    default_response_class=ORJSONResponse,
+    lifespan=ciclo_de_vida,
+)
 
 # Permitir requisições do Flutter (CORS)
 app.add_middleware(
@@ -18,26 +81,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# GET condicional das rotas com Depends(usar_etag) (ETag / 304)
+app.add_middleware(EtagMiddleware)
 
-@app.on_event("startup")
-def primeira_conexao():
-    cria_tabela()
-    # Criar admin padrão se não existir
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        admin = session.exec(
-            select(Usuario).where(Usuario.email == "admin@decsi.ufop.br")
-        ).first()
-        if not admin:
-            admin = Usuario(
-                nome="Administrador",
-                email="admin@decsi.ufop.br",
-                senha_hash=hash_senha("admin123"),
-                role="admin",
-            )
-            session.add(admin)
-            session.commit()
-            print(">>> Admin padrão criado: admin@decsi.ufop.br / admin123")
+# Compressão das respostas grandes (SSE não é comprimido)
+app.add_middleware(
+    GZipMiddleware, minimum_size=COMPRESSAO_MIN_BYTES, compresslevel=COMPRESSAO_NIVEL
+)
+
+# Latência, status e consultas SQL por rota (/metrics e Server-Timing)
+app.add_middleware(MetricasMiddleware)
+
+# Requisições GET leem da réplica (se houver DB_REPLICA_URL)
+app.add_middleware(LeituraReplicaMiddleware)
 
 
 # ---- Rotas ----
@@ -57,5 +113,19 @@ def read_root():
     return {"status": "API Semana da Computação DECSI rodando!"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metricas(authorization: str | None = Header(default=None)):
+    """Métricas no formato do Prometheus (deste processo)."""
+    if METRICAS_TOKEN and authorization != f"Bearer {METRICAS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Token de métricas inválido")
+    checkin = buffer_checkin.metricas()
+    extras = {
+        "api_sse_conectados": ("Clientes conectados ao stream de notificações", canal_notificacoes.conectados()),
+        "api_checkin_na_fila": ("Check-ins aguardando o próximo lote", checkin["na_fila"]),
+        "api_checkin_lotes_gravados": ("Lotes gravados pelo buffer de check-in", checkin["lotes_gravados"]),
+    }
+    return PlainTextResponse(gerar_metricas(extras), media_type="text/plain; version=0.0.4")
+
+
 """uvicorn main:app --reload --app-dir backend comando de execução"""
 
@@ -0,0 +1,211 @@
+"""
+Métricas das requisições: latência e status por rota, quantidade e tempo das
+consultas SQL de cada requisição.
+
+- Eventos do SQLAlchemy (em todas as engines) somam as consultas na
+  requisição corrente, guardada em um ContextVar.
+- MetricasMiddleware mede a requisição, envia o cabeçalho Server-Timing
+  (db e app) e avisa no log quando uma rota passa do ORCAMENTO_CONSULTAS,
+  sinal típico de N+1.
+- gerar_metricas() produz o texto no formato do Prometheus para /metrics.
+
+Os contadores são do processo: com vários workers, cada um tem os seus.
+"""
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_env_path = Path(__file__).resolve().parent / ".env"
+load_dotenv(_env_path)
+
+# Consultas por requisição acima das quais a rota é registrada no log
+ORCAMENTO_CONSULTAS = int(os.getenv("ORCAMENTO_CONSULTAS", "10"))
+# Se definido, /metrics exige "Authorization: Bearer <METRICAS_TOKEN>"
+METRICAS_TOKEN = os.getenv("METRICAS_TOKEN") or None
+
+# Limites (s) dos buckets do histograma de latência
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConsultasRequisicao:
+    quantidade: int = 0
+    segundos: float = 0.0
+
+
+consultas_requisicao: ContextVar[ConsultasRequisicao | None] = ContextVar(
+    "consultas_requisicao", default=None
+)
+
+
+# ===================== CONSULTAS SQL =====================
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_da_consulta(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._inicio_metricas = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _depois_da_consulta(conn, cursor, statement, parameters, context, executemany):
+    consultas = consultas_requisicao.get()
+    if consultas is None:
+        return
+    consultas.quantidade += 1
+    inicio = getattr(context, "_inicio_metricas", None)
+    if inicio is not None:
+        consultas.segundos += time.perf_counter() - inicio
+
+
+# ===================== REGISTRO =====================
+
+class RegistroMetricas:
+    """Contadores e histogramas por (método, rota)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requisicoes: dict[tuple[str, str, int], int] = defaultdict(int)
+        self.buckets: dict[tuple[str, str], list[int]] = defaultdict(lambda: [0] * len(BUCKETS_LATENCIA))
+        self.contagem: dict[tuple[str, str], int] = defaultdict(int)
+        self.duracao: dict[tuple[str, str], float] = defaultdict(float)
+        self.consultas: dict[tuple[str, str], int] = defaultdict(int)
+        self.duracao_consultas: dict[tuple[str, str], float] = defaultdict(float)
+        self.excedeu_orcamento: dict[tuple[str, str], int] = defaultdict(int)
+
+    def registrar(self, metodo: str, rota: str, status: int, segundos: float,
+                  consultas: ConsultasRequisicao) -> None:
+        chave = (metodo, rota)
+        with self._lock:
+            self.requisicoes[(metodo, rota, status)] += 1
+            buckets = self.buckets[chave]
+            for i, limite in enumerate(BUCKETS_LATENCIA):
+                if segundos <= limite:
+                    buckets[i] += 1
+            self.contagem[chave] += 1
+            self.duracao[chave] += segundos
+            self.consultas[chave] += consultas.quantidade
+            self.duracao_consultas[chave] += consultas.segundos
+            if consultas.quantidade > ORCAMENTO_CONSULTAS:
+                self.excedeu_orcamento[chave] += 1
+
+
+registro_metricas = RegistroMetricas()
+
+
+def _rotulos(**rotulos) -> str:
+    def escapar(valor) -> str:
+        return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escapar(v)}"' for k, v in rotulos.items()) + "}"
+
+
+def gerar_metricas(extras: dict[str, tuple[str, float]] | None = None) -> str:
+    """
+    Texto no formato de exposição do Prometheus. `extras` são gauges
+    avulsos: {nome: (descrição, valor)}.
+    """
+    r = registro_metricas
+    linhas = []
+
+    def cabecalho(nome: str, tipo: str, descricao: str):
+        linhas.append(f"# HELP {nome} {descricao}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+
+    with r._lock:
+        cabecalho("api_requisicoes_total", "counter", "Requisições atendidas por rota e status")
+        for (metodo, rota, status), total in sorted(r.requisicoes.items()):
+            linhas.append(f"api_requisicoes_total{_rotulos(metodo=metodo, rota=rota, status=status)} {total}")
+
+        cabecalho("api_requisicao_duracao_segundos", "histogram", "Tempo até o início da resposta")
+        for (metodo, rota), buckets in sorted(r.buckets.items()):
+            total = r.contagem[(metodo, rota)]
+            for limite, n in [*zip(BUCKETS_LATENCIA, buckets), ("+Inf", total)]:
+                rotulos = _rotulos(metodo=metodo, rota=rota, le=limite)
+                linhas.append(f"api_requisicao_duracao_segundos_bucket{rotulos} {n}")
+            base = _rotulos(metodo=metodo, rota=rota)
+            linhas.append(f"api_requisicao_duracao_segundos_sum{base} {r.duracao[(metodo, rota)]:.6f}")
+            linhas.append(f"api_requisicao_duracao_segundos_count{base} {total}")
+
+        cabecalho("api_consultas_sql_total", "counter", "Consultas SQL feitas pelas requisições da rota")
+        for (metodo, rota), total in sorted(r.consultas.items()):
+            linhas.append(f"api_consultas_sql_total{_rotulos(metodo=metodo, rota=rota)} {total}")
+
+        cabecalho("api_consultas_sql_segundos_total", "counter", "Tempo gasto nas consultas SQL da rota")
+        for (metodo, rota), total in sorted(r.duracao_consultas.items()):
+            linhas.append(f"api_consultas_sql_segundos_total{_rotulos(metodo=metodo, rota=rota)} {total:.6f}")
+
+        cabecalho(
+            "api_orcamento_consultas_excedido_total", "counter",
+            f"Requisições com mais de {ORCAMENTO_CONSULTAS} consultas SQL",
+        )
+        for (metodo, rota), total in sorted(r.excedeu_orcamento.items()):
+            linhas.append(f"api_orcamento_consultas_excedido_total{_rotulos(metodo=metodo, rota=rota)} {total}")
+
+    for nome, (descricao, valor) in (extras or {}).items():
+        cabecalho(nome, "gauge", descricao)
+        linhas.append(f"{nome} {valor}")
+    return "\n".join(linhas) + "\n"
+
+
+# ===================== MIDDLEWARE =====================
+
+class MetricasMiddleware:
+    """
+    Mede cada requisição HTTP: tempo até o início da resposta, status e
+    consultas SQL. Envia o cabeçalho Server-Timing e registra no log as
+    requisições que passam do orçamento de consultas.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        consultas = ConsultasRequisicao()
+        token = consultas_requisicao.set(consultas)
+        inicio = time.perf_counter()
+        status = 500
+        duracao = None
+
+        async def enviar(mensagem: Message) -> None:
+            nonlocal status, duracao
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+                duracao = time.perf_counter() - inicio
+                MutableHeaders(scope=mensagem).append(
+                    "Server-Timing",
+                    f'db;dur={consultas.segundos * 1000:.1f};desc="{consultas.quantidade} consultas", '
+                    f"app;dur={duracao * 1000:.1f}",
+                )
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            consultas_requisicao.reset(token)
+            rota = scope.get("route")
+            # Caminhos sem rota (404) ficam juntos para não criar uma série por URL
+            nome_rota = getattr(rota, "path", "sem_rota")
+            if duracao is None:
+                duracao = time.perf_counter() - inicio
+            registro_metricas.registrar(scope["method"], nome_rota, status, duracao, consultas)
+            if consultas.quantidade > ORCAMENTO_CONSULTAS:
+                logger.warning(
+                    "%s %s fez %d consultas SQL (orçamento: %d, %.1f ms no banco)",
+                    scope["method"], nome_rota, consultas.quantidade, ORCAMENTO_CONSULTAS,
+                    consultas.segundos * 1000,
+                )
@@ -0,0 +1,110 @@
+"""
+Migrações versionadas do esquema do banco.
+
+Os arquivos em database/migracoes/ (NNNN_descricao.sql) são a única fonte
+do esquema: cada um é aplicado uma vez, em ordem, e registrado na tabela
+schema_migracao. Arquivos que começam com "-- sem-transacao" rodam fora de
+transação (necessário para CREATE INDEX CONCURRENTLY); os demais rodam
+dentro de uma transação junto com o próprio registro.
+
+Uso manual: python migracoes.py
+"""
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from sqlalchemy import text
+from dados_banco import cria_conexao_postgre
+
+DIRETORIO_MIGRACOES = Path(__file__).resolve().parent / "database" / "migracoes"
+MARCADOR_SEM_TRANSACAO = "-- sem-transacao"
+
+# Chave do pg_advisory_lock: impede que dois processos migrem ao mesmo tempo
+CHAVE_LOCK_MIGRACOES = 7_202_601
+# Chave da preparação completa do banco na subida da API (migrações + carga inicial)
+CHAVE_LOCK_INICIALIZACAO = 7_202_602
+INTERVALO_LOCK_SEGUNDOS = 0.2
+
+
+def listar_migracoes() -> list[tuple[int, str, Path]]:
+    """(versão, nome, caminho) de cada arquivo de migração, em ordem."""
+    migracoes = []
+    for caminho in sorted(DIRETORIO_MIGRACOES.glob("*.sql")):
+        versao, _, nome = caminho.stem.partition("_")
+        migracoes.append((int(versao), nome, caminho))
+    return migracoes
+
+
+def _comandos(sql: str) -> list[str]:
+    """Separa o arquivo em comandos (sem os comentários de linha)."""
+    linhas = [l for l in sql.splitlines() if not l.lstrip().startswith("--")]
+    return [c.strip() for c in "\n".join(linhas).split(";") if c.strip()]
+
+
+def _aguardar_lock(conexao, chave: int) -> None:
+    """
+    Espera o advisory lock por tentativas (pg_try_advisory_lock), e não com
+    um pg_advisory_lock bloqueado: um comando parado esperando o lock mantém
+    um snapshot aberto, e o CREATE INDEX CONCURRENTLY das migrações que outro
+    processo está aplicando esperaria por ele para sempre.
+    """
+    tentar = text("SELECT pg_try_advisory_lock(:chave)")
+    while not conexao.execute(tentar, {"chave": chave}).scalar():
+        time.sleep(INTERVALO_LOCK_SEGUNDOS)
+
+
+@contextmanager
+def lock_inicializacao(engine=None):
+    """
+    Segura o advisory lock da inicialização enquanto o bloco roda: entre
+    vários processos subindo juntos, um prepara o banco e os outros esperam.
+    """
+    engine = engine or cria_conexao_postgre()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexao:
+        _aguardar_lock(conexao, CHAVE_LOCK_INICIALIZACAO)
+        try:
+            yield
+        finally:
+            conexao.execute(text("SELECT pg_advisory_unlock(:chave)"), {"chave": CHAVE_LOCK_INICIALIZACAO})
+
+
+def aplicar_migracoes(engine=None) -> list[int]:
+    """Aplica as migrações pendentes e retorna as versões aplicadas."""
+    engine = engine or cria_conexao_postgre()
+    aplicadas = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexao:
+        _aguardar_lock(conexao, CHAVE_LOCK_MIGRACOES)
+        try:
+            conexao.execute(text(
+                "CREATE TABLE IF NOT EXISTS schema_migracao ("
+                " versao INT PRIMARY KEY,"
+                " nome TEXT NOT NULL,"
+                " aplicada_em TIMESTAMPTZ NOT NULL DEFAULT now())"
+            ))
+            feitas = set(conexao.execute(text("SELECT versao FROM schema_migracao")).scalars())
+
+            for versao, nome, caminho in listar_migracoes():
+                if versao in feitas:
+                    continue
+                sql = caminho.read_text(encoding="utf-8")
+                registro = (
+                    text("INSERT INTO schema_migracao (versao, nome) VALUES (:versao, :nome)"),
+                    {"versao": versao, "nome": nome},
+                )
+                if sql.startswith(MARCADOR_SEM_TRANSACAO):
+                    for comando in _comandos(sql):
+                        conexao.exec_driver_sql(comando)
+                    conexao.execute(*registro)
+                else:
+                    with engine.begin() as transacao:
+                        for comando in _comandos(sql):
+                            transacao.exec_driver_sql(comando)
+                        transacao.execute(*registro)
+                aplicadas.append(versao)
+                print(f">>> Migração {versao:04d} aplicada: {nome}")
+        finally:
+            conexao.execute(text("SELECT pg_advisory_unlock(:chave)"), {"chave": CHAVE_LOCK_MIGRACOES})
+    return aplicadas
+
+
+if __name__ == "__main__":
+    aplicar_migracoes()
@@ -0,0 +1,247 @@
+"""
+Contagem de notificações não lidas e envio em tempo real (Server-Sent Events).
+
+- para_todos: notificação em uma única linha (id_usuario nulo) que vale
+  para os participantes cadastrados até o envio, como o antigo envio de uma
+  linha por usuário com role "user" (admins e quem se cadastra depois não
+  a recebem).
+- contar_nao_lidas: total de não lidas de um usuário em uma única consulta.
+- marcar_lidas: marca várias (ou todas) como lidas em um único comando.
+- publicar: avisa, dentro da transação que grava a notificação, que ela
+  existe (pg_notify). O PostgreSQL só entrega o aviso depois do commit.
+- CanalNotificacoes: em cada processo da API, uma conexão asyncpg faz
+  LISTEN no canal e repassa os avisos para os clientes conectados ao SSE.
+  Como o aviso passa pelo banco, funciona com vários workers/réplicas da API.
+  O LISTEN é aberto na inicialização do worker, antes de ele aceitar
+  conexões; se a conexão cair, os clientes recebem a contagem de novo
+  depois da reconexão (avisos do intervalo não são perdidos no contador).
+"""
+import asyncio
+import json
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+from sqlalchemy import and_, false, literal, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, func, select
+from dados_banco import Notificacao, NotificacaoLeitura, Usuario
+
+_env_path = Path(__file__).resolve().parent / ".env"
+load_dotenv(_env_path)
+
+CANAL_PG = "notificacao"
+# Intervalo (s) entre os comentários de keep-alive enviados no SSE
+SSE_KEEPALIVE_SEGUNDOS = float(os.getenv("SSE_KEEPALIVE_SEGUNDOS", "15"))
+# Avisos pendentes por cliente; um cliente lento demais perde os excedentes
+SSE_FILA_MAX = 100
+# Tempo máximo (s) para o LISTEN ficar pronto na inicialização
+LISTEN_ESPERA_SEGUNDOS = float(os.getenv("LISTEN_ESPERA_SEGUNDOS", "10"))
+# Colocado nas filas após uma reconexão do LISTEN: o SSE reenvia a contagem
+RESSINCRONIZAR = None
+# Limite do payload do NOTIFY é 8000 bytes: mensagens maiores vão sem o texto
+_PAYLOAD_MAX = 7500
+
+
+def para_todos(session: Session, titulo: str, mensagem: str) -> Notificacao:
+    """Notificação para todos os participantes já cadastrados (ainda não adicionada)."""
+    ultimo = session.exec(select(func.max(Usuario.id_usuario))).one()
+    return Notificacao(id_usuario=None, ate_id_usuario=ultimo or 0, titulo=titulo, mensagem=mensagem)
+
+
+def recebe_para_todos(id_usuario: int, papel: str):
+    """Condição SQL das notificações para todos que valem para o usuário."""
+    if papel != "user":
+        return false()
+    return and_(Notificacao.id_usuario.is_(None), Notificacao.ate_id_usuario >= id_usuario)
+
+
+def _nao_lidas(id_usuario: int, papel: str):
+    """
+    Expressão SQL: individuais não lidas + enviadas para todos ainda sem
+    leitura do usuário. As três contagens usam só índices
+    (notificacao(id_usuario, lida) e notificacao_leitura(id_usuario)).
+    """
+    individuais = (
+        select(func.count())
+        .select_from(Notificacao)
+        .where(Notificacao.id_usuario == id_usuario, Notificacao.lida.is_(False))
+        .scalar_subquery()
+    )
+    gerais = (
+        select(func.count())
+        .select_from(Notificacao)
+        .where(recebe_para_todos(id_usuario, papel))
+        .scalar_subquery()
+    )
+    lidas_para_todos = (
+        select(func.count())
+        .select_from(NotificacaoLeitura)
+        .where(NotificacaoLeitura.id_usuario == id_usuario)
+        .scalar_subquery()
+    )
+    return individuais + gerais - lidas_para_todos
+
+
+def contar_nao_lidas(session: Session, id_usuario: int, papel: str) -> int:
+    """Total de notificações não lidas do usuário, em uma única consulta."""
+    return session.exec(select(_nao_lidas(id_usuario, papel))).one()
+
+
+def marcar_lidas(
+    session: Session, id_usuario: int, papel: str, ids: list[int] | None = None
+) -> int:
+    """
+    Marca como lidas todas as notificações do usuário (ou só as de `ids`)
+    em um único comando e faz commit. Retorna quantas continuam não lidas.
+
+    Individuais: UPDATE de `lida`. Para todos: INSERT das leituras que
+    faltam. Os dois rodam como CTEs do mesmo comando; a consulta principal
+    ainda enxerga o estado anterior, por isso desconta o que foi marcado.
+    """
+    filtro_ids = [Notificacao.id_notificacao.in_(ids)] if ids is not None else []
+    atualizadas = (
+        update(Notificacao)
+        .where(Notificacao.id_usuario == id_usuario, Notificacao.lida.is_(False), *filtro_ids)
+        .values(lida=True)
+        .returning(Notificacao.id_notificacao)
+        .cte("atualizadas")
+    )
+    registradas = (
+        pg_insert(NotificacaoLeitura)
+        .from_select(
+            ["id_notificacao", "id_usuario"],
+            select(Notificacao.id_notificacao, literal(id_usuario))
+            .where(recebe_para_todos(id_usuario, papel), *filtro_ids),
+        )
+        .on_conflict_do_nothing()
+        .returning(NotificacaoLeitura.id_notificacao)
+        .cte("registradas")
+    )
+    marcadas = (
+        select(func.count()).select_from(atualizadas).scalar_subquery()
+        + select(func.count()).select_from(registradas).scalar_subquery()
+    )
+    nao_lidas = session.exec(select(_nao_lidas(id_usuario, papel) - marcadas)).one()
+    session.commit()
+    return nao_lidas
+
+
+def publicar(session: Session, notificacao: Notificacao) -> None:
+    """Agenda o aviso da notificação (entregue aos ouvintes após o commit)."""
+    session.flush()
+    aviso = {
+        "id_notificacao": notificacao.id_notificacao,
+        "id_usuario": notificacao.id_usuario,
+        "titulo": notificacao.titulo,
+        "mensagem": notificacao.mensagem,
+        "ate_id_usuario": notificacao.ate_id_usuario,
+    }
+    payload = json.dumps(aviso, ensure_ascii=False)
+    if len(payload.encode("utf-8")) > _PAYLOAD_MAX:
+        aviso["mensagem"] = None
+        payload = json.dumps(aviso, ensure_ascii=False)
+    session.exec(text("SELECT pg_notify(:canal, :payload)"), params={"canal": CANAL_PG, "payload": payload})
+
+
+def recebe_aviso(aviso: dict, id_usuario: int, papel: str) -> bool:
+    """Se o aviso de uma notificação vale para o usuário (mesma regra de recebe_para_todos)."""
+    if aviso["id_usuario"] is not None:
+        return aviso["id_usuario"] == id_usuario
+    return papel == "user" and id_usuario <= aviso["ate_id_usuario"]
+
+
+def evento_sse(evento: str, dados: dict) -> str:
+    return f"event: {evento}\ndata: {json.dumps(dados, ensure_ascii=False)}\n\n"
+
+
+class CanalNotificacoes:
+    """LISTEN no PostgreSQL e distribuição dos avisos para as filas dos clientes SSE."""
+
+    def __init__(self):
+        self._assinantes: dict[int, set[asyncio.Queue]] = {}
+        self._tarefa: asyncio.Task | None = None
+        self._pronto: asyncio.Event | None = None
+
+    async def iniciar(self) -> None:
+        """
+        Abre o LISTEN e só retorna quando ele está ativo (chamado na
+        inicialização da API): nenhuma notificação gravada depois disso
+        deixa de chegar aos clientes deste processo.
+        """
+        self._pronto = asyncio.Event()
+        self._tarefa = asyncio.get_running_loop().create_task(self._escutar())
+        try:
+            await asyncio.wait_for(self._pronto.wait(), LISTEN_ESPERA_SEGUNDOS)
+        except asyncio.TimeoutError:
+            await self.encerrar()
+            raise RuntimeError("Não foi possível escutar o canal de notificações") from None
+
+    def assinar(self, id_usuario: int) -> asyncio.Queue:
+        fila = asyncio.Queue(maxsize=SSE_FILA_MAX)
+        self._assinantes.setdefault(id_usuario, set()).add(fila)
+        return fila
+
+    def cancelar(self, id_usuario: int, fila: asyncio.Queue) -> None:
+        filas = self._assinantes.get(id_usuario)
+        if filas:
+            filas.discard(fila)
+            if not filas:
+                del self._assinantes[id_usuario]
+
+    def conectados(self) -> int:
+        return sum(len(filas) for filas in self._assinantes.values())
+
+    def _receber(self, _conexao, _pid, _canal, payload: str) -> None:
+        aviso = json.loads(payload)
+        if aviso["id_usuario"] is None:
+            self._distribuir(aviso, [f for filas in self._assinantes.values() for f in filas])
+        else:
+            self._distribuir(aviso, list(self._assinantes.get(aviso["id_usuario"], ())))
+
+    @staticmethod
+    def _distribuir(aviso: dict | None, destinos: list[asyncio.Queue]) -> None:
+        for fila in destinos:
+            try:
+                fila.put_nowait(aviso)
+            except asyncio.QueueFull:
+                pass
+
+    async def _escutar(self):
+        """Mantém a conexão de LISTEN aberta, reconectando se ela cair."""
+        import asyncpg
+        from dados_banco import DATABASE_URL_ASYNC
+
+        dsn = DATABASE_URL_ASYNC.replace("postgresql+asyncpg://", "postgresql://", 1)
+        while True:
+            try:
+                conexao = await asyncpg.connect(dsn)
+            except (OSError, asyncpg.PostgresError):
+                await asyncio.sleep(1)
+                continue
+            perdida = asyncio.Event()
+            conexao.add_termination_listener(lambda _: perdida.set())
+            try:
+                await conexao.add_listener(CANAL_PG, self._receber)
+                if self._pronto.is_set():
+                    # Avisos enviados sem LISTEN ativo se perderam
+                    self._distribuir(RESSINCRONIZAR, [f for filas in self._assinantes.values() for f in filas])
+                self._pronto.set()
+                await perdida.wait()
+            except asyncpg.PostgresError:
+                await asyncio.sleep(1)
+            finally:
+                if not conexao.is_closed():
+                    await conexao.close()
+
+    async def encerrar(self) -> None:
+        """Fecha a conexão de LISTEN (chamado no shutdown da API)."""
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+
+canal_notificacoes = CanalNotificacoes()
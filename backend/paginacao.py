@@ -0,0 +1,56 @@
+"""
+Paginação por cursor (keyset) compartilhada pelas rotas.
+
+Contrato: o cliente envia `limit` e, a partir da segunda página, o
+`cursor` recebido em `proximo_cursor`. A resposta sempre tem o formato
+{"itens": [...], "proximo_cursor": int | None}.
+"""
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+from fastapi import Query
+from pydantic import BaseModel
+
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 200
+
+
+T = TypeVar("T")
+
+
+class Pagina(BaseModel, Generic[T]):
+    """Modelo de resposta das rotas paginadas (ex.: Pagina[UsuarioItem])."""
+    itens: list[T]
+    proximo_cursor: int | None
+
+
+@dataclass
+class Paginacao:
+    limit: int
+    cursor: int | None
+
+
+def parametros_paginacao(
+    limit: int = Query(default=LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    cursor: int | None = Query(default=None, ge=0),
+) -> Paginacao:
+    """Dependency com os parâmetros de paginação da requisição."""
+    return Paginacao(limit=limit, cursor=cursor)
+
+
+def paginar(consulta, coluna_chave, pag: Paginacao):
+    """
+    Aplica o keyset na consulta: filtra depois do cursor, ordena pela chave
+    e busca um item a mais para saber se existe próxima página.
+    """
+    if pag.cursor is not None:
+        consulta = consulta.where(coluna_chave > pag.cursor)
+    return consulta.order_by(coluna_chave).limit(pag.limit + 1)
+
+
+def montar_pagina(itens: list, pag: Paginacao, chave) -> dict:
+    """Corta o item extra e calcula o próximo cursor a partir da chave."""
+    proximo_cursor = None
+    if len(itens) > pag.limit:
+        itens = itens[:pag.limit]
+        proximo_cursor = chave(itens[-1])
+    return {"itens": itens, "proximo_cursor": proximo_cursor}
@@ -0,0 +1,52 @@
+"""
+Modelos de resposta usados por mais de um router.
+
+Declarar o response_model tira as rotas do caminho lento do
+jsonable_encoder: o FastAPI valida e converte o retorno com o
+pydantic-core e o ORJSONResponse (padrão em main.py) gera os bytes.
+Modelos usados por um único router ficam junto dele, na seção SCHEMAS.
+"""
+from pydantic import BaseModel
+
+
+class Mensagem(BaseModel):
+    mensagem: str
+
+
+class UsuarioResumo(BaseModel):
+    id_usuario: int
+    nome: str
+    email: str
+    role: str
+
+
+class UsuarioPerfil(UsuarioResumo):
+    cpf: str | None = None
+    matricula: str | None = None
+
+
+class UsuarioAlterado(Mensagem):
+    usuario: UsuarioPerfil
+
+
+class PalestraCertificado(BaseModel):
+    titulo: str | None
+    local: str | None
+    horario_inicio: str
+    horario_fim: str
+    palestrante: str
+
+
+class DadosCertificado(BaseModel):
+    nome: str
+    email: str
+    cpf: str | None
+    matricula: str | None
+
+
+class Certificado(BaseModel):
+    usuario: DadosCertificado
+    palestras: list[PalestraCertificado]
+    total_horas: float
+    data_emissao: str
+    mensagem: str
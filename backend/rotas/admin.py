@@ -6,17 +6,30 @@ Rotas exclusivas de administradores:
 - Gerenciar administradores
 - Enviar notificações
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from sqlmodel import Session, select
-from datetime import datetime
+import json
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, field_validator
+from sqlalchemy import or_
+from sqlmodel import Session, func, select
+from datetime import date, datetime, time
 from dados_banco import (
-    cria_conexao_postgre, Palestrante, Palestra, Presenca,
+    executar, Palestrante, Palestra,
     Usuario, Notificacao,
 )
-from auth_utils import hash_senha
+from auth_utils import cache_tokens, exigir_admin, hash_senha_async
+from cache_utils import cronograma_cache, usar_etag
+from certificados import ZipIncremental, consultar_certificado, consultar_lote
+from certificado_pdf import obter_pdf, remover_pdfs
+from checkins import buffer_checkin
+from exportacao import exportar_csv, exportar_ndjson
+from notificacoes import para_todos, publicar
+from formatos import formatar_data, formatar_horario, ler_data
+from paginacao import Pagina, Paginacao, parametros_paginacao, paginar, montar_pagina
+from respostas import Certificado, Mensagem, UsuarioResumo
 
-router = APIRouter()
+# Todas as rotas deste módulo exigem token de administrador
+router = APIRouter(dependencies=[Depends(exigir_admin)])
 
 
 # ===================== SCHEMAS =====================
@@ -29,12 +42,17 @@ class PalestranteCreate(BaseModel):
 class PalestraCreate(BaseModel):
     titulo: str
     descricao: str | None = None
-    data: str
-    horario_inicio: str
-    horario_fim: str
+    data: date  # DD/MM/AAAA ou AAAA-MM-DD
+    horario_inicio: time  # HH:MM
+    horario_fim: time
     local: str
     id_palestrante: int
 
+    @field_validator("data", mode="before")
+    @classmethod
+    def _ler_data(cls, valor):
+        return ler_data(valor)
+
 
 class AdminCreate(BaseModel):
     nome: str
@@ -48,12 +66,33 @@ class NotificacaoCreate(BaseModel):
     id_usuario: int | None = None  # None = enviar para todos
 
 
+class AdminCriado(Mensagem):
+    admin: UsuarioResumo
+
+
+class UsuarioItem(BaseModel):
+    id_usuario: int
+    nome: str
+    email: str
+    matricula: str | None
+
+
+class MetricasCheckin(BaseModel):
+    ativo: bool
+    lotes_gravados: int
+    checkins_gravados: int
+    media_por_lote: float
+    maior_lote: int
+    espera_media_ms: float
+    espera_maxima_ms: float
+    na_fila: int
+
+
 # ===================== PALESTRANTE (ADMIN) =====================
 
-@router.post("/palestrantes")
-def criar_palestrante(dados: PalestranteCreate):
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
+@router.post("/palestrantes", response_model=Palestrante)
+async def criar_palestrante(dados: PalestranteCreate):
+    def operacao(session: Session):
         palestrante = Palestrante(
             nome=dados.nome,
             formacao=dados.formacao,
@@ -63,32 +102,41 @@ def criar_palestrante(dados: PalestranteCreate):
         session.refresh(palestrante)
         return palestrante
 
+    return await executar(operacao)
+
+
+@router.get(
+    "/palestrantes", response_model=Pagina[Palestrante], dependencies=[Depends(usar_etag)]
+)
+async def listar_palestrantes(pag: Paginacao = Depends(parametros_paginacao)):
+    def operacao(session: Session):
+        palestrantes = session.exec(
+            paginar(select(Palestrante), Palestrante.id_palestrante, pag)
+        ).all()
+        return montar_pagina(palestrantes, pag, lambda p: p.id_palestrante)
 
-@router.get("/palestrantes")
-def listar_palestrantes():
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        return session.exec(select(Palestrante)).all()
+    return await executar(operacao)
 
 
-@router.delete("/palestrantes/{id_palestrante}")
-def deletar_palestrante(id_palestrante: int):
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
+@router.delete("/palestrantes/{id_palestrante}", response_model=Mensagem)
+async def deletar_palestrante(id_palestrante: int):
+    def operacao(session: Session):
         palestrante = session.get(Palestrante, id_palestrante)
         if not palestrante:
             raise HTTPException(status_code=404, detail="Palestrante não encontrado")
         session.delete(palestrante)
         session.commit()
+        cronograma_cache.invalidar()
         return {"mensagem": "Palestrante removido com sucesso"}
 
+    return await executar(operacao)
+
 
 # ===================== PALESTRA (ADMIN) =====================
 
-@router.post("/palestras")
-def criar_palestra(dados: PalestraCreate):
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
+@router.post("/palestras", response_model=Palestra)
+async def criar_palestra(dados: PalestraCreate):
+    def operacao(session: Session):
         palestrante = session.get(Palestrante, dados.id_palestrante)
         if not palestrante:
             raise HTTPException(status_code=404, detail="Palestrante não encontrado")
@@ -102,100 +150,121 @@ def criar_palestra(dados: PalestraCreate):
             id_palestrante=dados.id_palestrante,
         )
         session.add(palestra)
-        session.commit()
-        session.refresh(palestra)
 
-        # Enviar notificação para todos os usuários sobre nova palestra
-        usuarios = session.exec(select(Usuario).where(Usuario.role == "user")).all()
-        for u in usuarios:
-            notif = Notificacao(
-                id_usuario=u.id_usuario,
-                titulo="Nova palestra cadastrada!",
-                mensagem=f'"{dados.titulo}" em {dados.data} às {dados.horario_inicio} - {dados.local}',
-            )
-            session.add(notif)
+        # Notificação única (id_usuario nulo) para os participantes cadastrados
+        notif = para_todos(
+            session,
+            titulo="Nova palestra cadastrada!",
+            mensagem=(
+                f'"{dados.titulo}" em {formatar_data(dados.data)} às '
+                f'{formatar_horario(dados.horario_inicio)} - {dados.local}'
+            ),
+        )
+        session.add(notif)
+        publicar(session, notif)
         session.commit()
-
+        session.refresh(palestra)
+        cronograma_cache.invalidar()
         return palestra
 
+    return await executar(operacao)
+
 
-@router.delete("/palestras/{id_palestra}")
-def deletar_palestra(id_palestra: int):
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
+@router.delete("/palestras/{id_palestra}", response_model=Mensagem)
+async def deletar_palestra(id_palestra: int):
+    def operacao(session: Session):
         palestra = session.get(Palestra, id_palestra)
         if not palestra:
             raise HTTPException(status_code=404, detail="Palestra não encontrada")
         session.delete(palestra)
         session.commit()
+        cronograma_cache.invalidar()
         return {"mensagem": "Palestra removida com sucesso"}
 
+    return await executar(operacao)
 
-# ===================== CERTIFICADO (ADMIN) =====================
 
-@router.get("/certificado/{id_usuario}")
-def emitir_certificado(id_usuario: int):
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        usuario = session.get(Usuario, id_usuario)
-        if not usuario:
-            raise HTTPException(status_code=404, detail="Usuário não encontrado")
+# ===================== CERTIFICADO (ADMIN) =====================
 
-        presencas = session.exec(
-            select(Presenca).where(Presenca.id_usuario == id_usuario)
-        ).all()
+@router.get(
+    "/certificado/{id_usuario}", response_model=Certificado, dependencies=[Depends(usar_etag)]
+)
+async def emitir_certificado(id_usuario: int):
+    return await executar(
+        consultar_certificado, id_usuario, "Usuário não possui presenças registradas"
+    )
+
+
+@router.get("/certificado/{id_usuario}/pdf")
+async def emitir_certificado_pdf(id_usuario: int):
+    """Certificado do usuário em PDF (gerado uma vez e servido do cache em disco)."""
+    certificado = await executar(
+        consultar_certificado, id_usuario, "Usuário não possui presenças registradas"
+    )
+    caminho = await obter_pdf(id_usuario, certificado)
+    return FileResponse(
+        caminho,
+        media_type="application/pdf",
+        filename=f"certificado_{id_usuario}.pdf",
+    )
+
+
+@router.get("/certificados")
+async def emitir_certificados_em_lote(
+    formato: str = Query(default="ndjson", pattern="^(ndjson|zip)$"),
+):
+    """Certificados de todos os participantes, enviados aos poucos (NDJSON ou ZIP)."""
+    data_emissao = datetime.now().strftime("%d/%m/%Y %H:%M")
+
+    async def gerar():
+        arquivo_zip = ZipIncremental() if formato == "zip" else None
+        cursor = None
+        while True:
+            certificados, cursor = await executar(consultar_lote, cursor, data_emissao)
+            for certificado in certificados:
+                if arquivo_zip:
+                    yield arquivo_zip.adicionar(certificado)
+                else:
+                    yield json.dumps(certificado, ensure_ascii=False) + "\n"
+            if cursor is None:
+                break
+        if arquivo_zip:
+            yield arquivo_zip.finalizar()
+
+    if formato == "zip":
+        return StreamingResponse(
+            gerar(),
+            media_type="application/zip",
+            headers={"Content-Disposition": 'attachment; filename="certificados.zip"'},
+        )
+    return StreamingResponse(gerar(), media_type="application/x-ndjson")
 
-        if not presencas:
-            raise HTTPException(
-                status_code=400,
-                detail="Usuário não possui presenças registradas",
-            )
 
-        palestras_info = []
-        total_horas = 0.0
-        for p in presencas:
-            palestra = session.get(Palestra, p.id_palestra)
-            if palestra:
-                palestrante = session.get(Palestrante, palestra.id_palestrante)
-                palestras_info.append({
-                    "titulo": palestra.titulo,
-                    "local": palestra.local,
-                    "horario_inicio": palestra.horario_inicio,
-                    "horario_fim": palestra.horario_fim,
-                    "palestrante": palestrante.nome if palestrante else "N/A",
-                })
-                try:
-                    inicio = datetime.strptime(palestra.horario_inicio, "%H:%M")
-                    fim = datetime.strptime(palestra.horario_fim, "%H:%M")
-                    diff = (fim - inicio).seconds / 3600
-                    total_horas += diff
-                except Exception:
-                    pass
+# ===================== EXPORTAÇÃO =====================
 
-        return {
-            "usuario": {
-                "nome": usuario.nome,
-                "email": usuario.email,
-                "cpf": usuario.cpf,
-                "matricula": usuario.matricula,
-            },
-            "palestras": palestras_info,
-            "total_horas": round(total_horas, 1),
-            "data_emissao": datetime.now().strftime("%d/%m/%Y %H:%M"),
-            "mensagem": (
-                f"Certificamos que {usuario.nome} participou da Semana da "
-                f"Computação DECSI com carga horária total de {round(total_horas, 1)} horas."
-            ),
-        }
+@router.get("/exportar/{tabela}")
+async def exportar(
+    tabela: str = Path(pattern="^(usuarios|presencas|avaliacoes)$"),
+    formato: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+):
+    """Exporta usuários, presenças ou avaliações inteiros, enviados aos poucos."""
+    if formato == "ndjson":
+        return StreamingResponse(exportar_ndjson(tabela), media_type="application/x-ndjson")
+    return StreamingResponse(
+        exportar_csv(tabela),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{tabela}.csv"'},
+    )
 
 
 # ===================== GERENCIAR ADMINS =====================
 
-@router.post("/administradores")
-def criar_admin(dados: AdminCreate):
+@router.post("/administradores", response_model=AdminCriado)
+async def criar_admin(dados: AdminCreate):
     """Cria um novo administrador."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
+    senha_hash = await hash_senha_async(dados.senha)
+
+    def operacao(session: Session):
         existente = session.exec(
             select(Usuario).where(Usuario.email == dados.email)
         ).first()
@@ -205,7 +274,7 @@ def criar_admin(dados: AdminCreate):
         admin = Usuario(
             nome=dados.nome,
             email=dados.email,
-            senha_hash=hash_senha(dados.senha),
+            senha_hash=senha_hash,
             role="admin",
         )
         session.add(admin)
@@ -221,16 +290,21 @@ def criar_admin(dados: AdminCreate):
             },
         }
 
+    return await executar(operacao)
+
 
-@router.get("/administradores")
-def listar_admins():
-    """Lista todos os administradores."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
+@router.get(
+    "/administradores",
+    response_model=Pagina[UsuarioResumo],
+    dependencies=[Depends(usar_etag)],
+)
+async def listar_admins(pag: Paginacao = Depends(parametros_paginacao)):
+    """Lista os administradores, paginado."""
+    def operacao(session: Session):
         admins = session.exec(
-            select(Usuario).where(Usuario.role == "admin")
+            paginar(select(Usuario).where(Usuario.role == "admin"), Usuario.id_usuario, pag)
         ).all()
-        return [
+        resultado = [
             {
                 "id_usuario": a.id_usuario,
                 "nome": a.nome,
@@ -239,32 +313,50 @@ def listar_admins():
             }
             for a in admins
         ]
+        return montar_pagina(resultado, pag, lambda r: r["id_usuario"])
+
+    return await executar(operacao)
 
 
-@router.delete("/administradores/{id_usuario}")
-def remover_admin(id_usuario: int):
+@router.delete("/administradores/{id_usuario}", response_model=Mensagem)
+async def remover_admin(id_usuario: int):
     """Remove um administrador."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
+    def operacao(session: Session):
         admin = session.get(Usuario, id_usuario)
         if not admin or admin.role != "admin":
             raise HTTPException(status_code=404, detail="Administrador não encontrado")
         session.delete(admin)
         session.commit()
+        cache_tokens.revogar_usuario(id_usuario)
+        remover_pdfs(id_usuario)
         return {"mensagem": "Administrador removido com sucesso"}
 
+    return await executar(operacao)
+
 
 # ===================== LISTAR USUÁRIOS (ADMIN) =====================
 
-@router.get("/usuarios")
-def listar_usuarios():
-    """Lista todos os usuários normais."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        usuarios = session.exec(
-            select(Usuario).where(Usuario.role == "user")
-        ).all()
-        return [
+@router.get(
+    "/usuarios", response_model=Pagina[UsuarioItem], dependencies=[Depends(usar_etag)]
+)
+async def listar_usuarios(
+    pag: Paginacao = Depends(parametros_paginacao),
+    busca: str | None = Query(default=None, min_length=2, max_length=100,
+                              description="Início do nome ou do e-mail"),
+):
+    """Lista os usuários normais, paginado; `busca` filtra pelo início do nome/e-mail."""
+    def operacao(session: Session):
+        consulta = select(Usuario).where(Usuario.role == "user")
+        if busca:
+            # Prefixo com os curingas do LIKE escapados (índices da migração 0006)
+            termo = busca.strip().lower()
+            prefixo = termo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            consulta = consulta.where(or_(
+                func.lower(Usuario.nome).like(prefixo),
+                func.lower(Usuario.email).like(prefixo),
+            ))
+        usuarios = session.exec(paginar(consulta, Usuario.id_usuario, pag)).all()
+        resultado = [
             {
                 "id_usuario": u.id_usuario,
                 "nome": u.nome,
@@ -273,15 +365,17 @@ def listar_usuarios():
             }
             for u in usuarios
         ]
+        return montar_pagina(resultado, pag, lambda r: r["id_usuario"])
+
+    return await executar(operacao)
 
 
 # ===================== NOTIFICAÇÕES (ADMIN) =====================
 
-@router.post("/notificacoes")
-def enviar_notificacao(dados: NotificacaoCreate):
+@router.post("/notificacoes", response_model=Mensagem)
+async def enviar_notificacao(dados: NotificacaoCreate):
     """Envia notificação para um usuário ou para todos."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
+    def operacao(session: Session):
         if dados.id_usuario:
             # Enviar para um usuário específico
             usuario = session.get(Usuario, dados.id_usuario)
@@ -294,16 +388,19 @@ def enviar_notificacao(dados: NotificacaoCreate):
             )
             session.add(notif)
         else:
-            # Enviar para todos os usuários
-            usuarios = session.exec(
-                select(Usuario).where(Usuario.role == "user")
-            ).all()
-            for u in usuarios:
-                notif = Notificacao(
-                    id_usuario=u.id_usuario,
-                    titulo=dados.titulo,
-                    mensagem=dados.mensagem,
-                )
-                session.add(notif)
+            # Enviar para todos os participantes: uma única linha com id_usuario nulo
+            notif = para_todos(session, dados.titulo, dados.mensagem)
+            session.add(notif)
+        publicar(session, notif)
         session.commit()
         return {"mensagem": "Notificação enviada com sucesso"}
+
+    return await executar(operacao)
+
+
+# ===================== MÉTRICAS (ADMIN) =====================
+
+@router.get("/metricas/checkin", response_model=MetricasCheckin)
+async def metricas_checkin():
+    """Tamanho dos lotes e espera na fila do buffer de check-in."""
+    return buffer_checkin.metricas()
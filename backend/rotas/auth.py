@@ -3,9 +3,12 @@ Rotas de autenticação: registro e login.
 """
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from sqlmodel import Session, select
-from dados_banco import cria_conexao_postgre, Usuario
-from auth_utils import hash_senha, verificar_senha
+from sqlmodel import Session, select, update
+from dados_banco import executar, Usuario
+from auth_utils import (
+    criar_token, hash_senha_async, precisa_atualizar_hash, verificar_senha_async,
+)
+from respostas import Mensagem, UsuarioResumo
 
 router = APIRouter()
 
@@ -25,13 +28,19 @@ class LoginRequest(BaseModel):
     senha: str
 
 
+class SessaoResposta(Mensagem):
+    token: str
+    usuario: UsuarioResumo
+
+
 # ---- Rotas ----
 
-@router.post("/registro")
-def registrar_usuario(dados: RegistroRequest):
+@router.post("/registro", response_model=SessaoResposta)
+async def registrar_usuario(dados: RegistroRequest):
     """Registra um novo usuário (role=user por padrão)."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
+    senha_hash = await hash_senha_async(dados.senha)
+
+    def operacao(session: Session):
         # Verificar se e-mail já existe
         existente = session.exec(
             select(Usuario).where(Usuario.email == dados.email)
@@ -42,7 +51,7 @@ def registrar_usuario(dados: RegistroRequest):
         usuario = Usuario(
             nome=dados.nome,
             email=dados.email,
-            senha_hash=hash_senha(dados.senha),
+            senha_hash=senha_hash,
             role="user",
             cpf=dados.cpf,
             matricula=dados.matricula,
@@ -53,6 +62,7 @@ def registrar_usuario(dados: RegistroRequest):
 
         return {
             "mensagem": "Usuário registrado com sucesso!",
+            "token": criar_token(usuario.id_usuario, usuario.role, usuario.nome),
             "usuario": {
                 "id_usuario": usuario.id_usuario,
                 "nome": usuario.nome,
@@ -61,26 +71,47 @@ def registrar_usuario(dados: RegistroRequest):
             },
         }
 
+    return await executar(operacao)
+
 
-@router.post("/login")
-def login(dados: LoginRequest):
+@router.post("/login", response_model=SessaoResposta)
+async def login(dados: LoginRequest):
     """Realiza login."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        usuario = session.exec(
+    def buscar(session: Session):
+        return session.exec(
             select(Usuario).where(Usuario.email == dados.email)
         ).first()
-        if not usuario:
-            raise HTTPException(status_code=401, detail="E-mail ou senha inválidos")
-        if not verificar_senha(dados.senha, usuario.senha_hash):
-            raise HTTPException(status_code=401, detail="E-mail ou senha inválidos")
 
-        return {
-            "mensagem": "Login realizado com sucesso!",
-            "usuario": {
-                "id_usuario": usuario.id_usuario,
-                "nome": usuario.nome,
-                "email": usuario.email,
-                "role": usuario.role,
-            },
-        }
+    usuario = await executar(buscar)
+    if not usuario:
+        raise HTTPException(status_code=401, detail="E-mail ou senha inválidos")
+    if not await verificar_senha_async(dados.senha, usuario.senha_hash):
+        raise HTTPException(status_code=401, detail="E-mail ou senha inválidos")
+
+    # Hash legado (SHA-256) ou com custo antigo: regrava com os parâmetros atuais
+    if precisa_atualizar_hash(usuario.senha_hash):
+        novo_hash = await hash_senha_async(dados.senha)
+
+        def atualizar_hash(session: Session):
+            session.exec(
+                update(Usuario)
+                .where(
+                    Usuario.id_usuario == usuario.id_usuario,
+                    Usuario.senha_hash == usuario.senha_hash,
+                )
+                .values(senha_hash=novo_hash)
+            )
+            session.commit()
+
+        await executar(atualizar_hash)
+
+    return {
+        "mensagem": "Login realizado com sucesso!",
+        "token": criar_token(usuario.id_usuario, usuario.role, usuario.nome),
+        "usuario": {
+            "id_usuario": usuario.id_usuario,
+            "nome": usuario.nome,
+            "email": usuario.email,
+            "role": usuario.role,
+        },
+    }
@@ -6,140 +6,418 @@ Rotas de usuários normais:
 - Ver notificações
 - Ver perfil / certificado próprio
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from sqlmodel import Session, select
-from datetime import datetime
+import asyncio
+from dataclasses import dataclass
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import and_, or_, tuple_
+from sqlmodel import Session, func, select
+from datetime import date, datetime, time, timedelta, timezone
 from dados_banco import (
-    cria_conexao_postgre, Palestra, Presenca, Palestrante,
-    Usuario, Avaliacao, Notificacao,
+    executar, restricao_violada, Palestra, Presenca, Palestrante,
+    Usuario, Avaliacao, Notificacao, NotificacaoLeitura,
 )
-from auth_utils import hash_senha, verificar_senha
+from auth_utils import (
+    cache_tokens, exigir_admin, exigir_usuario, hash_senha_async, verificar_senha_async,
+)
+from cache_utils import (
+    calcular_etag, cronograma_cache, etag_confere, serializar_json, usar_etag,
+)
+from certificados import consultar_certificado
+from checkins import CHECKIN_BUFFER, buffer_checkin, inserir_presencas
+from certificado_pdf import obter_pdf, remover_pdfs
+from notificacoes import (
+    RESSINCRONIZAR, SSE_KEEPALIVE_SEGUNDOS, canal_notificacoes, contar_nao_lidas, evento_sse,
+    marcar_lidas, recebe_aviso, recebe_para_todos,
+)
+from formatos import agora_no_evento, formatar_data, formatar_horario, ler_data, no_fuso_do_evento
+from paginacao import LIMITE_MAXIMO, Pagina, Paginacao, parametros_paginacao, paginar, montar_pagina
+from respostas import Certificado, Mensagem, UsuarioAlterado, UsuarioPerfil
 
 router = APIRouter()
 
+# Máximo de check-ins aceitos em uma sincronização offline
+LIMITE_CHECKINS_LOTE = 2000
+
+# Máximo de notificações em um "marcar como lidas" com lista de ids
+LIMITE_MARCAR_LIDAS = 1000
+
+# Quantidade padrão de palestras no modo "proximas" do cronograma
+LIMITE_PROXIMAS = 5
+
 
 # ===================== SCHEMAS =====================
 
 class CheckinCreate(BaseModel):
+    id_palestra: int
+
+
+class CheckinOffline(BaseModel):
     id_usuario: int
     id_palestra: int
+    horario_checkin: datetime  # momento da leitura no dispositivo (sem fuso = FUSO_EVENTO)
+
+
+class CheckinLoteRequest(BaseModel):
+    checkins: list[CheckinOffline] = Field(max_length=LIMITE_CHECKINS_LOTE)
 
 
 class AvaliacaoCreate(BaseModel):
-    id_usuario: int
     id_palestra: int
     nota: int  # 1 a 5
     comentario: str | None = None
 
 
 class AlterarEmailRequest(BaseModel):
-    id_usuario: int
     senha_atual: str
     novo_email: str
 
 
 class AlterarSenhaRequest(BaseModel):
-    id_usuario: int
     senha_atual: str
     nova_senha: str
 
 
 class ExcluirContaRequest(BaseModel):
-    id_usuario: int
     senha_atual: str
 
 
 class AlterarNomeRequest(BaseModel):
-    id_usuario: int
     novo_nome: str
 
 
+class MarcarLidasRequest(BaseModel):
+    ids: list[int] | None = Field(default=None, max_length=LIMITE_MARCAR_LIDAS)  # None = todas
+
+
+class PalestraCronograma(BaseModel):
+    id_palestra: int
+    titulo: str | None
+    descricao: str | None
+    data: str | None  # DD/MM/AAAA
+    horario_inicio: str  # HH:MM
+    horario_fim: str
+    duracao_minutos: int | None
+    local: str | None
+    palestrante: str
+
+
+class CheckinCriado(Mensagem):
+    presenca_id: int | None
+
+
+class ResultadoCheckin(BaseModel):
+    id_usuario: int
+    id_palestra: int
+    status: str
+    presenca_id: int | None
+
+
+class CheckinLoteResposta(BaseModel):
+    resultados: list[ResultadoCheckin]
+    criados: int
+
+
+class CheckinItem(BaseModel):
+    id_presenca: int
+    id_palestra: int | None
+    titulo_palestra: str
+    horario_checkin: datetime | None
+
+
+class AvaliacaoCriada(Mensagem):
+    avaliacao_id: int
+
+
+class MinhaAvaliacao(BaseModel):
+    id_avaliacao: int
+    titulo_palestra: str
+    nota: int
+    comentario: str | None
+
+
+class ResumoAvaliacoes(BaseModel):
+    id_palestra: int
+    titulo: str | None
+    palestrante: str
+    data: str | None
+    media_nota: float
+    total_avaliacoes: int
+
+
+class AvaliacaoDaPalestra(BaseModel):
+    id_avaliacao: int
+    nome_usuario: str
+    nota: int
+    comentario: str | None
+
+
+class NotificacaoItem(BaseModel):
+    id_notificacao: int
+    titulo: str
+    mensagem: str
+    lida: bool
+
+
+class NaoLidas(BaseModel):
+    nao_lidas: int
+
+
+class NotificacoesMarcadas(Mensagem):
+    nao_lidas: int
+
+
 # ===================== CRONOGRAMA (público) =====================
 
-@router.get("/palestras")
-def listar_palestras():
-    """Lista todas as palestras (cronograma público)."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        palestras = session.exec(select(Palestra)).all()
-        resultado = []
-        for p in palestras:
-            palestrante = session.get(Palestrante, p.id_palestrante)
-            resultado.append({
-                "id_palestra": p.id_palestra,
-                "titulo": p.titulo,
-                "descricao": p.descricao,
-                "data": p.data,
-                "horario_inicio": p.horario_inicio,
-                "horario_fim": p.horario_fim,
-                "local": p.local,
-                "palestrante": palestrante.nome if palestrante else "N/A",
-            })
-        return resultado
+@dataclass
+class FiltroCronograma:
+    data: date | None = None
+    local: str | None = None
+    id_palestrante: int | None = None
+    horario_de: time | None = None
+    horario_ate: time | None = None
+    modo: str | None = None
+    limit: int = LIMITE_PROXIMAS
+
+    def vazio(self) -> bool:
+        return self == FiltroCronograma(limit=self.limit)
+
+
+def parametros_cronograma(
+    data: str | None = Query(default=None, description="DD/MM/AAAA ou AAAA-MM-DD"),
+    local: str | None = Query(default=None),
+    id_palestrante: int | None = Query(default=None),
+    horario_de: time | None = Query(default=None, description="Palestras que terminam depois de HH:MM"),
+    horario_ate: time | None = Query(default=None, description="Palestras que começam antes de HH:MM"),
+    modo: str | None = Query(default=None, pattern="^(agora|proximas)$"),
+    limit: int = Query(default=LIMITE_PROXIMAS, ge=1, le=LIMITE_MAXIMO),
+) -> FiltroCronograma:
+    """Dependency com os filtros do cronograma."""
+    try:
+        data_filtro = ler_data(data)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Data inválida (use DD/MM/AAAA)")
+    return FiltroCronograma(data_filtro, local, id_palestrante, horario_de, horario_ate, modo, limit)
+
+
+def _consultar_cronograma(session: Session, filtro: FiltroCronograma | None = None) -> list[dict]:
+    """Monta o cronograma, em ordem de data e horário, com uma única consulta."""
+    consulta = (
+        select(Palestra, Palestrante.nome)
+        .join(Palestrante, Palestra.id_palestrante == Palestrante.id_palestrante, isouter=True)
+        .order_by(Palestra.data, Palestra.horario_inicio, Palestra.id_palestra)
+    )
+    if filtro:
+        consulta = _aplicar_filtro(consulta, filtro)
+    linhas = session.exec(consulta).all()
+    return [
+        {
+            "id_palestra": p.id_palestra,
+            "titulo": p.titulo,
+            "descricao": p.descricao,
+            "data": formatar_data(p.data),
+            "horario_inicio": formatar_horario(p.horario_inicio),
+            "horario_fim": formatar_horario(p.horario_fim),
+            "duracao_minutos": p.duracao_minutos,
+            "local": p.local,
+            "palestrante": nome_palestrante or "N/A",
+        }
+        for p, nome_palestrante in linhas
+    ]
+
+
+def _aplicar_filtro(consulta, filtro: FiltroCronograma):
+    """Filtros do cronograma, todos cobertos pelos índices de palestra."""
+    if filtro.data:
+        consulta = consulta.where(Palestra.data == filtro.data)
+    if filtro.local:
+        consulta = consulta.where(Palestra.local == filtro.local)
+    if filtro.id_palestrante is not None:
+        consulta = consulta.where(Palestra.id_palestrante == filtro.id_palestrante)
+    # Palestra com fim antes do início termina depois da meia-noite (como
+    # em duracao_minutos): passa do fim do dia em que começa
+    vira_o_dia = Palestra.horario_fim < Palestra.horario_inicio
+    # Janela de horário: palestras que se sobrepõem ao intervalo pedido
+    if filtro.horario_de:
+        consulta = consulta.where(or_(Palestra.horario_fim > filtro.horario_de, vira_o_dia))
+    if filtro.horario_ate:
+        consulta = consulta.where(Palestra.horario_inicio < filtro.horario_ate)
+
+    if filtro.modo:
+        agora = agora_no_evento()
+        if filtro.modo == "agora":
+            hoje, hora = agora.date(), agora.time()
+            consulta = consulta.where(or_(
+                # Começou hoje e ainda não terminou
+                and_(
+                    Palestra.data == hoje,
+                    Palestra.horario_inicio <= hora,
+                    or_(Palestra.horario_fim > hora, vira_o_dia),
+                ),
+                # Começou ontem e termina hoje, depois de agora
+                and_(
+                    Palestra.data == hoje - timedelta(days=1),
+                    vira_o_dia,
+                    Palestra.horario_fim > hora,
+                ),
+            ))
+        else:
+            # Próximas: (data, início) depois de agora, na ordem do índice
+            consulta = consulta.where(
+                tuple_(Palestra.data, Palestra.horario_inicio) > tuple_(agora.date(), agora.time())
+            ).limit(filtro.limit)
+    return consulta
+
+
+@router.get("/palestras", response_model=list[PalestraCronograma])
+async def listar_palestras(
+    filtro: FiltroCronograma = Depends(parametros_cronograma),
+    if_none_match: str | None = Header(default=None),
+):
+    """
+    Cronograma público. Sem filtros, vem do snapshot em cache; com filtros
+    (data, local, palestrante, janela de horário, modo=agora|proximas),
+    busca só as palestras pedidas.
+    """
+    if filtro.vazio():
+        # O snapshot é refeito logo depois de um admin alterar palestras: lê do
+        # primário para não guardar (por até CACHE_TTL_SEGUNDOS) uma réplica atrasada
+        corpo, etag = await cronograma_cache.obter(
+            lambda: executar(_consultar_cronograma, leitura=False)
+        )
+    else:
+        corpo = serializar_json(await executar(_consultar_cronograma, filtro))
+        etag = calcular_etag(corpo)
+    headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
+    if etag_confere(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=corpo, media_type="application/json", headers=headers)
 
 
 # ===================== CHECK-IN =====================
 
-@router.post("/checkin")
-def fazer_checkin(dados: CheckinCreate):
-    """Faz check-in do usuário em uma palestra."""
-    id_usuario = dados.id_usuario
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        # Verificar se palestra existe
-        palestra = session.get(Palestra, dados.id_palestra)
-        if not palestra:
+@router.post("/checkin", response_model=CheckinCriado)
+async def fazer_checkin(dados: CheckinCreate, usuario: dict = Depends(exigir_usuario)):
+    """Faz check-in do usuário em uma palestra (um único INSERT no banco)."""
+    id_usuario = usuario["id_usuario"]
+    horario = datetime.now(timezone.utc)
+    if CHECKIN_BUFFER:
+        # Entra na fila de group commit e só responde depois do commit do lote
+        status, id_presenca = await buffer_checkin.enviar(
+            id_usuario, dados.id_palestra, horario
+        )
+        if status == "duplicado":
+            raise HTTPException(status_code=400, detail="Check-in já realizado para esta palestra")
+        if status == "usuario_inexistente":
+            raise HTTPException(status_code=404, detail="Usuário não encontrado")
+        if status == "palestra_inexistente":
             raise HTTPException(status_code=404, detail="Palestra não encontrada")
-        # Verificar se já fez check-in
-        existente = session.exec(
-            select(Presenca).where(
-                Presenca.id_usuario == id_usuario,
-                Presenca.id_palestra == dados.id_palestra,
+        return {"mensagem": "Check-in realizado com sucesso!", "presenca_id": id_presenca}
+
+    def operacao(session: Session):
+        # O índice único (id_usuario, id_palestra) impede check-in duplicado
+        # mesmo com leituras simultâneas; as FKs validam usuário e palestra.
+        inserir = (
+            pg_insert(Presenca)
+            .values(
+                id_usuario=id_usuario,
+                id_palestra=dados.id_palestra,
+                horario_checkin=horario,
             )
-        ).first()
-        if existente:
+            .on_conflict_do_nothing(index_elements=["id_usuario", "id_palestra"])
+            .returning(Presenca.id_presenca)
+        )
+        try:
+            id_presenca = session.exec(inserir).scalar_one_or_none()
+            session.commit()
+        except IntegrityError as e:
+            # Única violação possível aqui é de FK: usuário ou palestra inexistente
+            session.rollback()
+            if restricao_violada(e) == "fk_usuario_presenca":
+                raise HTTPException(status_code=404, detail="Usuário não encontrado")
+            raise HTTPException(status_code=404, detail="Palestra não encontrada")
+        if id_presenca is None:
             raise HTTPException(status_code=400, detail="Check-in já realizado para esta palestra")
+        return {"mensagem": "Check-in realizado com sucesso!", "presenca_id": id_presenca}
 
-        presenca = Presenca(
-            id_usuario=id_usuario,
-            id_palestra=dados.id_palestra,
-            horario_checkin=datetime.now().timestamp(),
-        )
-        session.add(presenca)
-        session.commit()
-        session.refresh(presenca)
-        return {"mensagem": "Check-in realizado com sucesso!", "presenca_id": presenca.id_presenca}
+    return await executar(operacao)
 
 
-@router.get("/checkins")
-def listar_meus_checkins(id_usuario: int):
-    """Lista check-ins do usuário."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        presencas = session.exec(
-            select(Presenca).where(Presenca.id_usuario == id_usuario)
+@router.post(
+    "/checkin/lote", response_model=CheckinLoteResposta, dependencies=[Depends(exigir_admin)]
+)
+async def sincronizar_checkins(dados: CheckinLoteRequest):
+    """
+    Recebe os check-ins feitos offline por um leitor e grava todos com um
+    único INSERT ... SELECT, mantendo o horário original da leitura.
+    Retorna o status de cada registro, na mesma ordem do envio.
+    """
+    if not dados.checkins:
+        return {"resultados": [], "criados": 0}
+
+    registros = [
+        # Horário sem fuso é o relógio do leitor, no fuso do evento (não o do servidor)
+        (c.id_usuario, c.id_palestra, no_fuso_do_evento(c.horario_checkin))
+        for c in dados.checkins
+    ]
+    resultados = await executar(inserir_presencas, registros)
+    return {
+        "resultados": [
+            {
+                "id_usuario": c.id_usuario,
+                "id_palestra": c.id_palestra,
+                "status": status,
+                "presenca_id": id_presenca,
+            }
+            for c, (status, id_presenca) in zip(dados.checkins, resultados)
+        ],
+        "criados": sum(1 for status, _ in resultados if status == "criado"),
+    }
+
+
+@router.get(
+    "/checkins", response_model=Pagina[CheckinItem], dependencies=[Depends(usar_etag)]
+)
+async def listar_meus_checkins(
+    usuario: dict = Depends(exigir_usuario),
+    pag: Paginacao = Depends(parametros_paginacao),
+):
+    """Lista check-ins do usuário, paginado."""
+    id_usuario = usuario["id_usuario"]
+    def operacao(session: Session):
+        linhas = session.exec(
+            paginar(
+                select(Presenca, Palestra.titulo)
+                .join(Palestra, Presenca.id_palestra == Palestra.id_palestra, isouter=True)
+                .where(Presenca.id_usuario == id_usuario),
+                Presenca.id_presenca,
+                pag,
+            )
         ).all()
-        resultado = []
-        for p in presencas:
-            palestra = session.get(Palestra, p.id_palestra)
-            resultado.append({
+        resultado = [
+            {
                 "id_presenca": p.id_presenca,
                 "id_palestra": p.id_palestra,
-                "titulo_palestra": palestra.titulo if palestra else "N/A",
+                "titulo_palestra": titulo or "N/A",
                 "horario_checkin": p.horario_checkin,
-            })
-        return resultado
+            }
+            for p, titulo in linhas
+        ]
+        return montar_pagina(resultado, pag, lambda r: r["id_presenca"])
+
+    return await executar(operacao)
 
 
 # ===================== AVALIAÇÃO =====================
 
-@router.post("/avaliar")
-def avaliar_palestra(dados: AvaliacaoCreate):
+@router.post("/avaliar", response_model=AvaliacaoCriada)
+async def avaliar_palestra(dados: AvaliacaoCreate, usuario: dict = Depends(exigir_usuario)):
     """Usuário avalia uma palestra que assistiu."""
-    id_usuario = dados.id_usuario
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
+    id_usuario = usuario["id_usuario"]
+    def operacao(session: Session):
         # Verificar se palestra existe
         palestra = session.get(Palestra, dados.id_palestra)
         if not palestra:
@@ -180,104 +458,268 @@ def avaliar_palestra(dados: AvaliacaoCreate):
         session.refresh(avaliacao)
         return {"mensagem": "Avaliação registrada com sucesso!", "avaliacao_id": avaliacao.id_avaliacao}
 
+    return await executar(operacao)
 
-@router.get("/avaliacoes")
-def listar_minhas_avaliacoes(id_usuario: int):
-    """Lista avaliações feitas pelo usuário."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        avaliacoes = session.exec(
-            select(Avaliacao).where(Avaliacao.id_usuario == id_usuario)
+
+@router.get(
+    "/avaliacoes", response_model=Pagina[MinhaAvaliacao], dependencies=[Depends(usar_etag)]
+)
+async def listar_minhas_avaliacoes(
+    usuario: dict = Depends(exigir_usuario),
+    pag: Paginacao = Depends(parametros_paginacao),
+):
+    """Lista avaliações feitas pelo usuário, paginado."""
+    id_usuario = usuario["id_usuario"]
+    def operacao(session: Session):
+        linhas = session.exec(
+            paginar(
+                select(Avaliacao, Palestra.titulo)
+                .join(Palestra, Avaliacao.id_palestra == Palestra.id_palestra, isouter=True)
+                .where(Avaliacao.id_usuario == id_usuario),
+                Avaliacao.id_avaliacao,
+                pag,
+            )
         ).all()
-        resultado = []
-        for a in avaliacoes:
-            palestra = session.get(Palestra, a.id_palestra)
-            resultado.append({
+        resultado = [
+            {
                 "id_avaliacao": a.id_avaliacao,
-                "titulo_palestra": palestra.titulo if palestra else "N/A",
+                "titulo_palestra": titulo or "N/A",
                 "nota": a.nota,
                 "comentario": a.comentario,
-            })
-        return resultado
+            }
+            for a, titulo in linhas
+        ]
+        return montar_pagina(resultado, pag, lambda r: r["id_avaliacao"])
 
+    return await executar(operacao)
+
+
+@router.get(
+    "/avaliacoes-por-palestra",
+    response_model=Pagina[ResumoAvaliacoes],
+    dependencies=[Depends(exigir_usuario), Depends(usar_etag)],
+)
+async def listar_avaliacoes_por_palestra(pag: Paginacao = Depends(parametros_paginacao)):
+    """Resumo (média e total) das avaliações por palestra, paginado."""
+    def operacao(session: Session):
+        palestras = session.exec(
+            paginar(
+                select(Palestra, Palestrante.nome).join(
+                    Palestrante,
+                    Palestra.id_palestrante == Palestrante.id_palestrante,
+                    isouter=True,
+                ),
+                Palestra.id_palestra,
+                pag,
+            )
+        ).all()
+
+        # Média e total calculados no banco, só para as palestras da página
+        ids = [p.id_palestra for p, _ in palestras]
+        resumos = {}
+        if ids:
+            resumos = {
+                id_palestra: (media, total)
+                for id_palestra, media, total in session.exec(
+                    select(
+                        Avaliacao.id_palestra,
+                        func.avg(Avaliacao.nota),
+                        func.count(Avaliacao.id_avaliacao),
+                    )
+                    .where(Avaliacao.id_palestra.in_(ids))
+                    .group_by(Avaliacao.id_palestra)
+                ).all()
+            }
 
-@router.get("/avaliacoes-por-palestra")
-def listar_avaliacoes_por_palestra():
-    """Lista todas as avaliações agrupadas por palestra."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        palestras = session.exec(select(Palestra)).all()
         resultado = []
-        for p in palestras:
-            palestrante = session.get(Palestrante, p.id_palestrante)
-            avaliacoes = session.exec(
-                select(Avaliacao).where(Avaliacao.id_palestra == p.id_palestra)
-            ).all()
-            lista_avaliacoes = []
-            for a in avaliacoes:
-                usuario = session.get(Usuario, a.id_usuario)
-                lista_avaliacoes.append({
-                    "id_avaliacao": a.id_avaliacao,
-                    "nome_usuario": usuario.nome if usuario else "Anônimo",
-                    "nota": a.nota,
-                    "comentario": a.comentario,
-                })
-            notas = [a.nota for a in avaliacoes]
-            media = round(sum(notas) / len(notas), 1) if notas else 0
+        for p, nome_palestrante in palestras:
+            media, total = resumos.get(p.id_palestra, (None, 0))
             resultado.append({
                 "id_palestra": p.id_palestra,
                 "titulo": p.titulo,
-                "palestrante": palestrante.nome if palestrante else "N/A",
-                "data": p.data,
-                "media_nota": media,
-                "total_avaliacoes": len(avaliacoes),
-                "avaliacoes": lista_avaliacoes,
+                "palestrante": nome_palestrante or "N/A",
+                "data": formatar_data(p.data),
+                "media_nota": round(float(media), 1) if media is not None else 0,
+                "total_avaliacoes": total,
             })
-        return resultado
+        return montar_pagina(resultado, pag, lambda r: r["id_palestra"])
+
+    return await executar(operacao)
+
+
+@router.get(
+    "/palestras/{id_palestra}/avaliacoes",
+    response_model=Pagina[AvaliacaoDaPalestra],
+    dependencies=[Depends(exigir_usuario), Depends(usar_etag)],
+)
+async def listar_avaliacoes_da_palestra(
+    id_palestra: int,
+    pag: Paginacao = Depends(parametros_paginacao),
+):
+    """Lista os comentários de uma palestra, paginados por cursor."""
+    def operacao(session: Session):
+        linhas = session.exec(
+            paginar(
+                select(Avaliacao, Usuario.nome)
+                .join(Usuario, Avaliacao.id_usuario == Usuario.id_usuario, isouter=True)
+                .where(Avaliacao.id_palestra == id_palestra),
+                Avaliacao.id_avaliacao,
+                pag,
+            )
+        ).all()
+        if not linhas and pag.cursor is None and not session.get(Palestra, id_palestra):
+            raise HTTPException(status_code=404, detail="Palestra não encontrada")
+        resultado = [
+            {
+                "id_avaliacao": a.id_avaliacao,
+                "nome_usuario": nome_usuario or "Anônimo",
+                "nota": a.nota,
+                "comentario": a.comentario,
+            }
+            for a, nome_usuario in linhas
+        ]
+        return montar_pagina(resultado, pag, lambda r: r["id_avaliacao"])
+
+    return await executar(operacao)
 
 
 # ===================== NOTIFICAÇÕES =====================
 
-@router.get("/notificacoes")
-def listar_notificacoes(id_usuario: int):
-    """Lista notificações do usuário."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        notificacoes = session.exec(
-            select(Notificacao).where(Notificacao.id_usuario == id_usuario)
+@router.get(
+    "/notificacoes", response_model=Pagina[NotificacaoItem], dependencies=[Depends(usar_etag)]
+)
+async def listar_notificacoes(
+    usuario: dict = Depends(exigir_usuario),
+    pag: Paginacao = Depends(parametros_paginacao),
+):
+    """Lista notificações do usuário (individuais e enviadas para todos), paginado."""
+    id_usuario, papel = usuario["id_usuario"], usuario["role"]
+    def operacao(session: Session):
+        linhas = session.exec(
+            paginar(
+                select(Notificacao, NotificacaoLeitura.id_usuario)
+                .join(
+                    NotificacaoLeitura,
+                    (NotificacaoLeitura.id_notificacao == Notificacao.id_notificacao)
+                    & (NotificacaoLeitura.id_usuario == id_usuario),
+                    isouter=True,
+                )
+                .where(
+                    (Notificacao.id_usuario == id_usuario)
+                    | recebe_para_todos(id_usuario, papel)
+                ),
+                Notificacao.id_notificacao,
+                pag,
+            )
         ).all()
-        return [
+        resultado = [
             {
                 "id_notificacao": n.id_notificacao,
                 "titulo": n.titulo,
                 "mensagem": n.mensagem,
-                "lida": n.lida,
+                "lida": n.lida if n.id_usuario is not None else leitura is not None,
             }
-            for n in notificacoes
+            for n, leitura in linhas
         ]
-
-
-@router.put("/notificacoes/{id_notificacao}/lida")
-def marcar_notificacao_lida(id_notificacao: int, id_usuario: int):
+        return montar_pagina(resultado, pag, lambda r: r["id_notificacao"])
+
+    return await executar(operacao)
+
+
+@router.get("/notificacoes/nao-lidas", response_model=NaoLidas)
+async def contar_notificacoes_nao_lidas(usuario: dict = Depends(exigir_usuario)):
+    """Quantidade de notificações não lidas (consulta só nos índices)."""
+    return {"nao_lidas": await executar(contar_nao_lidas, usuario["id_usuario"], usuario["role"])}
+
+
+@router.get("/notificacoes/stream")
+async def acompanhar_notificacoes(usuario: dict = Depends(exigir_usuario)):
+    """
+    Server-Sent Events: envia `nao_lidas` ao conectar e um evento
+    `notificacao` para cada notificação nova do usuário (ou para todos).
+    """
+    id_usuario, papel = usuario["id_usuario"], usuario["role"]
+    # O LISTEN já está ativo desde a inicialização; assina antes de contar
+    # para não perder uma notificação criada no meio
+    fila = canal_notificacoes.assinar(id_usuario)
+    try:
+        nao_lidas = await executar(contar_nao_lidas, id_usuario, papel)
+    except BaseException:
+        canal_notificacoes.cancelar(id_usuario, fila)
+        raise
+
+    async def gerar():
+        try:
+            yield evento_sse("nao_lidas", {"nao_lidas": nao_lidas})
+            while True:
+                try:
+                    aviso = await asyncio.wait_for(fila.get(), SSE_KEEPALIVE_SEGUNDOS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if aviso is RESSINCRONIZAR:
+                    nao_lidas_agora = await executar(contar_nao_lidas, id_usuario, papel)
+                    yield evento_sse("nao_lidas", {"nao_lidas": nao_lidas_agora})
+                    continue
+                if recebe_aviso(aviso, id_usuario, papel):
+                    yield evento_sse("notificacao", aviso)
+        finally:
+            canal_notificacoes.cancelar(id_usuario, fila)
+
+    return StreamingResponse(
+        gerar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.put("/notificacoes/lidas", response_model=NotificacoesMarcadas)
+async def marcar_notificacoes_lidas(
+    dados: MarcarLidasRequest | None = None,
+    usuario: dict = Depends(exigir_usuario),
+):
+    """Marca todas (ou as de `ids`) como lidas com um único comando no banco."""
+    ids = dados.ids if dados else None
+    nao_lidas = await executar(marcar_lidas, usuario["id_usuario"], usuario["role"], ids)
+    return {"mensagem": "Notificações marcadas como lidas", "nao_lidas": nao_lidas}
+
+
+@router.put("/notificacoes/{id_notificacao}/lida", response_model=Mensagem)
+async def marcar_notificacao_lida(id_notificacao: int, usuario: dict = Depends(exigir_usuario)):
     """Marca uma notificação como lida."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        notif = session.get(Notificacao, id_notificacao)
-        if not notif or notif.id_usuario != id_usuario:
+    id_usuario, papel = usuario["id_usuario"], usuario["role"]
+    def operacao(session: Session):
+        notif = session.exec(
+            select(Notificacao).where(
+                Notificacao.id_notificacao == id_notificacao,
+                (Notificacao.id_usuario == id_usuario) | recebe_para_todos(id_usuario, papel),
+            )
+        ).first()
+        if not notif:
             raise HTTPException(status_code=404, detail="Notificação não encontrada")
-        notif.lida = True
-        session.add(notif)
+        if notif.id_usuario is None:
+            # Notificação para todos: registra a leitura só deste usuário
+            if not session.get(NotificacaoLeitura, (id_notificacao, id_usuario)):
+                session.add(NotificacaoLeitura(
+                    id_notificacao=id_notificacao,
+                    id_usuario=id_usuario,
+                ))
+        else:
+            notif.lida = True
+            session.add(notif)
         session.commit()
         return {"mensagem": "Notificação marcada como lida"}
 
+    return await executar(operacao)
+
 
 # ===================== PERFIL =====================
 
-@router.get("/perfil")
-def meu_perfil(id_usuario: int):
+@router.get("/perfil", response_model=UsuarioPerfil)
+async def meu_perfil(usuario: dict = Depends(exigir_usuario)):
     """Retorna dados do perfil do usuário."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
+    id_usuario = usuario["id_usuario"]
+    def operacao(session: Session):
         u = session.get(Usuario, id_usuario)
         if not u:
             raise HTTPException(status_code=404, detail="Usuário não encontrado")
@@ -290,74 +732,45 @@ def meu_perfil(id_usuario: int):
             "role": u.role,
         }
 
+    return await executar(operacao)
+
 
 # ===================== MEU CERTIFICADO =====================
 
-@router.get("/meu-certificado")
-def meu_certificado(id_usuario: int):
+@router.get(
+    "/meu-certificado", response_model=Certificado, dependencies=[Depends(usar_etag)]
+)
+async def meu_certificado(usuario: dict = Depends(exigir_usuario)):
     """Retorna certificado do próprio usuário."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        u = session.get(Usuario, id_usuario)
-        if not u:
-            raise HTTPException(status_code=404, detail="Usuário não encontrado")
-
-        presencas = session.exec(
-            select(Presenca).where(Presenca.id_usuario == id_usuario)
-        ).all()
-
-        if not presencas:
-            raise HTTPException(
-                status_code=400,
-                detail="Você não possui presenças registradas",
-            )
-
-        palestras_info = []
-        total_horas = 0.0
-        for p in presencas:
-            palestra = session.get(Palestra, p.id_palestra)
-            if palestra:
-                palestrante = session.get(Palestrante, palestra.id_palestrante)
-                palestras_info.append({
-                    "titulo": palestra.titulo,
-                    "local": palestra.local,
-                    "horario_inicio": palestra.horario_inicio,
-                    "horario_fim": palestra.horario_fim,
-                    "palestrante": palestrante.nome if palestrante else "N/A",
-                })
-                try:
-                    inicio = datetime.strptime(palestra.horario_inicio, "%H:%M")
-                    fim = datetime.strptime(palestra.horario_fim, "%H:%M")
-                    diff = (fim - inicio).seconds / 3600
-                    total_horas += diff
-                except Exception:
-                    pass
-
-        return {
-            "usuario": {
-                "nome": u.nome,
-                "email": u.email,
-                "cpf": u.cpf,
-                "matricula": u.matricula,
-            },
-            "palestras": palestras_info,
-            "total_horas": round(total_horas, 1),
-            "data_emissao": datetime.now().strftime("%d/%m/%Y %H:%M"),
-            "mensagem": (
-                f"Certificamos que {u.nome} participou da Semana da "
-                f"Computação DECSI com carga horária total de {round(total_horas, 1)} horas."
-            ),
-        }
+    id_usuario = usuario["id_usuario"]
+    return await executar(
+        consultar_certificado, id_usuario, "Você não possui presenças registradas"
+    )
+
+
+@router.get("/meu-certificado/pdf")
+async def meu_certificado_pdf(usuario: dict = Depends(exigir_usuario)):
+    """Retorna o certificado do próprio usuário em PDF."""
+    id_usuario = usuario["id_usuario"]
+    certificado = await executar(
+        consultar_certificado, id_usuario, "Você não possui presenças registradas"
+    )
+    caminho = await obter_pdf(id_usuario, certificado)
+    return FileResponse(
+        caminho,
+        media_type="application/pdf",
+        filename="certificado.pdf",
+    )
 
 
 # ===================== GERENCIAR CONTA =====================
 
-@router.put("/alterar-nome")
-def alterar_nome(dados: AlterarNomeRequest):
+@router.put("/alterar-nome", response_model=UsuarioAlterado)
+async def alterar_nome(dados: AlterarNomeRequest, usuario: dict = Depends(exigir_usuario)):
     """Altera o nome do usuário."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        u = session.get(Usuario, dados.id_usuario)
+    id_usuario = usuario["id_usuario"]
+    def operacao(session: Session):
+        u = session.get(Usuario, id_usuario)
         if not u:
             raise HTTPException(status_code=404, detail="Usuário não encontrado")
         if not dados.novo_nome.strip():
@@ -377,22 +790,37 @@ def alterar_nome(dados: AlterarNomeRequest):
             },
         }
 
+    return await executar(operacao)
+
 
-@router.put("/alterar-email")
-def alterar_email(dados: AlterarEmailRequest):
+async def _conferir_senha_atual(id_usuario: int, senha_atual: str) -> None:
+    """Confere a senha atual no pool de hash, fora da sessão do banco."""
+    def buscar_hash(session: Session):
+        u = session.get(Usuario, id_usuario)
+        if not u:
+            raise HTTPException(status_code=404, detail="Usuário não encontrado")
+        return u.senha_hash
+
+    senha_hash = await executar(buscar_hash)
+    if not await verificar_senha_async(senha_atual, senha_hash):
+        raise HTTPException(status_code=400, detail="Senha atual incorreta")
+
+
+@router.put("/alterar-email", response_model=UsuarioAlterado)
+async def alterar_email(dados: AlterarEmailRequest, usuario: dict = Depends(exigir_usuario)):
     """Altera o email do usuário após verificar a senha atual."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        u = session.get(Usuario, dados.id_usuario)
+    id_usuario = usuario["id_usuario"]
+    await _conferir_senha_atual(id_usuario, dados.senha_atual)
+
+    def operacao(session: Session):
+        u = session.get(Usuario, id_usuario)
         if not u:
             raise HTTPException(status_code=404, detail="Usuário não encontrado")
-        if not verificar_senha(dados.senha_atual, u.senha_hash):
-            raise HTTPException(status_code=400, detail="Senha atual incorreta")
         # Verificar se o novo email já está em uso
         existente = session.exec(
             select(Usuario).where(Usuario.email == dados.novo_email)
         ).first()
-        if existente and existente.id_usuario != dados.id_usuario:
+        if existente and existente.id_usuario != id_usuario:
             raise HTTPException(status_code=400, detail="Este email já está em uso")
         u.email = dados.novo_email
         session.add(u)
@@ -409,49 +837,63 @@ def alterar_email(dados: AlterarEmailRequest):
             },
         }
 
+    return await executar(operacao)
 
-@router.put("/alterar-senha")
-def alterar_senha(dados: AlterarSenhaRequest):
+
+@router.put("/alterar-senha", response_model=Mensagem)
+async def alterar_senha(dados: AlterarSenhaRequest, usuario: dict = Depends(exigir_usuario)):
     """Altera a senha do usuário após verificar a senha atual."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        u = session.get(Usuario, dados.id_usuario)
+    id_usuario = usuario["id_usuario"]
+    await _conferir_senha_atual(id_usuario, dados.senha_atual)
+    novo_hash = await hash_senha_async(dados.nova_senha)
+
+    def operacao(session: Session):
+        u = session.get(Usuario, id_usuario)
         if not u:
             raise HTTPException(status_code=404, detail="Usuário não encontrado")
-        if not verificar_senha(dados.senha_atual, u.senha_hash):
-            raise HTTPException(status_code=400, detail="Senha atual incorreta")
-        u.senha_hash = hash_senha(dados.nova_senha)
+        u.senha_hash = novo_hash
         session.add(u)
         session.commit()
         return {"mensagem": "Senha alterada com sucesso!"}
 
+    return await executar(operacao)
 
-@router.delete("/excluir-conta")
-def excluir_conta(dados: ExcluirContaRequest):
+
+@router.delete("/excluir-conta", response_model=Mensagem)
+async def excluir_conta(dados: ExcluirContaRequest, usuario: dict = Depends(exigir_usuario)):
     """Exclui a conta do usuário após verificar a senha atual."""
-    engine = cria_conexao_postgre()
-    with Session(engine) as session:
-        u = session.get(Usuario, dados.id_usuario)
+    id_usuario = usuario["id_usuario"]
+    await _conferir_senha_atual(id_usuario, dados.senha_atual)
+
+    def operacao(session: Session):
+        u = session.get(Usuario, id_usuario)
         if not u:
             raise HTTPException(status_code=404, detail="Usuário não encontrado")
-        if not verificar_senha(dados.senha_atual, u.senha_hash):
-            raise HTTPException(status_code=400, detail="Senha atual incorreta")
         # Remover dados associados
         presencas = session.exec(
-            select(Presenca).where(Presenca.id_usuario == dados.id_usuario)
+            select(Presenca).where(Presenca.id_usuario == id_usuario)
         ).all()
         for p in presencas:
             session.delete(p)
         avaliacoes = session.exec(
-            select(Avaliacao).where(Avaliacao.id_usuario == dados.id_usuario)
+            select(Avaliacao).where(Avaliacao.id_usuario == id_usuario)
         ).all()
         for a in avaliacoes:
             session.delete(a)
         notificacoes = session.exec(
-            select(Notificacao).where(Notificacao.id_usuario == dados.id_usuario)
+            select(Notificacao).where(Notificacao.id_usuario == id_usuario)
         ).all()
         for n in notificacoes:
             session.delete(n)
+        leituras = session.exec(
+            select(NotificacaoLeitura).where(NotificacaoLeitura.id_usuario == id_usuario)
+        ).all()
+        for lt in leituras:
+            session.delete(lt)
         session.delete(u)
         session.commit()
+        cache_tokens.revogar_usuario(id_usuario)
+        remover_pdfs(id_usuario)
         return {"mensagem": "Conta excluída com sucesso"}
+
+    return await executar(operacao)
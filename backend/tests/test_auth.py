@@ -0,0 +1,54 @@
+"""
+Chave de assinatura dos tokens, conferência do usuário no banco e tamanho
+do pool de hash de senha.
+"""
+import os
+import subprocess
+import sys
+import jwt
+import pytest
+from sqlalchemy import text
+import auth_utils
+
+
+@pytest.mark.parametrize("chave", [None, "", "semana-computacao-decsi-secret-2026", "curta"])
+def test_api_nao_sobe_sem_chave_propria(monkeypatch, chave):
+    monkeypatch.setattr(auth_utils, "SECRET_KEY", chave)
+    with pytest.raises(RuntimeError):
+        auth_utils.verificar_segredo()
+
+
+def test_token_assinado_com_a_chave_antiga_e_recusado(cliente):
+    token = jwt.encode(
+        {"sub": "1", "role": "admin", "nome": "Intruso", "exp": 4_102_444_800},
+        "semana-computacao-decsi-secret-2026", algorithm="HS256",
+    )
+    resposta = cliente.get("/admin/administradores", headers={"Authorization": f"Bearer {token}"})
+    assert resposta.status_code == 401
+
+
+def test_token_de_usuario_removido_fora_do_cache(cliente, engine):
+    # Como em outro worker: o token nunca passou por este processo
+    registro = cliente.post(
+        "/auth/registro", json={"nome": "Lia", "email": "lia@auth", "senha": "senha"}
+    ).json()
+    with engine.begin() as conexao:
+        conexao.execute(text("DELETE FROM usuario WHERE id_usuario = :id"),
+                        {"id": registro["usuario"]["id_usuario"]})
+    resposta = cliente.get("/usuario/perfil", headers={"Authorization": f"Bearer {registro['token']}"})
+    assert resposta.status_code == 401
+
+
+CPUS = os.cpu_count() or 1
+
+
+@pytest.mark.parametrize("workers, processos", [("1", CPUS), ("", 1), (str(10 * CPUS), 1)])
+def test_pool_de_hash_divide_as_cpus_entre_os_workers(workers, processos):
+    ambiente = {**os.environ, "WEB_CONCURRENCY": workers}
+    ambiente.pop("HASH_PROCESSOS", None)
+    saida = subprocess.run(
+        [sys.executable, "-c", "import auth_utils; print(auth_utils.HASH_PROCESSOS)"],
+        env=ambiente, cwd=os.path.dirname(auth_utils.__file__),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    assert int(saida) == processos
@@ -0,0 +1,71 @@
+"""
+Renderização do certificado em PDF com textos fora do latin-1, cache em
+disco e tamanho do pool de processos (não usam o banco).
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import certificado_pdf
+from certificado_pdf import obter_pdf, remover_pdfs, renderizar_pdf
+
+
+def certificado_de(nome: str, horas: float) -> dict:
+    return {
+        "usuario": {"nome": nome, "email": "ana@ufop", "cpf": None, "matricula": None},
+        "palestras": [],
+        "total_horas": horas,
+        "data_emissao": "20/10/2026 18:00",
+        "mensagem": f"Certificamos que {nome} participou.",
+    }
+
+
+def test_cache_guarda_so_a_versao_atual_de_cada_usuario(tmp_path, monkeypatch):
+    monkeypatch.setattr(certificado_pdf, "DIRETORIO_CACHE", tmp_path)
+
+    async def cenario():
+        try:
+            primeiro = await obter_pdf(1, certificado_de("Ana", 1.0))
+            outro_usuario = await obter_pdf(2, certificado_de("Bia", 1.0))
+            # Nova presença: o PDF anterior da Ana é substituído
+            atual = await obter_pdf(1, certificado_de("Ana", 2.5))
+            return primeiro, outro_usuario, atual
+        finally:
+            certificado_pdf.encerrar_pool()
+
+    primeiro, outro_usuario, atual = asyncio.run(cenario())
+    assert atual != primeiro
+    assert sorted(tmp_path.iterdir()) == sorted([outro_usuario, atual])
+    remover_pdfs(1)
+    assert list(tmp_path.iterdir()) == [outro_usuario]
+
+
+def test_renderiza_textos_fora_do_latin1():
+    certificado = {
+        "usuario": {"nome": "Zoë D’Ávila", "email": "zoe@ufop", "cpf": None, "matricula": "20261234"},
+        "palestras": [{
+            "titulo": "IA — “do zero” à produção",
+            "local": "Auditório Ω",
+            "horario_inicio": "14:00",
+            "horario_fim": "15:30",
+            "palestrante": "Łukasz Ørsted",
+        }],
+        "total_horas": 1.5,
+        "data_emissao": "20/10/2026 18:00",
+        "mensagem": "Certificamos que Zoë D’Ávila participou com carga horária total de 1.5 horas.",
+    }
+    pdf = renderizar_pdf(certificado)
+    assert pdf.startswith(b"%PDF")
+    assert b"DejaVuSans" in pdf
+
+
+def test_pool_de_pdf_divide_as_cpus_entre_os_workers():
+    cpus = os.cpu_count() or 1
+    ambiente = {**os.environ, "WEB_CONCURRENCY": str(cpus)}
+    ambiente.pop("PDF_PROCESSOS", None)
+    saida = subprocess.run(
+        [sys.executable, "-c", "import certificado_pdf; print(certificado_pdf.PDF_PROCESSOS)"],
+        env=ambiente, cwd=os.path.dirname(certificado_pdf.__file__),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    assert int(saida) == 1
@@ -0,0 +1,89 @@
+"""
+Check-in: erros de usuário e palestra inexistentes (pela constraint violada,
+independe do texto da mensagem do driver), check-ins offline e o buffer de
+group commit.
+"""
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture(scope="module")
+def id_palestra(cliente, admin):
+    id_palestrante = cliente.post(
+        "/admin/palestrantes", headers=admin, json={"nome": "Gil", "formacao": "Sistemas"}
+    ).json()["id_palestrante"]
+    return cliente.post("/admin/palestras", headers=admin, json={
+        "titulo": "Sistemas distribuídos",
+        "data": "2026-10-23",
+        "horario_inicio": "09:00",
+        "horario_fim": "10:00",
+        "local": "Sala 3",
+        "id_palestrante": id_palestrante,
+    }).json()["id_palestra"]
+
+
+def test_checkin_de_usuario_inexistente(cliente, engine, id_palestra):
+    registro = cliente.post(
+        "/auth/registro", json={"nome": "Hugo", "email": "hugo@checkin", "senha": "senha"}
+    ).json()
+    cabecalhos = {"Authorization": f"Bearer {registro['token']}"}
+    assert cliente.get("/usuario/perfil", headers=cabecalhos).status_code == 200
+    # Usuário apagado depois de o token entrar no cache (sem passar pela API)
+    with engine.begin() as conexao:
+        conexao.execute(text("DELETE FROM usuario WHERE id_usuario = :id"),
+                        {"id": registro["usuario"]["id_usuario"]})
+    resposta = cliente.post("/usuario/checkin", headers=cabecalhos, json={"id_palestra": id_palestra})
+    assert resposta.status_code == 404
+    assert resposta.json()["detail"] == "Usuário não encontrado"
+
+
+def test_checkin_em_palestra_inexistente(cliente):
+    registro = cliente.post(
+        "/auth/registro", json={"nome": "Iris", "email": "iris@checkin", "senha": "senha"}
+    ).json()
+    cabecalhos = {"Authorization": f"Bearer {registro['token']}"}
+    resposta = cliente.post("/usuario/checkin", headers=cabecalhos, json={"id_palestra": 999_999})
+    assert resposta.status_code == 404
+    assert resposta.json()["detail"] == "Palestra não encontrada"
+
+
+def test_checkin_offline_sem_fuso_e_do_fuso_do_evento(cliente, admin, engine, id_palestra):
+    registro = cliente.post(
+        "/auth/registro", json={"nome": "Joana", "email": "joana@checkin", "senha": "senha"}
+    ).json()
+    id_usuario = registro["usuario"]["id_usuario"]
+    resposta = cliente.post("/usuario/checkin/lote", headers=admin, json={"checkins": [
+        # Como o app envia: DateTime.toIso8601String() sem fuso, hora local do leitor
+        {"id_usuario": id_usuario, "id_palestra": id_palestra, "horario_checkin": "2026-10-23T09:05:00"},
+    ]})
+    assert resposta.json()["criados"] == 1
+    with engine.connect() as conexao:
+        horario = conexao.execute(text(
+            "SELECT to_char(horario_checkin AT TIME ZONE 'UTC', 'HH24:MI') FROM presenca"
+            " WHERE id_usuario = :id"
+        ), {"id": id_usuario}).scalar()
+    assert horario == "12:05"  # America/Sao_Paulo é UTC-3
+
+
+def test_encerrar_grava_o_lote_pendente(cliente, id_palestra):
+    from checkins import BufferCheckin
+
+    registro = cliente.post(
+        "/auth/registro", json={"nome": "Kaio", "email": "kaio@checkin", "senha": "senha"}
+    ).json()
+
+    async def cenario():
+        # Janela longa: sem o encerrar, o lote só seria gravado depois de 1 min
+        buffer = BufferCheckin(janela_ms=60_000)
+        envio = asyncio.ensure_future(buffer.enviar(
+            registro["usuario"]["id_usuario"], id_palestra, datetime.now(timezone.utc)
+        ))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(buffer.encerrar(), timeout=5)
+        return envio.result(), buffer.metricas()["na_fila"]
+
+    (status, id_presenca), na_fila = asyncio.run(cenario())
+    assert status == "criado" and id_presenca is not None
+    assert na_fila == 0
@@ -0,0 +1,121 @@
+"""
+Regressão de N+1: a quantidade de comandos SQL de cada rota não pode crescer
+com os dados.
+
+Cada rota é chamada duas vezes, com uma massa pequena e depois com uma massa
+maior (mais palestras, presenças, avaliações e notificações do mesmo usuário).
+O teste falha se a quantidade mudar entre as duas chamadas ou passar do
+orçamento da rota, mostrando os comandos executados.
+"""
+from collections import Counter
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+
+# Comandos SQL esperados por rota (máximo)
+ORCAMENTOS = {
+    "/usuario/palestras": 1,
+    "/usuario/palestras?local=Sala Consultas": 1,
+    "/usuario/checkins": 1,
+    "/usuario/avaliacoes": 1,
+    "/usuario/avaliacoes-por-palestra": 2,
+    "/usuario/palestras/{id_palestra}/avaliacoes": 1,
+    "/usuario/notificacoes": 1,
+    "/usuario/notificacoes/nao-lidas": 1,
+    "/usuario/meu-certificado": 2,
+    "/usuario/perfil": 1,
+    "/admin/certificado/{id_usuario}": 2,
+    "/admin/palestrantes": 1,
+    "/admin/usuarios": 1,
+    "/admin/administradores": 1,
+}
+
+# Quantas palestras (com presença, avaliação e notificação) cada massa tem
+TAMANHOS = (2, 8)
+
+
+@contextmanager
+def capturar_comandos(engine):
+    """Guarda o SQL de cada comando enviado ao banco."""
+    comandos = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        comandos.append(" ".join(statement.split()))
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        yield comandos
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+
+def _descrever(comandos: list[str]) -> str:
+    """Comandos agrupados, os repetidos primeiro."""
+    return "\n".join(f"  {n}x {sql[:300]}" for sql, n in Counter(comandos).most_common())
+
+
+@pytest.fixture(scope="module")
+def comandos_por_rota(cliente, admin, engine):
+    """{rota: [comandos com a massa pequena, comandos com a massa grande]}."""
+    from cache_utils import cronograma_cache
+
+    registro = cliente.post(
+        "/auth/registro", json={"nome": "Nina", "email": "nina@consultas", "senha": "senha"}
+    ).json()
+    usuario = {"Authorization": f"Bearer {registro['token']}"}
+    outro = cliente.post(
+        "/auth/registro", json={"nome": "Otto", "email": "otto@consultas", "senha": "senha"}
+    ).json()
+    outro = {"Authorization": f"Bearer {outro['token']}"}
+    valores = {"id_usuario": registro["usuario"]["id_usuario"]}
+    medidas = {rota: [] for rota in ORCAMENTOS}
+    criadas = 0
+
+    for tamanho in TAMANHOS:
+        for i in range(criadas, tamanho):
+            id_palestrante = cliente.post(
+                "/admin/palestrantes", headers=admin, json={"nome": f"Palestrante {i}", "formacao": "Computação"}
+            ).json()["id_palestrante"]
+            id_palestra = cliente.post("/admin/palestras", headers=admin, json={
+                "titulo": f"Palestra {i}",
+                "data": "2026-10-22",
+                "horario_inicio": f"{8 + i:02d}:00",
+                "horario_fim": f"{8 + i:02d}:50",
+                "local": "Sala Consultas",
+                "id_palestrante": id_palestrante,
+            }).json()["id_palestra"]
+            for cabecalhos in (usuario, outro):
+                cliente.post("/usuario/checkin", headers=cabecalhos, json={"id_palestra": id_palestra})
+                cliente.post("/usuario/avaliar", headers=cabecalhos, json={
+                    "id_palestra": id_palestra, "nota": 4, "comentario": "Boa",
+                })
+            cliente.post("/admin/notificacoes", headers=admin, json={
+                "titulo": "Lembrete", "mensagem": f"Palestra {i}", "id_usuario": valores["id_usuario"],
+            })
+            valores["id_palestra"] = id_palestra
+        criadas = tamanho
+
+        for rota in ORCAMENTOS:
+            # O cronograma sem filtros vem do cache; limpa para medir a consulta
+            cronograma_cache.invalidar()
+            cabecalhos = admin if rota.startswith("/admin") else usuario
+            with capturar_comandos(engine) as comandos:
+                resposta = cliente.get(rota.format(**valores), headers=cabecalhos)
+            assert resposta.status_code == 200, (rota, resposta.text)
+            # Resposta vazia não mede nada: a rota tem que ver a massa criada
+            corpo = resposta.json()
+            assert corpo.get("itens", corpo) if isinstance(corpo, dict) else corpo, (rota, corpo)
+            medidas[rota].append(comandos)
+    return medidas
+
+
+@pytest.mark.parametrize("rota", list(ORCAMENTOS))
+def test_comandos_nao_crescem_com_os_dados(comandos_por_rota, rota):
+    pequena, grande = comandos_por_rota[rota]
+    assert len(grande) == len(pequena), (
+        f"{rota}: {len(pequena)} comandos com {TAMANHOS[0]} palestras e "
+        f"{len(grande)} com {TAMANHOS[1]} (N+1?)\n{_descrever(grande)}"
+    )
+    assert len(grande) <= ORCAMENTOS[rota], (
+        f"{rota}: {len(grande)} comandos, orçamento {ORCAMENTOS[rota]}\n{_descrever(grande)}"
+    )
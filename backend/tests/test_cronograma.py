@@ -0,0 +1,44 @@
+"""
+Filtros do cronograma com palestra que termina depois da meia-noite
+(horario_fim < horario_inicio conta até o dia seguinte).
+"""
+from datetime import datetime
+import pytest
+import rotas.usuario
+
+
+@pytest.fixture(scope="module")
+def madrugada(cliente, admin):
+    id_palestrante = cliente.post(
+        "/admin/palestrantes", headers=admin, json={"nome": "Noa", "formacao": "Jogos"}
+    ).json()["id_palestrante"]
+    cliente.post("/admin/palestras", headers=admin, json={
+        "titulo": "Game jam",
+        "data": "2026-10-24",
+        "horario_inicio": "23:00",
+        "horario_fim": "01:00",
+        "local": "Sala Madrugada",
+        "id_palestrante": id_palestrante,
+    })
+    return {"local": "Sala Madrugada"}
+
+
+@pytest.mark.parametrize("agora, acontecendo", [
+    (datetime(2026, 10, 24, 22, 59), False),
+    (datetime(2026, 10, 24, 23, 30), True),
+    (datetime(2026, 10, 25, 0, 30), True),
+    (datetime(2026, 10, 25, 1, 0), False),
+    (datetime(2026, 10, 25, 23, 30), False),
+])
+def test_modo_agora_depois_da_meia_noite(cliente, madrugada, monkeypatch, agora, acontecendo):
+    monkeypatch.setattr(rotas.usuario, "agora_no_evento", lambda: agora)
+    palestras = cliente.get("/usuario/palestras", params={**madrugada, "modo": "agora"}).json()
+    assert [p["titulo"] for p in palestras] == (["Game jam"] if acontecendo else [])
+
+
+def test_horario_de_inclui_palestra_que_vira_o_dia(cliente, madrugada):
+    palestras = cliente.get(
+        "/usuario/palestras", params={**madrugada, "data": "24/10/2026", "horario_de": "23:30"}
+    ).json()
+    assert [p["titulo"] for p in palestras] == ["Game jam"]
+    assert palestras[0]["duracao_minutos"] == 120
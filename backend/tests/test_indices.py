@@ -0,0 +1,137 @@
+"""
+Confere, pelo EXPLAIN, que as consultas das rotas mais usadas encontram os
+índices criados pelas migrações.
+
+As consultas são capturadas durante chamadas reais às rotas e explicadas com
+enable_seqscan desligado: com poucas linhas o planejador sempre prefere o
+scan sequencial, então o que se verifica é que existe um índice utilizável
+para cada uma delas.
+"""
+import json
+import re
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture(scope="module")
+def dados(cliente, admin):
+    id_palestrante = cliente.post(
+        "/admin/palestrantes", headers=admin, json={"nome": "Ana", "formacao": "Computação"}
+    ).json()["id_palestrante"]
+    id_palestra = cliente.post("/admin/palestras", headers=admin, json={
+        "titulo": "Bancos de dados",
+        "descricao": "Índices",
+        "data": "2026-10-20",
+        "horario_inicio": "10:00",
+        "horario_fim": "11:00",
+        "local": "Auditório",
+        "id_palestrante": id_palestrante,
+    }).json()["id_palestra"]
+    registro = cliente.post(
+        "/auth/registro", json={"nome": "Bia", "email": "bia@indices", "senha": "senha"}
+    ).json()
+    usuario = {"Authorization": f"Bearer {registro['token']}"}
+    cliente.post("/usuario/checkin", headers=usuario, json={"id_palestra": id_palestra})
+    cliente.post("/usuario/avaliar", headers=usuario, json={"id_palestra": id_palestra, "nota": 5})
+    return {"usuario": usuario, "id_palestra": id_palestra, "id_palestrante": id_palestrante}
+
+
+@contextmanager
+def capturar_consultas(engine):
+    """Guarda (sql, parâmetros) de cada comando enviado ao banco."""
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        yield consultas
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+
+def _indices_do_plano(plano) -> set[str]:
+    indices = set()
+    if isinstance(plano, dict):
+        if "Index Name" in plano:
+            indices.add(plano["Index Name"])
+        for valor in plano.values():
+            indices |= _indices_do_plano(valor)
+    elif isinstance(plano, list):
+        for item in plano:
+            indices |= _indices_do_plano(item)
+    return indices
+
+
+def indices_usados(engine, consultas, tabela: str) -> set[str]:
+    """Índices que aparecem no EXPLAIN das consultas SELECT sobre a tabela."""
+    referencia = re.compile(rf"\b(FROM|JOIN)\s+{tabela}\b", re.IGNORECASE)
+    conexao = engine.raw_connection()
+    try:
+        cursor = conexao.cursor()
+        cursor.execute("SET enable_seqscan = off")
+        indices = set()
+        for sql, parametros in consultas:
+            if sql.lstrip().upper().startswith("SELECT") and referencia.search(sql):
+                cursor.execute("EXPLAIN (FORMAT JSON) " + sql, parametros)
+                plano = cursor.fetchone()[0]
+                indices |= _indices_do_plano(plano if isinstance(plano, list) else json.loads(plano))
+        conexao.rollback()
+        return indices
+    finally:
+        conexao.close()
+
+
+@pytest.mark.parametrize(
+    ("rota", "tabela", "indice"),
+    [
+        ("/usuario/checkins", "presenca", "uq_presenca_usuario_palestra"),
+        ("/usuario/avaliacoes-por-palestra", "avaliacao", "ix_avaliacao_palestra"),
+        ("/usuario/palestras/{id_palestra}/avaliacoes", "avaliacao", "ix_avaliacao_palestra"),
+        ("/usuario/notificacoes", "notificacao", "ix_notificacao_usuario_lida"),
+        ("/usuario/notificacoes/nao-lidas", "notificacao", "ix_notificacao_usuario_lida"),
+        ("/usuario/notificacoes/nao-lidas", "notificacao_leitura", "ix_notificacao_leitura_usuario"),
+        ("/usuario/palestras?data=20/10/2026", "palestra", "ix_palestra_data_inicio"),
+        ("/usuario/palestras?modo=proximas", "palestra", "ix_palestra_data_inicio"),
+        ("/usuario/palestras?local=Auditório", "palestra", "ix_palestra_local"),
+        ("/usuario/palestras?id_palestrante={id_palestrante}", "palestra", "ix_palestra_palestrante"),
+    ],
+)
+def test_rota_usa_indice(cliente, engine, dados, rota, tabela, indice):
+    with capturar_consultas(engine) as consultas:
+        resposta = cliente.get(rota.format(**dados), headers=dados["usuario"])
+    assert resposta.status_code == 200
+    assert indice in indices_usados(engine, consultas, tabela)
+
+
+def test_remocao_de_palestrante_usa_indice(engine, dados):
+    # Ao remover um palestrante, o PostgreSQL verifica a FK procurando
+    # palestras dele; sem índice em palestra(id_palestrante) isso é um scan
+    consultas = [(
+        "SELECT 1 FROM palestra WHERE id_palestrante = %(id)s",
+        {"id": dados["id_palestrante"]},
+    )]
+    assert "ix_palestra_palestrante" in indices_usados(engine, consultas, "palestra")
+
+
+def test_migracoes_sao_idempotentes(engine):
+    from migracoes import aplicar_migracoes, listar_migracoes
+
+    assert aplicar_migracoes(engine) == []
+    with engine.connect() as conexao:
+        versoes = conexao.exec_driver_sql("SELECT versao FROM schema_migracao ORDER BY versao").scalars().all()
+    assert versoes == [versao for versao, _, _ in listar_migracoes()]
+
+
+def test_busca_de_usuarios_usa_indice(cliente, engine, admin):
+    for nome, email in [("Bruna Prado", "bruna@busca"), ("Bruno_X", "outro@busca"), ("Carla", "bru@busca")]:
+        cliente.post("/auth/registro", json={"nome": nome, "email": email, "senha": "senha"})
+    with capturar_consultas(engine) as consultas:
+        resposta = cliente.get("/admin/usuarios", headers=admin, params={"busca": "Bru"})
+    assert sorted(u["nome"] for u in resposta.json()["itens"]) == ["Bruna Prado", "Bruno_X", "Carla"]
+    assert {"ix_usuario_nome_busca", "ix_usuario_email_busca"} <= indices_usados(engine, consultas, "usuario")
+    # "_" é literal, não curinga do LIKE
+    resposta = cliente.get("/admin/usuarios", headers=admin, params={"busca": "bruno_"})
+    assert [u["nome"] for u in resposta.json()["itens"]] == ["Bruno_X"]
@@ -0,0 +1,186 @@
+"""
+Migrações sobre um banco criado antes delas (esquema do antigo init.sql),
+em um schema separado do usado pelos outros testes.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+
+# Esquema do database/init.sql anterior às migrações
+ESQUEMA_LEGADO = """
+CREATE TABLE usuario (
+    id_usuario SERIAL PRIMARY KEY,
+    nome VARCHAR(255) NOT NULL,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    senha_hash VARCHAR(255) NOT NULL,
+    role VARCHAR(20) NOT NULL DEFAULT 'user',
+    cpf VARCHAR(20),
+    matricula VARCHAR(50)
+);
+CREATE TABLE palestrante (
+    id_palestrante SERIAL PRIMARY KEY,
+    nome TEXT,
+    formacao TEXT
+);
+CREATE TABLE palestra (
+    id_palestra SERIAL PRIMARY KEY,
+    titulo TEXT,
+    descricao TEXT,
+    data TEXT,
+    horario_inicio VARCHAR(10) NOT NULL,
+    horario_fim VARCHAR(10) NOT NULL,
+    local TEXT,
+    id_palestrante INT NOT NULL REFERENCES palestrante (id_palestrante)
+);
+CREATE TABLE presenca (
+    id_presenca SERIAL PRIMARY KEY,
+    id_usuario INT,
+    id_palestra INT,
+    horario_checkin FLOAT,
+    CONSTRAINT fk_usuario_presenca FOREIGN KEY (id_usuario) REFERENCES usuario (id_usuario),
+    CONSTRAINT fk_palestra_presenca FOREIGN KEY (id_palestra) REFERENCES palestra (id_palestra)
+);
+CREATE TABLE avaliacao (
+    id_avaliacao SERIAL PRIMARY KEY,
+    id_usuario INT NOT NULL REFERENCES usuario (id_usuario) ON DELETE CASCADE,
+    id_palestra INT NOT NULL REFERENCES palestra (id_palestra) ON DELETE CASCADE,
+    nota INT CHECK (nota >= 1 AND nota <= 5),
+    comentario TEXT,
+    UNIQUE (id_usuario, id_palestra)
+);
+CREATE TABLE notificacao (
+    id_notificacao SERIAL PRIMARY KEY,
+    id_usuario INT REFERENCES usuario (id_usuario) ON DELETE CASCADE,
+    titulo VARCHAR(255) NOT NULL,
+    mensagem TEXT NOT NULL,
+    lida BOOLEAN DEFAULT FALSE
+);
+"""
+
+
+@pytest.fixture
+def legado(engine):
+    """Engine apontada (search_path) para um schema com o esquema antigo."""
+    from dados_banco import DATABASE_URL
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexao:
+        conexao.execute(text("DROP SCHEMA IF EXISTS legado CASCADE"))
+        conexao.execute(text("CREATE SCHEMA legado"))
+    engine_legado = create_engine(DATABASE_URL, connect_args={"options": "-c search_path=legado"})
+    with engine_legado.begin() as conexao:
+        conexao.exec_driver_sql(ESQUEMA_LEGADO)
+        conexao.execute(text("""
+            INSERT INTO usuario (nome, email, senha_hash) VALUES ('Ana', 'ana@legado', 'x');
+            INSERT INTO palestrante (nome) VALUES ('Bia');
+        """))
+    yield engine_legado
+    engine_legado.dispose()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexao:
+        conexao.execute(text("DROP SCHEMA legado CASCADE"))
+
+
+def test_migracoes_removem_checkins_repetidos(legado):
+    from migracoes import aplicar_migracoes
+
+    with legado.begin() as conexao:
+        conexao.execute(text("""
+            INSERT INTO palestra (titulo, data, horario_inicio, horario_fim, id_palestrante)
+            VALUES ('Redes', '20/10/2026', '14:00', '15:00', 1);
+            -- Mesmo QR code lido duas vezes ao mesmo tempo
+            INSERT INTO presenca (id_usuario, id_palestra, horario_checkin)
+            VALUES (1, 1, 1792508400), (1, 1, 1792508401), (1, 1, 1792508402);
+        """))
+
+    aplicar_migracoes(legado)
+
+    with legado.connect() as conexao:
+        presencas = conexao.execute(text("SELECT id_presenca FROM presenca")).scalars().all()
+        assert presencas == [1]
+        indice = conexao.execute(text(
+            "SELECT indisunique FROM pg_index WHERE indexrelid = 'uq_presenca_usuario_palestra'::regclass"
+        )).scalar()
+    assert indice is True
+
+
+def test_migracoes_aceitam_datas_e_horarios_invalidos(legado):
+    from migracoes import aplicar_migracoes
+
+    # (data, início, fim) como o app antigo gravava, inclusive lixo que
+    # passa no formato mas não é data/horário
+    palestras = [
+        ("20/10/2026", "14:00", "15:30"),
+        ("2026-10-21", "9:05", "10:00"),
+        ("31/02/2026", "25:00", "11:00"),
+        ("2026-13-01", "9:75", "24:61"),
+        ("00/01/2026", "08:00", "abc"),
+        ("amanhã", "", ""),
+    ]
+    with legado.begin() as conexao:
+        for data, inicio, fim in palestras:
+            conexao.execute(text(
+                "INSERT INTO palestra (titulo, data, horario_inicio, horario_fim, id_palestrante)"
+                " VALUES ('P', :data, :inicio, :fim, 1)"
+            ), {"data": data, "inicio": inicio, "fim": fim})
+
+    aplicar_migracoes(legado)
+
+    with legado.connect() as conexao:
+        linhas = conexao.execute(text(
+            "SELECT data::text, to_char(horario_inicio, 'HH24:MI'), to_char(horario_fim, 'HH24:MI')"
+            " FROM palestra ORDER BY id_palestra"
+        )).all()
+    assert [tuple(l) for l in linhas] == [
+        ("2026-10-20", "14:00", "15:30"),
+        ("2026-10-21", "09:05", "10:00"),
+        (None, "11:00", "11:00"),
+        (None, "00:00", "00:00"),
+        (None, "08:00", "08:00"),
+        (None, "00:00", "00:00"),
+    ]
+
+
+def test_espera_do_lock_de_migracoes_nao_trava_indice_concorrente(engine):
+    # python migracoes.py rodando enquanto um worker da API migra: a espera
+    # pelo lock não pode segurar o CREATE INDEX CONCURRENTLY do worker
+    import threading
+    import time
+    from migracoes import CHAVE_LOCK_MIGRACOES, aplicar_migracoes
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as worker:
+        worker.execute(text("CREATE TABLE IF NOT EXISTS teste_lock (valor INT)"))
+        worker.execute(text("SELECT pg_advisory_lock(:chave)"), {"chave": CHAVE_LOCK_MIGRACOES})
+        erros = []
+
+        def migrar():
+            try:
+                aplicar_migracoes(engine)
+            except Exception as erro:
+                erros.append(erro)
+
+        manual = threading.Thread(target=migrar)
+        manual.start()
+        time.sleep(0.5)  # o outro processo já está esperando o lock
+        try:
+            worker.execute(text("SET statement_timeout = '5s'"))
+            worker.execute(text("CREATE INDEX CONCURRENTLY ix_teste_lock ON teste_lock (valor)"))
+        finally:
+            worker.execute(text("SELECT pg_advisory_unlock(:chave)"), {"chave": CHAVE_LOCK_MIGRACOES})
+            manual.join(10)
+            worker.execute(text("DROP TABLE teste_lock"))
+    assert not manual.is_alive()
+    # Com pg_advisory_lock bloqueado, o PostgreSQL acusa deadlock nesta espera
+    assert erros == []
+
+
+def test_avisos_para_todos_antigos_valem_para_quem_ja_existe(legado):
+    from migracoes import aplicar_migracoes
+
+    with legado.begin() as conexao:
+        conexao.execute(text(
+            "INSERT INTO notificacao (id_usuario, titulo, mensagem) VALUES (NULL, 'Aviso', 'm')"
+        ))
+
+    aplicar_migracoes(legado)
+
+    with legado.connect() as conexao:
+        ate = conexao.execute(text("SELECT ate_id_usuario FROM notificacao")).scalar()
+    assert ate == 1
@@ -0,0 +1,90 @@
+"""
+Destinatários das notificações para todos; canal de notificações: LISTEN
+ativo antes do primeiro cliente e ressincronização depois de a conexão de
+LISTEN cair.
+"""
+import asyncio
+import json
+from sqlalchemy import text
+from notificacoes import CANAL_PG, RESSINCRONIZAR, CanalNotificacoes
+
+
+def registrar(cliente, nome):
+    registro = cliente.post(
+        "/auth/registro", json={"nome": nome, "email": f"{nome.lower()}@notificacoes", "senha": "senha"}
+    ).json()
+    return {"Authorization": f"Bearer {registro['token']}"}
+
+
+def titulos(cliente, cabecalhos):
+    return [n["titulo"] for n in cliente.get("/usuario/notificacoes", headers=cabecalhos).json()["itens"]]
+
+
+def test_aviso_para_todos_so_vale_para_participantes_ja_cadastrados(cliente, admin):
+    antes = registrar(cliente, "Otto")
+    cliente.post("/admin/notificacoes", headers=admin, json={"titulo": "Boas-vindas", "mensagem": "m"})
+    depois = registrar(cliente, "Pietra")
+
+    assert "Boas-vindas" in titulos(cliente, antes)
+    assert "Boas-vindas" not in titulos(cliente, depois)
+    assert "Boas-vindas" not in titulos(cliente, admin)
+    assert cliente.get("/usuario/notificacoes/nao-lidas", headers=depois).json()["nao_lidas"] == 0
+    assert cliente.get("/usuario/notificacoes/nao-lidas", headers=admin).json()["nao_lidas"] == 0
+
+    id_aviso = cliente.get("/usuario/notificacoes", headers=antes).json()["itens"][-1]["id_notificacao"]
+    resposta = cliente.put(f"/usuario/notificacoes/{id_aviso}/lida", headers=depois)
+    assert resposta.status_code == 404
+    # Marcar todas não registra leitura de avisos que não são do usuário
+    assert cliente.put("/usuario/notificacoes/lidas", headers=depois).json()["nao_lidas"] == 0
+    assert cliente.put("/usuario/notificacoes/lidas", headers=antes).json()["nao_lidas"] == 0
+
+
+def notificar(engine, id_usuario):
+    with engine.begin() as conexao:
+        conexao.execute(text("SELECT pg_notify(:canal, :payload)"), {
+            "canal": CANAL_PG,
+            "payload": json.dumps({"id_notificacao": 1, "id_usuario": id_usuario,
+                                   "titulo": "t", "mensagem": "m"}),
+        })
+
+
+def test_aviso_logo_apos_assinar_chega(engine):
+    async def cenario():
+        canal = CanalNotificacoes()
+        await canal.iniciar()
+        try:
+            fila = canal.assinar(7)
+            # Sem esperar nada: o LISTEN já estava ativo antes do assinar
+            notificar(engine, 7)
+            return await asyncio.wait_for(fila.get(), timeout=5)
+        finally:
+            await canal.encerrar()
+
+    assert asyncio.run(cenario())["id_usuario"] == 7
+
+
+def test_reconexao_do_listen_pede_ressincronizacao(engine):
+    async def cenario():
+        canal = CanalNotificacoes()
+        await canal.iniciar()
+        try:
+            fila = canal.assinar(8)
+            with engine.begin() as conexao:
+                conexao.execute(text(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity"
+                    " WHERE query LIKE 'LISTEN%' AND pid <> pg_backend_pid()"
+                ))
+            return await asyncio.wait_for(fila.get(), timeout=10)
+        finally:
+            await canal.encerrar()
+
+    assert asyncio.run(cenario()) is RESSINCRONIZAR
+
+
+def test_aviso_em_tempo_real_segue_os_mesmos_destinatarios():
+    from notificacoes import recebe_aviso
+
+    aviso = {"id_notificacao": 9, "id_usuario": None, "ate_id_usuario": 10}
+    assert recebe_aviso(aviso, 10, "user")
+    assert not recebe_aviso(aviso, 11, "user")
+    assert not recebe_aviso(aviso, 1, "admin")
@@ -0,0 +1,32 @@
+"""
+Roteamento das leituras para a réplica (DB_REPLICA_URL), com uma "réplica"
+que não responde: o que for lido dela falha.
+"""
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+
+
+@pytest.fixture
+def replica_fora_do_ar(monkeypatch, cliente):
+    import dados_banco
+
+    url = make_url(dados_banco.DATABASE_URL).set(database="replica_inexistente")
+    monkeypatch.setattr(dados_banco, "DATABASE_REPLICA_URL", url.render_as_string(hide_password=False))
+    monkeypatch.setattr(dados_banco, "engine_leitura", None)
+    yield
+    if dados_banco.engine_leitura is not None:
+        dados_banco.engine_leitura.dispose()
+
+
+def test_get_le_da_replica(replica_fora_do_ar, cliente):
+    with pytest.raises(OperationalError):
+        cliente.get("/usuario/palestras?local=Auditório")
+
+
+def test_snapshot_do_cronograma_vem_do_primario(replica_fora_do_ar, cliente):
+    from cache_utils import cronograma_cache
+
+    # Como logo depois de um admin alterar palestras
+    cronograma_cache.invalidar()
+    assert cliente.get("/usuario/palestras").status_code == 200
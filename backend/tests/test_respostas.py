@@ -0,0 +1,80 @@
+"""
+GET condicional (ETag / If-None-Match) das rotas com Depends(usar_etag) e
+compressão das respostas grandes, Server-Timing e /metrics.
+"""
+import re
+import pytest
+
+
+@pytest.fixture(scope="module")
+def usuario(cliente):
+    registro = cliente.post(
+        "/auth/registro", json={"nome": "Caio", "email": "caio@respostas", "senha": "senha"}
+    ).json()
+    return registro["usuario"]["id_usuario"], {"Authorization": f"Bearer {registro['token']}"}
+
+
+def test_etag_responde_304_ate_o_conteudo_mudar(cliente, admin, usuario):
+    id_usuario, cabecalhos = usuario
+    primeira = cliente.get("/usuario/notificacoes", headers=cabecalhos)
+    etag = primeira.headers["ETag"]
+    assert primeira.status_code == 200
+    assert primeira.headers["Cache-Control"] == "private, no-cache"
+
+    repetida = cliente.get("/usuario/notificacoes", headers={**cabecalhos, "If-None-Match": etag})
+    assert repetida.status_code == 304
+    assert repetida.content == b""
+    assert repetida.headers["ETag"] == etag
+
+    cliente.post("/admin/notificacoes", headers=admin, json={
+        "titulo": "Aviso", "mensagem": "Sala alterada", "id_usuario": id_usuario,
+    })
+    alterada = cliente.get("/usuario/notificacoes", headers={**cabecalhos, "If-None-Match": etag})
+    assert alterada.status_code == 200
+    assert alterada.headers["ETag"] != etag
+    assert alterada.json()["itens"][-1]["titulo"] == "Aviso"
+
+
+def test_rota_sem_etag_nao_e_condicional(cliente, usuario):
+    _, cabecalhos = usuario
+    assert "ETag" not in cliente.get("/usuario/perfil", headers=cabecalhos).headers
+
+
+def test_respostas_grandes_vao_comprimidas(cliente, admin, usuario):
+    _, cabecalhos = usuario
+    id_palestrante = cliente.post(
+        "/admin/palestrantes", headers=admin, json={"nome": "Duda", "formacao": "Redes"}
+    ).json()["id_palestrante"]
+    cliente.post("/admin/palestras", headers=admin, json={
+        "titulo": "Redes móveis",
+        "descricao": "Cobertura 4G no campus. " * 100,
+        "data": "2026-10-21",
+        "horario_inicio": "14:00",
+        "horario_fim": "15:00",
+        "local": "Sala 10",
+        "id_palestrante": id_palestrante,
+    })
+    grande = cliente.get("/usuario/palestras", headers={"Accept-Encoding": "gzip"})
+    assert grande.headers["Content-Encoding"] == "gzip"
+    assert grande.num_bytes_downloaded < len(grande.content)
+
+    pequena = cliente.get(
+        "/usuario/notificacoes/nao-lidas", headers={**cabecalhos, "Accept-Encoding": "gzip"}
+    )
+    assert "Content-Encoding" not in pequena.headers
+
+
+def test_server_timing_e_metricas_por_rota(cliente, usuario):
+    _, cabecalhos = usuario
+    resposta = cliente.get("/usuario/notificacoes/nao-lidas", headers=cabecalhos)
+    db = re.search(r'db;dur=[\d.]+;desc="(\d+) consultas"', resposta.headers["Server-Timing"])
+    assert db and int(db.group(1)) >= 1
+    assert "app;dur=" in resposta.headers["Server-Timing"]
+
+    metricas = cliente.get("/metrics")
+    assert metricas.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert re.search(
+        r'^api_requisicoes_total\{metodo="GET",rota="/usuario/notificacoes/nao-lidas",status="200"\} [1-9]',
+        metricas.text, re.M,
+    )
+    assert 'api_consultas_sql_total{metodo="GET",rota="/usuario/notificacoes/nao-lidas"}' in metricas.text
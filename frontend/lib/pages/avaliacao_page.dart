@@ -10,6 +10,7 @@ class AvaliacaoPage extends StatefulWidget {
 
 class _AvaliacaoPageState extends State<AvaliacaoPage> {
   List<dynamic> _checkins = [];
+  int? _proximoCursor;
   int? _palestraSelecionada;
   int _nota = 3;
   final _comentarioController = TextEditingController();
@@ -25,8 +26,11 @@ class _AvaliacaoPageState extends State<AvaliacaoPage> {
   Future<void> _carregarCheckins() async {
     setState(() => _carregando = true);
     try {
-      final checkins = await ApiService.listarMeusCheckins();
-      setState(() => _checkins = checkins);
+      final pagina = await ApiService.listarMeusCheckins();
+      setState(() {
+        _checkins = pagina['itens'];
+        _proximoCursor = pagina['proximo_cursor'];
+      });
     } catch (e) {
       if (mounted) {
         ScaffoldMessenger.of(context).showSnackBar(
@@ -38,6 +42,23 @@ class _AvaliacaoPageState extends State<AvaliacaoPage> {
     }
   }
 
+  Future<void> _carregarMais() async {
+    try {
+      final pagina =
+          await ApiService.listarMeusCheckins(cursor: _proximoCursor);
+      setState(() {
+        _checkins = [..._checkins, ...pagina['itens']];
+        _proximoCursor = pagina['proximo_cursor'];
+      });
+    } catch (e) {
+      if (mounted) {
+        ScaffoldMessenger.of(context).showSnackBar(
+          SnackBar(content: Text('$e'), backgroundColor: Colors.red),
+        );
+      }
+    }
+  }
+
   Future<void> _avaliar() async {
     if (_palestraSelecionada == null) {
       ScaffoldMessenger.of(context).showSnackBar(
@@ -138,6 +159,11 @@ class _AvaliacaoPageState extends State<AvaliacaoPage> {
                       onChanged: (v) =>
                           setState(() => _palestraSelecionada = v),
                     ),
+                    if (_proximoCursor != null)
+                      TextButton(
+                        onPressed: _carregarMais,
+                        child: const Text('Carregar mais palestras'),
+                      ),
                     const SizedBox(height: 24),
                     const Text(
                       'Nota:',
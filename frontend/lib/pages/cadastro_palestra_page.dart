@@ -18,6 +18,7 @@ class _CadastroPalestraPageState extends State<CadastroPalestraPage> {
   bool _loading = false;
 
   List<dynamic> _palestrantes = [];
+  int? _proximoCursor;
   int? _palestranteSelecionado;
 
   @override
@@ -26,10 +27,20 @@ class _CadastroPalestraPageState extends State<CadastroPalestraPage> {
     _carregarPalestrantes();
   }
 
-  Future<void> _carregarPalestrantes() async {
+  /// Primeira página da lista ou, com [mais], a página seguinte.
+  Future<void> _carregarPalestrantes({bool mais = false}) async {
     try {
-      final lista = await ApiService.listarPalestrantes();
-      setState(() => _palestrantes = lista);
+      final pagina = await ApiService.listarPalestrantes(
+        cursor: mais ? _proximoCursor : null,
+      );
+      setState(() {
+        if (!mais) {
+          _palestrantes = [];
+          _palestranteSelecionado = null;
+        }
+        _palestrantes = [..._palestrantes, ...pagina['itens']];
+        _proximoCursor = pagina['proximo_cursor'];
+      });
     } catch (e) {
       if (mounted) {
         ScaffoldMessenger.of(context).showSnackBar(
@@ -235,6 +246,12 @@ class _CadastroPalestraPageState extends State<CadastroPalestraPage> {
                 icon: const Icon(Icons.refresh),
                 label: const Text('Atualizar lista de palestrantes'),
               ),
+              if (_proximoCursor != null)
+                TextButton.icon(
+                  onPressed: () => _carregarPalestrantes(mais: true),
+                  icon: const Icon(Icons.expand_more),
+                  label: const Text('Carregar mais palestrantes'),
+                ),
               const SizedBox(height: 16),
               SizedBox(
                 height: 50,
@@ -3,6 +3,7 @@ import 'package:pdf/pdf.dart';
 import 'package:pdf/widgets.dart' as pw;
 import 'package:printing/printing.dart';
 import '../services/api_service.dart';
+import '../widgets/seletor_usuario.dart';
 
 class CertificadoPage extends StatefulWidget {
   const CertificadoPage({super.key});
@@ -12,33 +13,11 @@ class CertificadoPage extends StatefulWidget {
 }
 
 class _CertificadoPageState extends State<CertificadoPage> {
-  List<dynamic> _usuarios = [];
   int? _usuarioSelecionado;
   Map<String, dynamic>? _certificado;
   bool _loading = false;
   bool _buscando = false;
 
-  @override
-  void initState() {
-    super.initState();
-    _carregarUsuarios();
-  }
-
-  Future<void> _carregarUsuarios() async {
-    try {
-      final usuarios = await ApiService.listarUsuarios();
-      setState(() => _usuarios = usuarios);
-    } catch (e) {
-      if (mounted) {
-        ScaffoldMessenger.of(context).showSnackBar(
-          SnackBar(
-              content: Text('Erro ao carregar usuários: $e'),
-              backgroundColor: Colors.red),
-        );
-      }
-    }
-  }
-
   Future<void> _emitirCertificado() async {
     if (_usuarioSelecionado == null) {
       ScaffoldMessenger.of(context).showSnackBar(
@@ -219,20 +198,10 @@ class _CertificadoPageState extends State<CertificadoPage> {
               style: TextStyle(fontSize: 16, color: Colors.grey),
             ),
             const SizedBox(height: 24),
-            DropdownButtonFormField<int>(
-              value: _usuarioSelecionado,
-              decoration: const InputDecoration(
-                labelText: 'Selecione o Participante',
-                prefixIcon: Icon(Icons.person),
-                border: OutlineInputBorder(),
-              ),
-              items: _usuarios.map<DropdownMenuItem<int>>((u) {
-                return DropdownMenuItem<int>(
-                  value: u['id_usuario'],
-                  child: Text('${u['nome']} (${u['matricula'] ?? u['email']})'),
-                );
-              }).toList(),
-              onChanged: (v) => setState(() {
+            SeletorUsuario(
+              rotulo: 'Selecione o Participante',
+              descricao: (u) => '${u['nome']} (${u['matricula'] ?? u['email']})',
+              onSelecionado: (v) => setState(() {
                 _usuarioSelecionado = v;
                 _certificado = null;
               }),
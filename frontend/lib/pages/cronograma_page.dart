@@ -11,6 +11,7 @@ class CronogramaPage extends StatefulWidget {
 class _CronogramaPageState extends State<CronogramaPage> {
   List<dynamic> _palestras = [];
   bool _loading = true;
+  String? _modo; // null = todas, 'agora' ou 'proximas'
 
   @override
   void initState() {
@@ -21,7 +22,7 @@ class _CronogramaPageState extends State<CronogramaPage> {
   Future<void> _carregarPalestras() async {
     setState(() => _loading = true);
     try {
-      final palestras = await ApiService.listarPalestrasPublicas();
+      final palestras = await ApiService.listarPalestrasPublicas(modo: _modo);
       setState(() => _palestras = palestras);
     } catch (e) {
       if (mounted) {
@@ -34,6 +35,33 @@ class _CronogramaPageState extends State<CronogramaPage> {
     }
   }
 
+  void _selecionarModo(String? modo) {
+    setState(() => _modo = modo);
+    _carregarPalestras();
+  }
+
+  Widget _filtros() {
+    const opcoes = {
+      null: 'Todas',
+      'agora': 'Acontecendo agora',
+      'proximas': 'Próximas',
+    };
+    return Padding(
+      padding: const EdgeInsets.fromLTRB(16, 12, 16, 0),
+      child: Wrap(
+        spacing: 8,
+        children: [
+          for (final opcao in opcoes.entries)
+            ChoiceChip(
+              label: Text(opcao.value),
+              selected: _modo == opcao.key,
+              onSelected: (_) => _selecionarModo(opcao.key),
+            ),
+        ],
+      ),
+    );
+  }
+
   @override
   Widget build(BuildContext context) {
     return Scaffold(
@@ -47,92 +75,102 @@ class _CronogramaPageState extends State<CronogramaPage> {
           ),
         ],
       ),
-      body: _loading
-          ? const Center(child: CircularProgressIndicator())
-          : _palestras.isEmpty
-              ? const Center(
-                  child: Text(
-                    'Nenhuma palestra cadastrada ainda.',
-                    style: TextStyle(fontSize: 16, color: Colors.grey),
-                  ),
-                )
-              : ListView.builder(
-                  padding: const EdgeInsets.all(16),
-                  itemCount: _palestras.length,
-                  itemBuilder: (context, index) {
-                    final p = _palestras[index];
-                    return Card(
-                      margin: const EdgeInsets.only(bottom: 12),
-                      elevation: 2,
-                      shape: RoundedRectangleBorder(
-                        borderRadius: BorderRadius.circular(12),
-                      ),
-                      child: Padding(
+      body: Column(
+        children: [
+          _filtros(),
+          Expanded(
+            child: _loading
+                ? const Center(child: CircularProgressIndicator())
+                : _palestras.isEmpty
+                    ? Center(
+                        child: Text(
+                          _modo == null
+                              ? 'Nenhuma palestra cadastrada ainda.'
+                              : 'Nenhuma palestra encontrada.',
+                          style: const TextStyle(
+                              fontSize: 16, color: Colors.grey),
+                        ),
+                      )
+                    : ListView.builder(
                         padding: const EdgeInsets.all(16),
-                        child: Column(
-                          crossAxisAlignment: CrossAxisAlignment.start,
-                          children: [
-                            Text(
-                              p['titulo'] ?? '',
-                              style: const TextStyle(
-                                fontSize: 18,
-                                fontWeight: FontWeight.bold,
-                                color: Colors.deepPurple,
-                              ),
+                        itemCount: _palestras.length,
+                        itemBuilder: (context, index) {
+                          final p = _palestras[index];
+                          return Card(
+                            margin: const EdgeInsets.only(bottom: 12),
+                            elevation: 2,
+                            shape: RoundedRectangleBorder(
+                              borderRadius: BorderRadius.circular(12),
                             ),
-                            const SizedBox(height: 8),
-                            if (p['descricao'] != null &&
-                                p['descricao'].toString().isNotEmpty)
-                              Padding(
-                                padding: const EdgeInsets.only(bottom: 8),
-                                child: Text(
-                                  p['descricao'],
-                                  style: const TextStyle(
-                                      fontSize: 14, color: Colors.black87),
-                                ),
+                            child: Padding(
+                              padding: const EdgeInsets.all(16),
+                              child: Column(
+                                crossAxisAlignment: CrossAxisAlignment.start,
+                                children: [
+                                  Text(
+                                    p['titulo'] ?? '',
+                                    style: const TextStyle(
+                                      fontSize: 18,
+                                      fontWeight: FontWeight.bold,
+                                      color: Colors.deepPurple,
+                                    ),
+                                  ),
+                                  const SizedBox(height: 8),
+                                  if (p['descricao'] != null &&
+                                      p['descricao'].toString().isNotEmpty)
+                                    Padding(
+                                      padding: const EdgeInsets.only(bottom: 8),
+                                      child: Text(
+                                        p['descricao'],
+                                        style: const TextStyle(
+                                            fontSize: 14, color: Colors.black87),
+                                      ),
+                                    ),
+                                  Row(
+                                    children: [
+                                      const Icon(Icons.calendar_today,
+                                          size: 16, color: Colors.grey),
+                                      const SizedBox(width: 4),
+                                      Text(p['data'] ?? 'N/A'),
+                                      const SizedBox(width: 16),
+                                      const Icon(Icons.access_time,
+                                          size: 16, color: Colors.grey),
+                                      const SizedBox(width: 4),
+                                      Text(
+                                          '${p['horario_inicio']} - ${p['horario_fim']}'),
+                                    ],
+                                  ),
+                                  const SizedBox(height: 4),
+                                  Row(
+                                    children: [
+                                      const Icon(Icons.location_on,
+                                          size: 16, color: Colors.grey),
+                                      const SizedBox(width: 4),
+                                      Text(p['local'] ?? 'N/A'),
+                                    ],
+                                  ),
+                                  const SizedBox(height: 4),
+                                  Row(
+                                    children: [
+                                      const Icon(Icons.person,
+                                          size: 16, color: Colors.grey),
+                                      const SizedBox(width: 4),
+                                      Text(
+                                        p['palestrante'] ?? 'N/A',
+                                        style: const TextStyle(
+                                            fontStyle: FontStyle.italic),
+                                      ),
+                                    ],
+                                  ),
+                                ],
                               ),
-                            Row(
-                              children: [
-                                const Icon(Icons.calendar_today,
-                                    size: 16, color: Colors.grey),
-                                const SizedBox(width: 4),
-                                Text(p['data'] ?? 'N/A'),
-                                const SizedBox(width: 16),
-                                const Icon(Icons.access_time,
-                                    size: 16, color: Colors.grey),
-                                const SizedBox(width: 4),
-                                Text(
-                                    '${p['horario_inicio']} - ${p['horario_fim']}'),
-                              ],
-                            ),
-                            const SizedBox(height: 4),
-                            Row(
-                              children: [
-                                const Icon(Icons.location_on,
-                                    size: 16, color: Colors.grey),
-                                const SizedBox(width: 4),
-                                Text(p['local'] ?? 'N/A'),
-                              ],
-                            ),
-                            const SizedBox(height: 4),
-                            Row(
-                              children: [
-                                const Icon(Icons.person,
-                                    size: 16, color: Colors.grey),
-                                const SizedBox(width: 4),
-                                Text(
-                                  p['palestrante'] ?? 'N/A',
-                                  style: const TextStyle(
-                                      fontStyle: FontStyle.italic),
-                                ),
-                              ],
                             ),
-                          ],
-                        ),
+                          );
+                        },
                       ),
-                    );
-                  },
-                ),
+          ),
+        ],
+      ),
     );
   }
 }
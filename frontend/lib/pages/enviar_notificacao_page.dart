@@ -1,5 +1,6 @@
 import 'package:flutter/material.dart';
 import '../services/api_service.dart';
+import '../widgets/seletor_usuario.dart';
 
 class EnviarNotificacaoPage extends StatefulWidget {
   const EnviarNotificacaoPage({super.key});
@@ -14,21 +15,9 @@ class _EnviarNotificacaoPageState extends State<EnviarNotificacaoPage> {
   bool _loading = false;
   bool _paraTodos = true;
 
-  List<dynamic> _usuarios = [];
   int? _usuarioSelecionado;
-
-  @override
-  void initState() {
-    super.initState();
-    _carregarUsuarios();
-  }
-
-  Future<void> _carregarUsuarios() async {
-    try {
-      final usuarios = await ApiService.listarUsuarios();
-      setState(() => _usuarios = usuarios);
-    } catch (_) {}
-  }
+  // Trocado a cada envio para limpar o campo de busca
+  int _envios = 0;
 
   Future<void> _enviar() async {
     if (_tituloController.text.trim().isEmpty ||
@@ -67,7 +56,10 @@ class _EnviarNotificacaoPageState extends State<EnviarNotificacaoPage> {
         );
         _tituloController.clear();
         _mensagemController.clear();
-        setState(() => _usuarioSelecionado = null);
+        setState(() {
+          _usuarioSelecionado = null;
+          _envios++;
+        });
       }
     } catch (e) {
       if (mounted) {
@@ -136,20 +128,11 @@ class _EnviarNotificacaoPageState extends State<EnviarNotificacaoPage> {
             ),
             if (!_paraTodos) ...[
               const SizedBox(height: 8),
-              DropdownButtonFormField<int>(
-                value: _usuarioSelecionado,
-                decoration: const InputDecoration(
-                  labelText: 'Selecionar Usuário',
-                  prefixIcon: Icon(Icons.person),
-                  border: OutlineInputBorder(),
-                ),
-                items: _usuarios.map<DropdownMenuItem<int>>((u) {
-                  return DropdownMenuItem<int>(
-                    value: u['id_usuario'],
-                    child: Text('${u['nome']} (${u['email']})'),
-                  );
-                }).toList(),
-                onChanged: (v) => setState(() => _usuarioSelecionado = v),
+              SeletorUsuario(
+                key: ValueKey(_envios),
+                rotulo: 'Selecionar Usuário',
+                descricao: (u) => '${u['nome']} (${u['email']})',
+                onSelecionado: (v) => setState(() => _usuarioSelecionado = v),
               ),
             ],
             const SizedBox(height: 24),
@@ -10,6 +10,7 @@ class GerenciarAdminsPage extends StatefulWidget {
 
 class _GerenciarAdminsPageState extends State<GerenciarAdminsPage> {
   List<dynamic> _admins = [];
+  int? _proximoCursor;
   bool _loading = true;
 
   final _nomeController = TextEditingController();
@@ -26,8 +27,11 @@ class _GerenciarAdminsPageState extends State<GerenciarAdminsPage> {
   Future<void> _carregarAdmins() async {
     setState(() => _loading = true);
     try {
-      final admins = await ApiService.listarAdmins();
-      setState(() => _admins = admins);
+      final pagina = await ApiService.listarAdmins();
+      setState(() {
+        _admins = pagina['itens'];
+        _proximoCursor = pagina['proximo_cursor'];
+      });
     } catch (e) {
       if (mounted) {
         ScaffoldMessenger.of(context).showSnackBar(
@@ -39,6 +43,22 @@ class _GerenciarAdminsPageState extends State<GerenciarAdminsPage> {
     }
   }
 
+  Future<void> _carregarMais() async {
+    try {
+      final pagina = await ApiService.listarAdmins(cursor: _proximoCursor);
+      setState(() {
+        _admins = [..._admins, ...pagina['itens']];
+        _proximoCursor = pagina['proximo_cursor'];
+      });
+    } catch (e) {
+      if (mounted) {
+        ScaffoldMessenger.of(context).showSnackBar(
+          SnackBar(content: Text('$e'), backgroundColor: Colors.red),
+        );
+      }
+    }
+  }
+
   Future<void> _criarAdmin() async {
     if (_nomeController.text.trim().isEmpty ||
         _emailController.text.trim().isEmpty ||
@@ -254,6 +274,11 @@ class _GerenciarAdminsPageState extends State<GerenciarAdminsPage> {
                   ),
                 );
               })),
+            if (!_loading && _proximoCursor != null)
+              TextButton(
+                onPressed: _carregarMais,
+                child: const Text('Carregar mais'),
+              ),
           ],
         ),
       ),
@@ -10,6 +10,7 @@ class NotificacoesPage extends StatefulWidget {
 
 class _NotificacoesPageState extends State<NotificacoesPage> {
   List<dynamic> _notificacoes = [];
+  int? _proximoCursor;
   bool _loading = true;
 
   @override
@@ -21,8 +22,11 @@ class _NotificacoesPageState extends State<NotificacoesPage> {
   Future<void> _carregarNotificacoes() async {
     setState(() => _loading = true);
     try {
-      final notificacoes = await ApiService.listarNotificacoes();
-      setState(() => _notificacoes = notificacoes);
+      final pagina = await ApiService.listarNotificacoes();
+      setState(() {
+        _notificacoes = pagina['itens'];
+        _proximoCursor = pagina['proximo_cursor'];
+      });
     } catch (e) {
       if (mounted) {
         ScaffoldMessenger.of(context).showSnackBar(
@@ -34,6 +38,23 @@ class _NotificacoesPageState extends State<NotificacoesPage> {
     }
   }
 
+  Future<void> _carregarMais() async {
+    try {
+      final pagina =
+          await ApiService.listarNotificacoes(cursor: _proximoCursor);
+      setState(() {
+        _notificacoes = [..._notificacoes, ...pagina['itens']];
+        _proximoCursor = pagina['proximo_cursor'];
+      });
+    } catch (e) {
+      if (mounted) {
+        ScaffoldMessenger.of(context).showSnackBar(
+          SnackBar(content: Text('$e'), backgroundColor: Colors.red),
+        );
+      }
+    }
+  }
+
   Future<void> _marcarComoLida(int idNotificacao, int index) async {
     try {
       await ApiService.marcarNotificacaoLida(idNotificacao);
@@ -49,6 +70,23 @@ class _NotificacoesPageState extends State<NotificacoesPage> {
     }
   }
 
+  Future<void> _marcarTodasComoLidas() async {
+    try {
+      await ApiService.marcarTodasLidas();
+      setState(() {
+        for (final n in _notificacoes) {
+          n['lida'] = true;
+        }
+      });
+    } catch (e) {
+      if (mounted) {
+        ScaffoldMessenger.of(context).showSnackBar(
+          SnackBar(content: Text('$e'), backgroundColor: Colors.red),
+        );
+      }
+    }
+  }
+
   @override
   Widget build(BuildContext context) {
     return Scaffold(
@@ -56,6 +94,11 @@ class _NotificacoesPageState extends State<NotificacoesPage> {
         title: const Text('Notificações'),
         backgroundColor: Theme.of(context).colorScheme.inversePrimary,
         actions: [
+          IconButton(
+            icon: const Icon(Icons.done_all),
+            tooltip: 'Marcar todas como lidas',
+            onPressed: _marcarTodasComoLidas,
+          ),
           IconButton(
             icon: const Icon(Icons.refresh),
             onPressed: _carregarNotificacoes,
@@ -81,8 +124,15 @@ class _NotificacoesPageState extends State<NotificacoesPage> {
                 )
               : ListView.builder(
                   padding: const EdgeInsets.all(16),
-                  itemCount: _notificacoes.length,
+                  itemCount:
+                      _notificacoes.length + (_proximoCursor != null ? 1 : 0),
                   itemBuilder: (context, index) {
+                    if (index == _notificacoes.length) {
+                      return TextButton(
+                        onPressed: _carregarMais,
+                        child: const Text('Carregar mais'),
+                      );
+                    }
                     final n = _notificacoes[index];
                     final lida = n['lida'] == true;
                     return Card(
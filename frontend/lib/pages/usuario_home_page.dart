@@ -1,3 +1,4 @@
+import 'dart:async';
 import 'package:flutter/material.dart';
 import '../services/api_service.dart';
 import 'login_page.dart';
@@ -19,27 +20,53 @@ class UsuarioHomePage extends StatefulWidget {
 class _UsuarioHomePageState extends State<UsuarioHomePage> {
   String _nomeUsuario = 'Usuário';
   int _notificacoesNaoLidas = 0;
+  StreamSubscription<Map<String, dynamic>>? _avisos;
 
   @override
   void initState() {
     super.initState();
     _carregarDados();
+    _escutarNotificacoes();
+  }
+
+  @override
+  void dispose() {
+    _avisos?.cancel();
+    super.dispose();
   }
 
   Future<void> _carregarDados() async {
     try {
       final usuario = await ApiService.getUsuario();
-      final notificacoes = await ApiService.listarNotificacoes();
+      final naoLidas = await ApiService.contarNaoLidas();
       if (mounted) {
         setState(() {
           _nomeUsuario = usuario?['nome'] ?? 'Usuário';
-          _notificacoesNaoLidas =
-              notificacoes.where((n) => n['lida'] == false).length;
+          _notificacoesNaoLidas = naoLidas;
         });
       }
     } catch (_) {}
   }
 
+  /// Atualiza o contador quando o servidor avisa de notificações novas.
+  /// O stream reconecta sozinho; só termina se o token for recusado.
+  void _escutarNotificacoes() {
+    _avisos = ApiService.escutarNotificacoes().listen(
+      (aviso) {
+        if (!mounted) return;
+        setState(() {
+          if (aviso['evento'] == 'nao_lidas') {
+            _notificacoesNaoLidas = aviso['dados']['nao_lidas'];
+          } else if (aviso['evento'] == 'notificacao') {
+            _notificacoesNaoLidas++;
+          }
+        });
+      },
+      onError: (_) {},
+      cancelOnError: true,
+    );
+  }
+
   void _logout() async {
     await ApiService.logout();
     if (mounted) {
@@ -10,6 +10,9 @@ class VerAvaliacoesPage extends StatefulWidget {
 
 class _VerAvaliacoesPageState extends State<VerAvaliacoesPage> {
   List<dynamic> _palestras = [];
+  int? _proximaPagina;
+  final Map<int, List<dynamic>> _avaliacoes = {};
+  final Map<int, int?> _proximoCursor = {};
   bool _loading = true;
 
   @override
@@ -21,8 +24,13 @@ class _VerAvaliacoesPageState extends State<VerAvaliacoesPage> {
   Future<void> _carregarAvaliacoes() async {
     setState(() => _loading = true);
     try {
-      final data = await ApiService.listarAvaliacoesPorPalestra();
-      setState(() => _palestras = data);
+      final pagina = await ApiService.listarAvaliacoesPorPalestra();
+      setState(() {
+        _palestras = pagina['itens'];
+        _proximaPagina = pagina['proximo_cursor'];
+        _avaliacoes.clear();
+        _proximoCursor.clear();
+      });
     } catch (e) {
       if (mounted) {
         ScaffoldMessenger.of(context).showSnackBar(
@@ -34,6 +42,43 @@ class _VerAvaliacoesPageState extends State<VerAvaliacoesPage> {
     }
   }
 
+  Future<void> _carregarMaisPalestras() async {
+    try {
+      final pagina = await ApiService.listarAvaliacoesPorPalestra(
+        cursor: _proximaPagina,
+      );
+      setState(() {
+        _palestras = [..._palestras, ...pagina['itens']];
+        _proximaPagina = pagina['proximo_cursor'];
+      });
+    } catch (e) {
+      if (mounted) {
+        ScaffoldMessenger.of(context).showSnackBar(
+          SnackBar(content: Text('$e'), backgroundColor: Colors.red),
+        );
+      }
+    }
+  }
+
+  Future<void> _carregarComentarios(int idPalestra) async {
+    try {
+      final pagina = await ApiService.listarAvaliacoesDaPalestra(
+        idPalestra,
+        cursor: _proximoCursor[idPalestra],
+      );
+      setState(() {
+        _avaliacoes.putIfAbsent(idPalestra, () => []).addAll(pagina['itens']);
+        _proximoCursor[idPalestra] = pagina['proximo_cursor'];
+      });
+    } catch (e) {
+      if (mounted) {
+        ScaffoldMessenger.of(context).showSnackBar(
+          SnackBar(content: Text('$e'), backgroundColor: Colors.red),
+        );
+      }
+    }
+  }
+
   Widget _buildEstrelas(num nota) {
     return Row(
       mainAxisSize: MainAxisSize.min,
@@ -79,11 +124,18 @@ class _VerAvaliacoesPageState extends State<VerAvaliacoesPage> {
                   onRefresh: _carregarAvaliacoes,
                   child: ListView.builder(
                     padding: const EdgeInsets.all(16),
-                    itemCount: _palestras.length,
+                    itemCount:
+                        _palestras.length + (_proximaPagina != null ? 1 : 0),
                     itemBuilder: (context, index) {
+                      if (index == _palestras.length) {
+                        return TextButton(
+                          onPressed: _carregarMaisPalestras,
+                          child: const Text('Carregar mais palestras'),
+                        );
+                      }
                       final palestra = _palestras[index];
-                      final avaliacoes =
-                          palestra['avaliacoes'] as List<dynamic>;
+                      final idPalestra = palestra['id_palestra'] as int;
+                      final avaliacoes = _avaliacoes[idPalestra] ?? [];
                       final media = palestra['media_nota'] ?? 0;
                       final total = palestra['total_avaliacoes'] ?? 0;
 
@@ -94,6 +146,13 @@ class _VerAvaliacoesPageState extends State<VerAvaliacoesPage> {
                           borderRadius: BorderRadius.circular(12),
                         ),
                         child: ExpansionTile(
+                          onExpansionChanged: (aberto) {
+                            if (aberto &&
+                                total > 0 &&
+                                !_avaliacoes.containsKey(idPalestra)) {
+                              _carregarComentarios(idPalestra);
+                            }
+                          },
                           leading: CircleAvatar(
                             backgroundColor: total > 0
                                 ? Colors.amber.shade100
@@ -152,7 +211,7 @@ class _VerAvaliacoesPageState extends State<VerAvaliacoesPage> {
                             ],
                           ),
                           children: [
-                            if (avaliacoes.isEmpty)
+                            if (total == 0)
                               const Padding(
                                 padding: EdgeInsets.all(16),
                                 child: Text(
@@ -205,6 +264,12 @@ class _VerAvaliacoesPageState extends State<VerAvaliacoesPage> {
                                   ),
                                 );
                               }),
+                            if (_proximoCursor[idPalestra] != null)
+                              TextButton(
+                                onPressed: () =>
+                                    _carregarComentarios(idPalestra),
+                                child: const Text('Carregar mais'),
+                              ),
                             const SizedBox(height: 8),
                           ],
                         ),
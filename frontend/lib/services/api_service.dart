@@ -30,9 +30,74 @@ class ApiService {
     return usuario?['id_usuario'];
   }
 
+  static Future<void> salvarToken(String token) async {
+    final prefs = await SharedPreferences.getInstance();
+    await prefs.setString('token', token);
+  }
+
+  /// Cabeçalhos com o token JWT do usuário logado.
+  static Future<Map<String, String>> _authHeaders() async {
+    final prefs = await SharedPreferences.getInstance();
+    final token = prefs.getString('token');
+    return {
+      ..._headers,
+      if (token != null) 'Authorization': 'Bearer $token',
+    };
+  }
+
+  /// Última resposta (ETag + corpo) de cada GET condicional, por URL e token.
+  static final Map<String, (String, List<int>)> _respostasEtag = {};
+
+  /// GET que envia o ETag da última resposta (If-None-Match). Se o servidor
+  /// responder 304, devolve o corpo guardado sem baixá-lo de novo.
+  static Future<http.Response> _getCondicional(
+      Uri url, Map<String, String> headers) async {
+    final chave = '${headers['Authorization']} $url';
+    final anterior = _respostasEtag[chave];
+    final response = await http.get(url, headers: {
+      ...headers,
+      if (anterior != null) 'If-None-Match': anterior.$1,
+    });
+    if (response.statusCode == 304 && anterior != null) {
+      return http.Response.bytes(anterior.$2, 200, headers: {
+        'content-type': 'application/json; charset=utf-8',
+      });
+    }
+    final etag = response.headers['etag'];
+    if (response.statusCode == 200 && etag != null) {
+      _respostasEtag[chave] = (etag, response.bodyBytes);
+    }
+    return response;
+  }
+
+  /// Uma página de uma rota paginada: `itens` + `proximo_cursor` (null na
+  /// última). As telas pedem a próxima só quando o usuário quer ver mais.
+  static Future<Map<String, dynamic>> _listarPagina(
+    String rota,
+    String mensagemErro, {
+    int? cursor,
+    Map<String, String> parametros = const {},
+  }) async {
+    final consulta = {
+      ...parametros,
+      if (cursor != null) 'cursor': '$cursor',
+    };
+    final response = await _getCondicional(
+      Uri.parse('$baseUrl$rota')
+          .replace(queryParameters: consulta.isEmpty ? null : consulta),
+      await _authHeaders(),
+    );
+    if (response.statusCode != 200) {
+      throw Exception(mensagemErro);
+    }
+    return jsonDecode(response.body);
+  }
+
   static Future<void> logout() async {
     final prefs = await SharedPreferences.getInstance();
     await prefs.remove('usuario');
+    await prefs.remove('token');
+    _respostasEtag.clear();
   }
 
   // ===================== AUTH =====================
@@ -58,6 +123,7 @@ class ApiService {
     if (response.statusCode == 200) {
       final data = jsonDecode(response.body);
       await salvarUsuario(data['usuario']);
+      await salvarToken(data['token']);
       return data;
     } else {
       throw Exception(
@@ -77,6 +143,7 @@ class ApiService {
     if (response.statusCode == 200) {
       final data = jsonDecode(response.body);
       await salvarUsuario(data['usuario']);
+      await salvarToken(data['token']);
       return data;
     } else {
       throw Exception(
@@ -92,7 +159,7 @@ class ApiService {
   }) async {
     final response = await http.post(
       Uri.parse('$baseUrl/admin/palestrantes'),
-      headers: _headers,
+      headers: await _authHeaders(),
       body: jsonEncode({'nome': nome, 'formacao': formacao}),
     );
     if (response.statusCode == 200) {
@@ -103,16 +170,9 @@ class ApiService {
     }
   }
 
-  static Future<List<dynamic>> listarPalestrantes() async {
-    final response = await http.get(
-      Uri.parse('$baseUrl/admin/palestrantes'),
-      headers: _headers,
-    );
-    if (response.statusCode == 200) {
-      return jsonDecode(response.body);
-    } else {
-      throw Exception('Erro ao listar palestrantes');
-    }
+  static Future<Map<String, dynamic>> listarPalestrantes({int? cursor}) async {
+    return _listarPagina('/admin/palestrantes', 'Erro ao listar palestrantes',
+        cursor: cursor);
   }
 
   // ===================== ADMIN - PALESTRA =====================
@@ -128,7 +188,7 @@ class ApiService {
   }) async {
     final response = await http.post(
       Uri.parse('$baseUrl/admin/palestras'),
-      headers: _headers,
+      headers: await _authHeaders(),
       body: jsonEncode({
         'titulo': titulo,
         'descricao': descricao,
@@ -150,9 +210,9 @@ class ApiService {
   // ===================== ADMIN - CERTIFICADO =====================
 
   static Future<Map<String, dynamic>> emitirCertificado(int idUsuario) async {
-    final response = await http.get(
+    final response = await _getCondicional(
       Uri.parse('$baseUrl/admin/certificado/$idUsuario'),
-      headers: _headers,
+      await _authHeaders(),
     );
     if (response.statusCode == 200) {
       return jsonDecode(response.body);
@@ -171,7 +231,7 @@ class ApiService {
   }) async {
     final response = await http.post(
       Uri.parse('$baseUrl/admin/administradores'),
-      headers: _headers,
+      headers: await _authHeaders(),
       body: jsonEncode({'nome': nome, 'email': email, 'senha': senha}),
     );
     if (response.statusCode == 200) {
@@ -182,22 +242,15 @@ class ApiService {
     }
   }
 
-  static Future<List<dynamic>> listarAdmins() async {
-    final response = await http.get(
-      Uri.parse('$baseUrl/admin/administradores'),
-      headers: _headers,
-    );
-    if (response.statusCode == 200) {
-      return jsonDecode(response.body);
-    } else {
-      throw Exception('Erro ao listar admins');
-    }
+  static Future<Map<String, dynamic>> listarAdmins({int? cursor}) async {
+    return _listarPagina('/admin/administradores', 'Erro ao listar admins',
+        cursor: cursor);
   }
 
   static Future<void> removerAdmin(int idUsuario) async {
     final response = await http.delete(
       Uri.parse('$baseUrl/admin/administradores/$idUsuario'),
-      headers: _headers,
+      headers: await _authHeaders(),
     );
     if (response.statusCode != 200) {
       throw Exception(
@@ -207,16 +260,13 @@ class ApiService {
 
   // ===================== ADMIN - LISTAR USUÁRIOS =====================
 
-  static Future<List<dynamic>> listarUsuarios() async {
-    final response = await http.get(
-      Uri.parse('$baseUrl/admin/usuarios'),
-      headers: _headers,
-    );
-    if (response.statusCode == 200) {
-      return jsonDecode(response.body);
-    } else {
-      throw Exception('Erro ao listar usuários');
-    }
+  /// Participantes cujo nome ou e-mail começa com [busca] (mín. 2 letras).
+  static Future<Map<String, dynamic>> listarUsuarios({
+    String? busca,
+    int? cursor,
+  }) async {
+    return _listarPagina('/admin/usuarios', 'Erro ao listar usuários',
+        cursor: cursor, parametros: {if (busca != null) 'busca': busca});
   }
 
   // ===================== ADMIN - NOTIFICAÇÕES =====================
@@ -228,7 +278,7 @@ class ApiService {
   }) async {
     final response = await http.post(
       Uri.parse('$baseUrl/admin/notificacoes'),
-      headers: _headers,
+      headers: await _authHeaders(),
       body: jsonEncode({
         'titulo': titulo,
         'mensagem': mensagem,
@@ -245,10 +295,24 @@ class ApiService {
 
   // ===================== USUÁRIO - CRONOGRAMA =====================
 
-  static Future<List<dynamic>> listarPalestrasPublicas() async {
-    final response = await http.get(
-      Uri.parse('$baseUrl/usuario/palestras'),
-      headers: _headers,
+  /// Cronograma; os filtros são aplicados pelo servidor.
+  /// [modo]: 'agora' (acontecendo agora) ou 'proximas'.
+  static Future<List<dynamic>> listarPalestrasPublicas({
+    String? data,
+    String? local,
+    int? idPalestrante,
+    String? modo,
+  }) async {
+    final filtros = {
+      if (data != null) 'data': data,
+      if (local != null) 'local': local,
+      if (idPalestrante != null) 'id_palestrante': '$idPalestrante',
+      if (modo != null) 'modo': modo,
+    };
+    final response = await _getCondicional(
+      Uri.parse('$baseUrl/usuario/palestras')
+          .replace(queryParameters: filtros.isEmpty ? null : filtros),
+      _headers,
     );
     if (response.statusCode == 200) {
       return jsonDecode(response.body);
@@ -262,12 +326,10 @@ class ApiService {
   static Future<Map<String, dynamic>> fazerCheckin({
     required int idPalestra,
   }) async {
-    final idUsuario = await getUsuarioId();
     final response = await http.post(
       Uri.parse('$baseUrl/usuario/checkin'),
-      headers: _headers,
+      headers: await _authHeaders(),
       body: jsonEncode({
-        'id_usuario': idUsuario,
         'id_palestra': idPalestra,
       }),
     );
@@ -279,17 +341,9 @@ class ApiService {
     }
   }
 
-  static Future<List<dynamic>> listarMeusCheckins() async {
-    final idUsuario = await getUsuarioId();
-    final response = await http.get(
-      Uri.parse('$baseUrl/usuario/checkins?id_usuario=$idUsuario'),
-      headers: _headers,
-    );
-    if (response.statusCode == 200) {
-      return jsonDecode(response.body);
-    } else {
-      throw Exception('Erro ao listar check-ins');
-    }
+  static Future<Map<String, dynamic>> listarMeusCheckins({int? cursor}) async {
+    return _listarPagina('/usuario/checkins', 'Erro ao listar check-ins',
+        cursor: cursor);
   }
 
   // ===================== USUÁRIO - AVALIAÇÃO =====================
@@ -299,12 +353,10 @@ class ApiService {
     required int nota,
     String? comentario,
   }) async {
-    final idUsuario = await getUsuarioId();
     final response = await http.post(
       Uri.parse('$baseUrl/usuario/avaliar'),
-      headers: _headers,
+      headers: await _authHeaders(),
       body: jsonEncode({
-        'id_usuario': idUsuario,
         'id_palestra': idPalestra,
         'nota': nota,
         'comentario': comentario,
@@ -318,52 +370,131 @@ class ApiService {
     }
   }
 
-  static Future<List<dynamic>> listarAvaliacoesPorPalestra() async {
-    final response = await http.get(
-      Uri.parse('$baseUrl/usuario/avaliacoes-por-palestra'),
-      headers: _headers,
-    );
-    if (response.statusCode == 200) {
-      return jsonDecode(response.body);
-    } else {
-      throw Exception('Erro ao listar avaliações');
-    }
+  static Future<Map<String, dynamic>> listarAvaliacoesPorPalestra(
+      {int? cursor}) async {
+    return _listarPagina(
+        '/usuario/avaliacoes-por-palestra', 'Erro ao listar avaliações',
+        cursor: cursor);
+  }
+
+  static Future<Map<String, dynamic>> listarAvaliacoesDaPalestra(
+    int idPalestra, {
+    int? cursor,
+  }) async {
+    return _listarPagina('/usuario/palestras/$idPalestra/avaliacoes',
+        'Erro ao listar avaliações da palestra',
+        cursor: cursor);
   }
 
   // ===================== USUÁRIO - NOTIFICAÇÕES =====================
 
-  static Future<List<dynamic>> listarNotificacoes() async {
-    final idUsuario = await getUsuarioId();
+  static Future<Map<String, dynamic>> listarNotificacoes({int? cursor}) async {
+    return _listarPagina('/usuario/notificacoes', 'Erro ao listar notificações',
+        cursor: cursor);
+  }
+
+  static Future<int> contarNaoLidas() async {
     final response = await http.get(
-      Uri.parse('$baseUrl/usuario/notificacoes?id_usuario=$idUsuario'),
-      headers: _headers,
+      Uri.parse('$baseUrl/usuario/notificacoes/nao-lidas'),
+      headers: await _authHeaders(),
     );
     if (response.statusCode == 200) {
-      return jsonDecode(response.body);
+      return jsonDecode(response.body)['nao_lidas'];
     } else {
-      throw Exception('Erro ao listar notificações');
+      throw Exception('Erro ao contar notificações');
+    }
+  }
+
+  /// Eventos do servidor (SSE): `nao_lidas` ao conectar e `notificacao`
+  /// a cada notificação nova. Cada item é {'evento': ..., 'dados': {...}}.
+  /// Espera máxima entre duas tentativas de reconectar ao stream.
+  static const Duration _esperaMaximaStream = Duration(seconds: 30);
+
+  /// Avisos do servidor (SSE). Se a conexão cair ou falhar (reinício da
+  /// API, timeout do proxy), reconecta com espera exponencial; o primeiro
+  /// evento de cada conexão (`nao_lidas`) ressincroniza o contador.
+  /// Só termina com erro se o token for recusado (401).
+  static Stream<Map<String, dynamic>> escutarNotificacoes() async* {
+    var espera = const Duration(seconds: 1);
+    while (true) {
+      try {
+        await for (final aviso in _conectarNotificacoes()) {
+          espera = const Duration(seconds: 1);
+          yield aviso;
+        }
+      } on _TokenRecusado {
+        rethrow;
+      } catch (_) {}
+      await Future.delayed(espera);
+      espera = espera * 2 > _esperaMaximaStream
+          ? _esperaMaximaStream
+          : espera * 2;
+    }
+  }
+
+  /// Uma conexão ao stream de notificações, até o servidor fechá-la.
+  static Stream<Map<String, dynamic>> _conectarNotificacoes() async* {
+    final client = http.Client();
+    try {
+      final request = http.Request(
+        'GET',
+        Uri.parse('$baseUrl/usuario/notificacoes/stream'),
+      );
+      request.headers.addAll(await _authHeaders());
+      final response = await client.send(request);
+      if (response.statusCode == 401) {
+        throw _TokenRecusado();
+      }
+      if (response.statusCode != 200) {
+        throw Exception('Erro ao acompanhar notificações');
+      }
+      String? evento;
+      final linhas = response.stream
+          .transform(utf8.decoder)
+          .transform(const LineSplitter());
+      await for (final linha in linhas) {
+        if (linha.startsWith('event:')) {
+          evento = linha.substring(6).trim();
+        } else if (linha.startsWith('data:') && evento != null) {
+          yield {'evento': evento, 'dados': jsonDecode(linha.substring(5))};
+          evento = null;
+        }
+      }
+    } finally {
+      client.close();
     }
   }
 
   static Future<void> marcarNotificacaoLida(int idNotificacao) async {
-    final idUsuario = await getUsuarioId();
     final response = await http.put(
       Uri.parse(
-          '$baseUrl/usuario/notificacoes/$idNotificacao/lida?id_usuario=$idUsuario'),
-      headers: _headers,
+          '$baseUrl/usuario/notificacoes/$idNotificacao/lida'),
+      headers: await _authHeaders(),
     );
     if (response.statusCode != 200) {
       throw Exception('Erro ao marcar notificação como lida');
     }
   }
 
+  /// Marca todas as notificações como lidas; retorna quantas restam não lidas.
+  static Future<int> marcarTodasLidas() async {
+    final response = await http.put(
+      Uri.parse('$baseUrl/usuario/notificacoes/lidas'),
+      headers: await _authHeaders(),
+    );
+    if (response.statusCode == 200) {
+      return jsonDecode(response.body)['nao_lidas'];
+    } else {
+      throw Exception('Erro ao marcar notificações como lidas');
+    }
+  }
+
   // ===================== USUÁRIO - MEU CERTIFICADO =====================
 
   static Future<Map<String, dynamic>> meuCertificado() async {
-    final idUsuario = await getUsuarioId();
-    final response = await http.get(
-      Uri.parse('$baseUrl/usuario/meu-certificado?id_usuario=$idUsuario'),
-      headers: _headers,
+    final response = await _getCondicional(
+      Uri.parse('$baseUrl/usuario/meu-certificado'),
+      await _authHeaders(),
     );
     if (response.statusCode == 200) {
       return jsonDecode(response.body);
@@ -376,10 +507,9 @@ class ApiService {
   // ===================== USUÁRIO - PERFIL =====================
 
   static Future<Map<String, dynamic>> meuPerfil() async {
-    final idUsuario = await getUsuarioId();
     final response = await http.get(
-      Uri.parse('$baseUrl/usuario/perfil?id_usuario=$idUsuario'),
-      headers: _headers,
+      Uri.parse('$baseUrl/usuario/perfil'),
+      headers: await _authHeaders(),
     );
     if (response.statusCode == 200) {
       return jsonDecode(response.body);
@@ -393,12 +523,10 @@ class ApiService {
   static Future<Map<String, dynamic>> alterarNome({
     required String novoNome,
   }) async {
-    final idUsuario = await getUsuarioId();
     final response = await http.put(
       Uri.parse('$baseUrl/usuario/alterar-nome'),
-      headers: _headers,
+      headers: await _authHeaders(),
       body: jsonEncode({
-        'id_usuario': idUsuario,
         'novo_nome': novoNome,
       }),
     );
@@ -418,12 +546,10 @@ class ApiService {
     required String senhaAtual,
     required String novoEmail,
   }) async {
-    final idUsuario = await getUsuarioId();
     final response = await http.put(
       Uri.parse('$baseUrl/usuario/alterar-email'),
-      headers: _headers,
+      headers: await _authHeaders(),
       body: jsonEncode({
-        'id_usuario': idUsuario,
         'senha_atual': senhaAtual,
         'novo_email': novoEmail,
       }),
@@ -445,12 +571,10 @@ class ApiService {
     required String senhaAtual,
     required String novaSenha,
   }) async {
-    final idUsuario = await getUsuarioId();
     final response = await http.put(
       Uri.parse('$baseUrl/usuario/alterar-senha'),
-      headers: _headers,
+      headers: await _authHeaders(),
       body: jsonEncode({
-        'id_usuario': idUsuario,
         'senha_atual': senhaAtual,
         'nova_senha': novaSenha,
       }),
@@ -466,14 +590,12 @@ class ApiService {
   static Future<Map<String, dynamic>> excluirConta({
     required String senhaAtual,
   }) async {
-    final idUsuario = await getUsuarioId();
     final request = http.Request(
       'DELETE',
       Uri.parse('$baseUrl/usuario/excluir-conta'),
     );
-    request.headers.addAll(_headers);
+    request.headers.addAll(await _authHeaders());
     request.body = jsonEncode({
-      'id_usuario': idUsuario,
       'senha_atual': senhaAtual,
     });
     final streamed = await request.send();
@@ -487,3 +609,9 @@ class ApiService {
     }
   }
 }
+
+/// Token ausente ou recusado pelo servidor: não adianta reconectar.
+class _TokenRecusado implements Exception {
+  @override
+  String toString() => 'Sessão expirada';
+}
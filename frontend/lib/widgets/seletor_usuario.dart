@@ -0,0 +1,54 @@
+import 'package:flutter/material.dart';
+import '../services/api_service.dart';
+
+/// Campo de busca de participante para as telas de admin: a cada termo
+/// digitado (a partir de 2 letras) busca só a primeira página de
+/// `/admin/usuarios?busca=`, em vez de carregar todos os usuários.
+class SeletorUsuario extends StatelessWidget {
+  final String rotulo;
+  final String Function(Map<String, dynamic> usuario) descricao;
+
+  /// Chamado com o id escolhido, ou null quando o texto é alterado.
+  final ValueChanged<int?> onSelecionado;
+
+  const SeletorUsuario({
+    super.key,
+    required this.rotulo,
+    required this.descricao,
+    required this.onSelecionado,
+  });
+
+  Future<Iterable<Map<String, dynamic>>> _buscar(TextEditingValue valor) async {
+    final termo = valor.text.trim();
+    if (termo.length < 2) return const [];
+    try {
+      final pagina = await ApiService.listarUsuarios(busca: termo);
+      return List<Map<String, dynamic>>.from(pagina['itens']);
+    } catch (_) {
+      return const [];
+    }
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    return Autocomplete<Map<String, dynamic>>(
+      displayStringForOption: descricao,
+      optionsBuilder: _buscar,
+      onSelected: (u) => onSelecionado(u['id_usuario']),
+      fieldViewBuilder: (context, controller, foco, aoConfirmar) {
+        return TextFormField(
+          controller: controller,
+          focusNode: foco,
+          decoration: InputDecoration(
+            labelText: rotulo,
+            helperText: 'Digite o início do nome ou do e-mail',
+            prefixIcon: const Icon(Icons.person_search),
+            border: const OutlineInputBorder(),
+          ),
+          onChanged: (_) => onSelecionado(null),
+          onFieldSubmitted: (_) => aoConfirmar(),
+        );
+      },
+    );
+  }
+}